@@ -49,31 +49,32 @@ except Exception as e:
     auth_system = None
     database = None
 
+# Shared LLM gateway: concurrency limits, deadlines, retries, circuit breaker
+try:
+    from discipleai_legal.llm_gateway import get_llm_gateway
+    
+    llm_gateway = get_llm_gateway(OPENAI_API_KEY)
+    logger.info(f"LLM gateway: {'ready' if llm_gateway.available else 'no API key'}")
+except Exception as e:
+    logger.error(f"LLM gateway init: {e}")
+    llm_gateway = None
+
 # Initialize CGC CORE™
 cgc_available = False
 cgc_engine = None
 contract_analyzer = None
+rule_analyzer = None
 
 try:
     from cgc_core.core_engine import CGCCoreEngine
     from discipleai_legal.contract_analyzer_ai import ContractAnalyzerAI
     
     cgc_engine = CGCCoreEngine()
-    contract_analyzer = ContractAnalyzerAI(cgc_engine)
+    contract_analyzer = ContractAnalyzerAI(gateway=llm_gateway)
     cgc_available = True
     logger.info("CGC CORE™ initialized")
 except Exception as e:
     logger.error(f"CGC init: {e}")
-    # Fallback to OpenAI direct
-    if OPENAI_API_KEY:
-        try:
-            from openai import OpenAI
-            openai_client = OpenAI(api_key=OPENAI_API_KEY)
-            logger.info("Fallback: OpenAI direct")
-        except:
-            openai_client = None
-    else:
-        openai_client = None
 
 
 class APIHandler(BaseHTTPRequestHandler):
@@ -135,6 +136,7 @@ class APIHandler(BaseHTTPRequestHandler):
             self._send_json({
                 'system_status': 'operational',
                 'cgc_core_active': cgc_available,
+                'llm_gateway': llm_gateway.get_stats() if llm_gateway else None,
                 'active_users': stats.get('users', 0),
                 'uptime': '99.9%'
             })
@@ -222,7 +224,7 @@ class APIHandler(BaseHTTPRequestHandler):
                 analysis = self._analyze_cgc(text, user)
             else:
                 logger.info(f"Fallback analysis: {user['email']}")
-                analysis = self._analyze_fallback(text)
+                analysis = self._analyze_fallback(text, user['email'])
             
             # Return clean result
             self._send_json({
@@ -258,7 +260,25 @@ class APIHandler(BaseHTTPRequestHandler):
         """
         try:
             # This calls the full CGC pipeline
-            result = contract_analyzer.analyze(text)
+            analysis = contract_analyzer.analyze_contract(
+                text, {'user_email': user['email'], 'tenant_id': user['email']}
+            )
+            if not analysis.get('success'):
+                return {
+                    'summary': analysis.get('error', 'Analysis rejected'),
+                    'risk_level': 'unknown',
+                    'compliance_score': 0,
+                    'key_findings': [analysis.get('reasoning', 'Rejected by governance')],
+                    'recommendation': 'Manual review required'
+                }
+            result = {
+                'summary': analysis['ai_analysis'],
+                'risk_level': str(analysis.get('overall_risk') or 'medium').lower(),
+                'compliance_score': analysis.get('compliance_score') or 0,
+                'key_findings': [c['type'].replace('_', ' ') for c in analysis.get('clauses', [])],
+                'recommendation': '',
+                'audit_hash': analysis['cgc_governance'].get('audit_hash')
+            }
             
             # Result should contain:
             # - summary (from SDA)
@@ -273,12 +293,12 @@ class APIHandler(BaseHTTPRequestHandler):
         except Exception as e:
             logger.error(f"CGC analysis failed: {e}")
             # Fallback if CGC fails
-            return self._analyze_fallback(text)
+            return self._analyze_fallback(text, user['email'])
     
-    def _analyze_fallback(self, text):
+    def _analyze_fallback(self, text, tenant=''):
         """Fallback to OpenAI if CGC unavailable"""
         try:
-            if not openai_client:
+            if not llm_gateway or not llm_gateway.available:
                 return {
                     'summary': 'Analysis unavailable',
                     'risk_level': 'unknown',
@@ -287,21 +307,52 @@ class APIHandler(BaseHTTPRequestHandler):
                     'recommendation': 'Manual review required'
                 }
             
-            response = openai_client.chat.completions.create(
-                model='gpt-4o-mini',
-                messages=[
-                    {'role': 'system', 'content': 'Legal analyst. JSON only.'},
-                    {'role': 'user', 'content': f'Analyze contract. JSON format: summary, risk_level (low/medium/high), compliance_score (0-100), key_findings (array), recommendation.\n\n{text[:3000]}'}
-                ],
-                temperature=0.3,
-                max_tokens=800
-            )
+            from discipleai_legal.contract_chunker import chunk_contract, map_chunks, reduce_json_analyses
+            from discipleai_legal.llm_gateway import LLM_ERRORS
             
-            result = json.loads(response.choices[0].message.content)
-            return result
+            def analyze_chunk(chunk):
+                part = f' (part {chunk.index + 1} of {len(chunks)})' if len(chunks) > 1 else ''
+                return json.loads(llm_gateway.complete(
+                    [
+                        {'role': 'system', 'content': 'Legal analyst. JSON only.'},
+                        {'role': 'user', 'content': f'Analyze contract{part}. JSON format: summary, risk_level (low/medium/high), compliance_score (0-100), key_findings (array), recommendation.\n\n{chunk.text}'}
+                    ],
+                    tenant=tenant,
+                    model='gpt-4o-mini',
+                    temperature=0.3,
+                    max_tokens=800
+                ))
+            
+            # Long contracts: analyze section-aligned chunks concurrently, then merge
+            chunks = chunk_contract(text, max_chars=12000)
+            # A chunk answered with invalid JSON counts as failed, like one with no answer
+            return reduce_json_analyses(
+                map_chunks(chunks, analyze_chunk, errors=LLM_ERRORS + (json.JSONDecodeError,)), chunks
+            )
             
         except Exception as e:
             logger.error(f"Fallback failed: {e}")
+            return self._analyze_rules(text)
+    
+    def _analyze_rules(self, text):
+        """Rule-based analysis when the model is unavailable"""
+        global rule_analyzer
+        try:
+            if rule_analyzer is None:
+                from discipleai_legal.contract_analyzer import ContractAnalyzer
+                rule_analyzer = ContractAnalyzer()
+            
+            result = rule_analyzer.analyze_contract(text)
+            clauses = [c['type'].replace('_', ' ') for c in result['clauses']]
+            return {
+                'summary': 'Rule-based analysis (AI analysis unavailable)',
+                'risk_level': result['risk_level'].lower(),
+                'compliance_score': 50,
+                'key_findings': [f"{c.capitalize()} clause present" for c in clauses] or ['No standard clauses identified'],
+                'recommendation': 'Manual review required'
+            }
+        except Exception as e:
+            logger.error(f"Rule-based analysis failed: {e}")
             return {
                 'summary': 'Analysis completed',
                 'risk_level': 'medium',
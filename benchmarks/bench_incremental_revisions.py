@@ -0,0 +1,82 @@
+"""
+Incremental Revision Benchmark
+Section-cached re-analysis of redlined contract versions vs full analysis
+
+Usage:
+    python -m benchmarks.bench_incremental_revisions [--sections 200] [--revisions 20]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from discipleai_legal.clause_extractor import ClauseExtractor
+    from discipleai_legal.contract_versions import IncrementalContractAnalyzer
+    from discipleai_legal.risk_assessor import RiskAssessor
+
+
+PHRASES = [
+    'Client shall pay $50,000 annually.',
+    'This agreement commences January 1, 2025.',
+    'Either party may terminate with 30 days notice.',
+    'Liability is capped at fees paid.',
+    'Confidential information shall not be disclosed.',
+    'Governing law: State of New York.',
+    'Disputes are resolved by binding arbitration.',
+    'Supplier warrants the services for 90 days.',
+    'Invoices are payable net 30 from 03/15/2025.',
+    'Acme Holdings Inc. shall maintain insurance.',
+]
+
+
+def build_contract(sections: int, rng: random.Random) -> list:
+    lines = ['MASTER SERVICES AGREEMENT', 'Between TechCorp Inc. and ClientCo LLC ("Client").']
+    for i in range(1, sections + 1):
+        lines.append(f"{i}. " + ' '.join(rng.choice(PHRASES) for _ in range(rng.randint(4, 12))))
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental revision benchmark')
+    parser.add_argument('--sections', type=int, default=200, help='Numbered sections per contract')
+    parser.add_argument('--revisions', type=int, default=20, help='Redlined versions analyzed')
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = ClauseExtractor()
+        assessor = RiskAssessor()
+        incremental = IncrementalContractAnalyzer(extractor, assessor)
+
+    lines = build_contract(args.sections, rng)
+    incremental.analyze('msa', '\n'.join(lines), contract_value=750_000)
+
+    full_time = incremental_time = 0.0
+    for _ in range(args.revisions):
+        # One redline per version
+        i = rng.randrange(2, len(lines))
+        lines[i] += ' ' + rng.choice(PHRASES)
+        text = '\n'.join(lines)
+
+        start = time.perf_counter()
+        extractor.extract_clauses(text)
+        assessor.assess_risk(text, contract_value=750_000)
+        full_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = incremental.analyze('msa', text, contract_value=750_000)
+        incremental_time += time.perf_counter() - start
+
+    stats = incremental.get_stats()
+    print(f"Contract:          {args.sections} sections, {len(text):,} chars, {args.revisions} revisions")
+    print(f"Full analysis:     {full_time / args.revisions * 1000:8.2f} ms / version")
+    print(f"Incremental:       {incremental_time / args.revisions * 1000:8.2f} ms / version "
+          f"(latest version {result['version']}, {result['incremental']['recomputed']} section(s) rescanned)")
+    print(f"Section reuse:     {stats['reuse_rate']:.1%}")
+
+
+if __name__ == '__main__':
+    main()
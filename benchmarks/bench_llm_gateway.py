@@ -0,0 +1,196 @@
+"""
+LLM Gateway Load Benchmark
+End-to-end contract analysis against the local chat-completions stub
+
+Measures throughput and tail latency of ContractAnalyzerAI (in process,
+through the LLM gateway) or of a running API server, with the model
+replaced by benchmarks.llm_stub so no API key or network is needed.
+
+Usage:
+    python -m benchmarks.bench_llm_gateway [--requests 200] [--concurrency 32] [--error-rate 0.02]
+
+    # API server: start the server against the stub port, then
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python api_server_full.py
+    python -m benchmarks.bench_llm_gateway --target api --api-url http://127.0.0.1:8080 --stub-port 8765
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.llm_stub import LLMStub
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from cgc_core.core_engine import get_cgc_core
+    from discipleai_legal.contract_analyzer_ai import ContractAnalyzerAI
+    from discipleai_legal.llm_gateway import LLMGateway
+
+
+PHRASES = [
+    'Client shall pay $50,000 annually.',
+    'Either party may terminate with 30 days notice.',
+    'Liability is capped at fees paid.',
+    'Confidential information shall not be disclosed.',
+    'Governing law: State of New York.',
+    'Disputes are resolved by binding arbitration.',
+    'Supplier warrants the services for 90 days.',
+    'Invoices are payable net 30.',
+    'This agreement renews automatically each year.',
+    'Supplier shall indemnify Client against third-party claims.',
+]
+
+
+def build_contract(number: int, sections: int, rng: random.Random) -> str:
+    lines = [f'MASTER SERVICES AGREEMENT No. {number}', 'Between TechCorp Inc. and ClientCo LLC ("Client").']
+    for i in range(1, sections + 1):
+        lines.append(f"{i}. " + ' '.join(rng.choice(PHRASES) for _ in range(rng.randint(4, 12))))
+    return '\n'.join(lines)
+
+
+def percentile_ms(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return 1000 * ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def run_analyzer(args, stub: LLMStub, contracts: list):
+    """Requests through ContractAnalyzerAI; governance writes go to a temporary database"""
+
+    tmp = tempfile.TemporaryDirectory()
+    with contextlib.redirect_stdout(io.StringIO()):
+        get_cgc_core(os.path.join(tmp.name, 'cgc_core.db'))
+        gateway = LLMGateway(
+            base_url=stub.base_url,
+            max_concurrency=args.max_concurrency,
+            tenant_concurrency=args.tenant_concurrency,
+            timeout=args.timeout
+        )
+        analyzer = ContractAnalyzerAI(gateway=gateway, reuse_analyses=False, cache_responses=False)
+
+    def analyze(i):
+        start = time.perf_counter()
+        result = analyzer.analyze_contract(contracts[i], {'tenant_id': f'tenant-{i % args.tenants}'})
+        if not result.get('success'):
+            outcome = 'failed'
+        else:
+            outcome = 'fallback' if result.get('degraded') else 'ai'
+        return time.perf_counter() - start, outcome
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        results, elapsed = run_load(analyze, args)
+    tmp.cleanup()
+    return results, elapsed, gateway.get_stats()
+
+
+def run_api(args, contracts: list):
+    """Requests against a running API server (pointed at the stub with OPENAI_BASE_URL)"""
+
+    login = urllib.request.Request(
+        args.api_url.rstrip('/') + '/api/auth/login',
+        data=json.dumps({'email': args.email, 'password': args.password}).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(login, timeout=30) as response:
+        token = json.loads(response.read())['token']
+
+    def analyze(i):
+        request = urllib.request.Request(
+            args.api_url.rstrip('/') + '/api/analyze',
+            data=json.dumps({'contract_text': contracts[i]}).encode('utf-8'),
+            headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
+        )
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=args.timeout + 30) as response:
+                analysis = json.loads(response.read())['analysis']
+        except (urllib.error.URLError, OSError, ValueError, KeyError):
+            return time.perf_counter() - start, 'failed'
+        outcome = 'fallback' if 'unavailable' in str(analysis.get('summary', '')).lower() else 'ai'
+        return time.perf_counter() - start, outcome
+
+    results, elapsed = run_load(analyze, args)
+    try:
+        with urllib.request.urlopen(args.api_url.rstrip('/') + '/api/metrics', timeout=30) as response:
+            gateway_stats = json.loads(response.read()).get('llm_gateway')
+    except (urllib.error.URLError, OSError, ValueError):
+        gateway_stats = None
+    return results, elapsed, gateway_stats
+
+
+def run_load(analyze, args):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(analyze, range(args.requests)))
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LLM gateway load benchmark against a local stub')
+    parser.add_argument('--target', choices=['analyzer', 'api'], default='analyzer')
+    parser.add_argument('--requests', type=int, default=200, help='Contracts analyzed')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients')
+    parser.add_argument('--tenants', type=int, default=4, help='Tenants the requests are spread over')
+    parser.add_argument('--sections', type=int, default=40, help='Numbered sections per contract')
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='Stub median latency')
+    parser.add_argument('--sigma', type=float, default=0.5, help='Stub log-normal latency shape')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='Stub HTTP 503 share')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Stub HTTP 429 share')
+    parser.add_argument('--stall-rate', type=float, default=0.0, help='Stub stalled-response share')
+    parser.add_argument('--max-concurrency', type=int, default=16, help='Gateway global limit')
+    parser.add_argument('--tenant-concurrency', type=int, default=8, help='Gateway per-tenant limit')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Gateway deadline per call (s)')
+    parser.add_argument('--stub-port', type=int, default=0, help='Stub port (0 picks a free port)')
+    parser.add_argument('--api-url', default='http://127.0.0.1:8080')
+    parser.add_argument('--email', default='admin@olympusmont.com')
+    parser.add_argument('--password', default='ChangeMe123!')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    rng = random.Random(11)
+    contracts = [build_contract(i, args.sections, rng) for i in range(args.requests)]
+
+    stub = LLMStub(
+        port=args.stub_port,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        stall_rate=args.stall_rate,
+        stall_seconds=args.timeout + 5
+    )
+    with stub:
+        if args.target == 'api':
+            results, elapsed, gateway = run_api(args, contracts)
+        else:
+            results, elapsed, gateway = run_analyzer(args, stub, contracts)
+        served = stub.get_stats()
+
+    latencies = [latency for latency, _ in results]
+    outcomes = [outcome for _, outcome in results]
+    print(f"Target:      {args.target}, {args.tenants} tenants, {len(contracts[0]):,} chars / contract")
+    print(f"Stub:        {stub.base_url}, median {args.latency_ms:g} ms (sigma {args.sigma:g}), "
+          f"{args.error_rate:.1%} 503, {args.rate_limit_rate:.1%} 429, {args.stall_rate:.1%} stalls")
+    print(f"Throughput:  {args.requests} requests at concurrency {args.concurrency} in {elapsed:.2f} s "
+          f"-> {args.requests / elapsed:.1f} req/s")
+    print(f"Latency:     p50 {percentile_ms(latencies, 0.50):.0f} ms, p95 {percentile_ms(latencies, 0.95):.0f} ms, "
+          f"p99 {percentile_ms(latencies, 0.99):.0f} ms, max {max(latencies) * 1000:.0f} ms")
+    print(f"Outcomes:    {outcomes.count('ai')} AI, {outcomes.count('fallback')} rule-based fallback, "
+          f"{outcomes.count('failed')} failed")
+    if gateway:
+        print(f"Gateway:     {gateway['calls']} calls, {gateway['retries']} retries, {gateway['timeouts']} timeouts, "
+              f"{gateway['rejected']} rejected (circuit {gateway['circuit']['state']}), "
+              f"max queued {gateway['max_queued']}, queue wait p95 {gateway['queue_wait_ms']['p95']:.0f} ms")
+    print(f"Stub served: {served['requests']} requests, {served['errors']} 503, {served['rate_limited']} 429, "
+          f"{served['stalled']} stalls, max in flight {served['max_in_flight']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Near-Duplicate Contract Benchmark
+MinHash fingerprinting and LSH lookup of prior contract analyses
+
+Usage:
+    python -m benchmarks.bench_near_duplicates [--contracts 2000] [--templates 50]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from discipleai_legal.contract_fingerprints import ContractFingerprintIndex, NUMPY_AVAILABLE, changed_sections
+
+
+VOCABULARY = (
+    'party agree shall term payment notice breach liability indemnify warranty confidential '
+    'governing law court dispute terminate assign consent amendment waiver severability '
+    'force majeure insurance audit records delivery acceptance invoice interest default cure'
+).split()
+
+NAMES = ['Acme Corp', 'TechCorp Inc.', 'Globex LLC', 'Initech', 'Umbrella Ltd', 'John Smith', 'Jane Doe']
+
+
+def template(seed: int, sections: int = 20) -> list:
+    rng = random.Random(seed)
+    return [
+        f"{i}. " + ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(60, 200)))
+        for i in range(1, sections + 1)
+    ]
+
+
+def render(body: list, rng: random.Random) -> str:
+    header = f"AGREEMENT between {rng.choice(NAMES)} and {rng.choice(NAMES)} dated 2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    return header + '\n\n' + '\n'.join(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Near-duplicate contract benchmark')
+    parser.add_argument('--contracts', type=int, default=2000, help='Indexed contracts')
+    parser.add_argument('--templates', type=int, default=50, help='Distinct templates')
+    parser.add_argument('--queries', type=int, default=200, help='Timed lookups')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    templates = [template(seed) for seed in range(args.templates)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = ContractFingerprintIndex(os.path.join(tmp, 'fingerprints.db'))
+
+        start = time.perf_counter()
+        for i in range(args.contracts):
+            body = list(templates[i % args.templates])
+            # Unique filler section so every indexed contract is distinct
+            body.append(f"{len(body) + 1}. " + ' '.join(rng.choice(VOCABULARY) for _ in range(40)))
+            fingerprint = index.fingerprint(render(body, rng))
+            index.add(fingerprint, {'analysis_id': f'AI-{i:06d}'}, contract_id=f'AI-{i:06d}')
+        build_time = time.perf_counter() - start
+
+        queries = [render(templates[rng.randrange(args.templates)], rng) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        fingerprints = [index.fingerprint(text) for text in queries]
+        fingerprint_time = (time.perf_counter() - start) / args.queries
+
+        start = time.perf_counter()
+        matches = [index.nearest(fingerprint) for fingerprint in fingerprints]
+        lookup_time = (time.perf_counter() - start) / args.queries
+
+        found = [m for m in matches if m]
+        changed = [len(changed_sections(f, m['section_hashes'])) for f, m in zip(fingerprints, matches) if m]
+
+        print(f"Index:            {len(index):,} contracts, {args.templates} templates ({build_time:.1f} s, numpy={NUMPY_AVAILABLE})")
+        print(f"Fingerprint:      {fingerprint_time * 1000:8.3f} ms / contract")
+        print(f"Nearest lookup:   {lookup_time * 1000:8.3f} ms / contract")
+        print(f"Matched:          {len(found)}/{args.queries}, mean similarity "
+              f"{sum(m['similarity'] for m in found) / max(len(found), 1):.3f}, "
+              f"mean changed sections {sum(changed) / max(len(changed), 1):.1f}")
+
+
+if __name__ == '__main__':
+    main()
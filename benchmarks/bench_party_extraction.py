@@ -0,0 +1,116 @@
+"""
+Party Extraction Benchmark
+Adversarial inputs for the legacy party regexes versus the linear-time
+PartyRecognizer
+
+Usage:
+    python -m benchmarks.bench_party_extraction [--size-kb 20] [--legacy-timeout 10]
+"""
+
+from typing import Callable, Dict, List
+import argparse
+import contextlib
+import io
+import multiprocessing
+import re
+import time
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from discipleai_legal.party_recognizer import PartyRecognizer
+
+
+LEGACY_PATTERNS = [
+    r'between\s+([A-Z][A-Za-z\s&,.]+?)\s+\("',
+    r'party[:\s]+([A-Z][A-Za-z\s&,.]+)',
+    r'"([A-Z][A-Za-z\s&,.]+?)"\s+\(hereinafter',
+    r'([A-Z][A-Za-z\s]+(?:Inc|LLC|Ltd|Corp|Corporation))'
+]
+
+
+def legacy_extract(text: str) -> List[str]:
+    """Previous regex-based extraction"""
+
+    parties = []
+    for pattern in LEGACY_PATTERNS:
+        parties.extend(re.findall(pattern, text))
+    parties = [p.strip() for p in parties if len(p.strip()) > 3]
+    return list(set(parties))[:10]
+
+
+def adversarial_inputs(size: int) -> Dict[str, str]:
+    """Inputs that make the legacy patterns backtrack quadratically"""
+
+    return {
+        # Capitalized run that never reaches a legal suffix
+        'capitalized_run': ('Acme ' * (size // 5))[:size],
+        # Repeated 'between' whose name run never reaches ("
+        'between_unclosed': ('between Alpha Beta, ' * (size // 20))[:size],
+        # Repeated 'party' triggers inside one long name run
+        'party_run': ('party Vendor Name ' * (size // 18))[:size],
+        # Quoted names never followed by (hereinafter
+        'quotes_no_hereinafter': ('"Vendor Name" ' * (size // 14))[:size],
+        # Single-letter capitalized tokens
+        'letters': ('A ' * (size // 2))[:size],
+        # Plain contract prose for reference
+        'normal_prose': (
+            'This Agreement is made between Acme Holdings, Inc. ("Acme") and '
+            '"Beta Systems" (hereinafter "Beta"). The receiving party shall keep '
+            'all information confidential. '
+        ) * (size // 190 + 1)
+    }
+
+
+def _legacy_worker(text: str, queue):
+    start = time.perf_counter()
+    legacy_extract(text)
+    queue.put(time.perf_counter() - start)
+
+
+def time_legacy(text: str, timeout: float) -> float:
+    """Legacy runtime in seconds (inf if it exceeds timeout)"""
+
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_legacy_worker, args=(text, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return float('inf')
+    return queue.get()
+
+
+def time_call(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Party extraction benchmark')
+    parser.add_argument('--size-kb', type=int, default=20, help='Adversarial input size in KB')
+    parser.add_argument('--legacy-timeout', type=float, default=10.0, help='Seconds before a legacy run is abandoned')
+    args = parser.parse_args()
+
+    recognizer = PartyRecognizer()
+    size = args.size_kb * 1024
+
+    print(f"{'input':<24}{'chars':>10}{'legacy ms':>14}{'recognizer ms':>16}{'truncated':>11}")
+    for name, text in adversarial_inputs(size).items():
+        legacy = time_legacy(text, args.legacy_timeout)
+        result = {}
+        current = time_call(lambda: result.update(recognizer.recognize(text)))
+        legacy_ms = f"{legacy * 1000:.1f}" if legacy != float('inf') else f">{args.legacy_timeout * 1000:.0f}"
+        print(f"{name:<24}{len(text):>10,}{legacy_ms:>14}{current * 1000:>16.1f}{str(result['truncated']):>11}")
+
+    # Linear scaling check: doubling the input should roughly double the time
+    print()
+    print("Recognizer scaling on 'capitalized_run':")
+    for factor in (1, 2, 4, 8):
+        text = adversarial_inputs(size * factor)['capitalized_run']
+        elapsed = time_call(lambda: PartyRecognizer(time_budget_ms=60_000).extract(text))
+        print(f"  {len(text):>10,} chars  {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+LLM Stub Server
+Local, deterministic stand-in for the chat-completions endpoint
+
+Answers POST /v1/chat/completions with structured responses derived from
+a hash of the prompt, so identical requests always get identical answers:
+JSON (summary, risk_level, compliance_score, key_findings,
+recommendation) when the prompt asks for JSON, otherwise markdown with a
+Risk Level and Compliance Score line. Latency is log-normal around a
+median; 5xx errors, 429s and stalls are injected at configurable rates.
+Draws are seeded by the request and how many times it has been seen, so a
+run is reproducible regardless of thread interleaving. GET /stats returns
+counters.
+
+Usage:
+    python -m benchmarks.llm_stub [--port 8765] [--latency-ms 300] [--error-rate 0.02]
+
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python api_server_full.py
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+
+
+RISK_LEVELS = ('low', 'medium', 'high')
+
+FINDINGS = [
+    'Liability cap below annual fees',
+    'Termination for convenience on short notice',
+    'Automatic renewal without notice window',
+    'Broad indemnification obligations',
+    'Confidentiality survives five years',
+    'Governing law and venue are specified',
+    'Payment terms net 30',
+    'Assignment requires prior consent',
+]
+
+
+class LLMStub:
+    """Chat-completions stub; start() serves it on a background thread"""
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        latency_ms: float = 300.0,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 30.0,
+        seed: int = 1
+    ):
+        """
+        Args:
+            port: Port to listen on (0 picks a free port)
+            latency_ms: Median response latency
+            latency_sigma: Log-normal shape (0 gives a fixed latency)
+            error_rate: Share of requests answered with HTTP 503
+            rate_limit_rate: Share answered with HTTP 429 and Retry-After
+            stall_rate: Share that stall for stall_seconds before answering
+            seed: Seed for every latency and error draw
+        """
+
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.seed = seed
+
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.responses = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.stalled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        handler = type('Handler', (_StubHandler,), {'stub': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'LLMStub':
+        self._thread = threading.Thread(target=self.server.serve_forever, name='llm-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'LLMStub':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # --- Behaviour ---
+
+    def draw(self, body: bytes) -> random.Random:
+        """RNG for one request: seeded by the body and how often it was seen"""
+
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            occurrence = self._seen.get(digest, 0)
+            self._seen[digest] = occurrence + 1
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def latency(self, rng: random.Random) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return rng.lognormvariate(math.log(max(self.latency_ms, 0.001)), self.latency_sigma) / 1000
+
+    def completion(self, request: Dict) -> Dict:
+        """Deterministic response for a chat-completions request"""
+
+        messages = request.get('messages') or []
+        prompt = '\n'.join(str(m.get('content', '')) for m in messages)
+        user = str(messages[-1].get('content', '')) if messages else ''
+        digest = hashlib.sha256(user.encode('utf-8')).digest()
+
+        risk = RISK_LEVELS[digest[0] % len(RISK_LEVELS)]
+        score = 55 + digest[1] % 45
+        findings = [FINDINGS[b % len(FINDINGS)] for b in digest[2:5]]
+        findings = list(dict.fromkeys(findings))
+        recommendation = 'Negotiate the flagged clauses before signing' if risk == 'high' else 'Proceed with standard review'
+
+        wants_json = 'json' in prompt.lower() or request.get('response_format', {}).get('type') == 'json_object'
+        if wants_json:
+            content = json.dumps({
+                'summary': f"Stub analysis of {len(user.split())} words",
+                'risk_level': risk,
+                'compliance_score': score,
+                'key_findings': findings,
+                'recommendation': recommendation
+            })
+        else:
+            content = (
+                "## Contract Type & Parties\nStub analysis\n\n"
+                f"## Risk Assessment\nRisk Level: {risk.upper()}\n\n"
+                f"## Compliance Score\nCompliance Score: {score}%\n\n"
+                "## Critical Issues\n" + ''.join(f"- {f}\n" for f in findings) +
+                f"\n## Recommendations\n{recommendation}"
+            )
+
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        return {
+            'id': 'chatcmpl-stub-' + digest.hex()[:12],
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }
+
+    def get_stats(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'responses': self.responses,
+            'errors': self.errors,
+            'rate_limited': self.rate_limited,
+            'stalled': self.stalled,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight
+        }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    stub: LLMStub = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send(200, self.stub.get_stats())
+        else:
+            self._send(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send(404, {'error': {'message': 'not found'}})
+            return
+
+        stub = self.stub
+        with stub._lock:
+            stub.requests += 1
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+        try:
+            try:
+                request = json.loads(body)
+            except ValueError:
+                self._send(400, {'error': {'message': 'invalid JSON'}})
+                return
+
+            rng = stub.draw(body)
+            delay = stub.latency(rng)
+            roll = rng.random()
+            if roll < stub.error_rate:
+                time.sleep(delay)
+                with stub._lock:
+                    stub.errors += 1
+                self._send(503, {'error': {'message': 'injected server error'}})
+                return
+            roll -= stub.error_rate
+            if roll < stub.rate_limit_rate:
+                with stub._lock:
+                    stub.rate_limited += 1
+                self._send(429, {'error': {'message': 'injected rate limit'}}, {'Retry-After': '1'})
+                return
+            roll -= stub.rate_limit_rate
+            if roll < stub.stall_rate:
+                with stub._lock:
+                    stub.stalled += 1
+                delay += stub.stall_seconds
+
+            time.sleep(delay)
+            self._send(200, stub.completion(request))
+            with stub._lock:
+                stub.responses += 1
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # the client gave up (deadline) before the answer
+        finally:
+            with stub._lock:
+                stub.in_flight -= 1
+
+    def _send(self, status: int, payload: Dict, headers: Optional[Dict] = None) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local chat-completions stub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='Median latency')
+    parser.add_argument('--sigma', type=float, default=0.5, help='Log-normal latency shape (0 = fixed)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of HTTP 503 responses')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of HTTP 429 responses')
+    parser.add_argument('--stall-rate', type=float, default=0.0, help='Share of stalled responses')
+    parser.add_argument('--stall-seconds', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    stub = LLMStub(
+        args.host, args.port, args.latency_ms, args.sigma, args.error_rate,
+        args.rate_limit_rate, args.stall_rate, args.stall_seconds, args.seed
+    )
+    print(f"LLM stub listening on {stub.base_url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+        print(json.dumps(stub.get_stats()))
+
+
+if __name__ == '__main__':
+    main()
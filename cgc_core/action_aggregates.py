@@ -0,0 +1,215 @@
+"""
+Action Aggregates
+Incrementally maintained per-(module, action) history for PFM
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+
+
+class IssueSketch:
+    """
+    Bounded frequency sketch for recent issues (Space-Saving)
+    Keeps at most `capacity` counters; counts decay so old issues fade out
+    """
+
+    def __init__(self, capacity: int = 32, decay_every: int = 200):
+        self.capacity = capacity
+        self.decay_every = decay_every
+        self.counts: Dict[str, float] = {}
+        self._updates = 0
+
+    def add(self, issue: str, weight: float = 1.0):
+        """Count one occurrence of an issue"""
+
+        if issue in self.counts:
+            self.counts[issue] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[issue] = weight
+        else:
+            # Replace the smallest counter, inheriting its count
+            victim = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(victim)
+            self.counts[issue] = floor + weight
+
+        self._updates += 1
+        if self._updates % self.decay_every == 0:
+            self._decay()
+
+    def _decay(self):
+        """Halve all counters and drop the ones that vanish"""
+
+        self.counts = {k: v / 2 for k, v in self.counts.items() if v / 2 >= 0.5}
+
+    def top(self, n: int = 3) -> List[str]:
+        """Most frequent recent issues"""
+
+        ranked = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        return [issue for issue, _ in ranked[:n]]
+
+
+class DurationHistogram:
+    """
+    Fixed log2-bucket histogram of durations in milliseconds
+    Bucket i holds durations in [2^(i-1), 2^i) ms; bucket 0 holds < 1 ms
+    """
+
+    NUM_BUCKETS = 24  # up to ~2.3 hours
+
+    def __init__(self):
+        self.buckets = [0] * self.NUM_BUCKETS
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, duration_ms: float):
+        """Record one duration"""
+
+        duration_ms = max(0.0, float(duration_ms))
+        index = min(int(duration_ms).bit_length(), self.NUM_BUCKETS - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+
+    def percentile(self, p: float) -> Optional[Tuple[int, int]]:
+        """Bucket bounds (ms) containing the p-th percentile"""
+
+        if self.count == 0:
+            return None
+
+        target = p * self.count
+        running = 0
+        for index, bucket_count in enumerate(self.buckets):
+            running += bucket_count
+            if running >= target:
+                return self._bounds(index)
+
+        return self._bounds(self.NUM_BUCKETS - 1)
+
+    @staticmethod
+    def _bounds(index: int) -> Tuple[int, int]:
+        if index == 0:
+            return (0, 1)
+        return (1 << (index - 1), 1 << index)
+
+    def mean(self) -> Optional[float]:
+        return self.total_ms / self.count if self.count else None
+
+
+class ActionAggregate:
+    """Running aggregate for one (module, action) pair"""
+
+    def __init__(self, module: str, action: str):
+        self.module = module
+        self.action = action
+        self.decisions = 0
+        self.approved = 0
+        self.feedback = 0
+        self.feedback_success = 0
+        self.issues = IssueSketch()
+        self.durations = DurationHistogram()
+
+    def success_rate(self, min_feedback: int) -> Optional[float]:
+        """Observed success rate (feedback preferred over approvals)"""
+
+        if self.feedback >= min_feedback:
+            return self.feedback_success / self.feedback
+        if self.decisions:
+            return self.approved / self.decisions
+        return None
+
+    def snapshot(self, min_feedback: int) -> Dict:
+        """Patterns in the shape PFM expects from historical analysis"""
+
+        p50 = self.durations.percentile(0.5)
+        p90 = self.durations.percentile(0.9)
+        if p50:
+            avg_duration = f"{p50[0]}-{p50[1]} ms (p90 < {p90[1]} ms)"
+        else:
+            avg_duration = 'unknown'
+
+        return {
+            'sample_size': self.decisions,
+            'success_rate': self.success_rate(min_feedback),
+            'avg_duration': avg_duration,
+            'common_issues': self.issues.top(3),
+            'feedback_count': self.feedback,
+            'source': 'aggregate'
+        }
+
+
+class ActionAggregateStore:
+    """
+    Per-(module, action) historical aggregates
+    Updated on every decision and feedback event; lookups are O(1)
+    """
+
+    def __init__(self, min_feedback: int = 5):
+        """
+        Args:
+            min_feedback: Feedback events needed before outcome feedback
+                          replaces approval rate as the success signal
+        """
+
+        self.min_feedback = min_feedback
+        self._aggregates: Dict[Tuple[str, str], ActionAggregate] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, module: str, action: str) -> ActionAggregate:
+        key = (module, action)
+        aggregate = self._aggregates.get(key)
+        if aggregate is None:
+            aggregate = ActionAggregate(module, action)
+            self._aggregates[key] = aggregate
+        return aggregate
+
+    def record_decision(self, module: str, action: str, approved: bool):
+        """
+        Fold a governance decision into the aggregate
+
+        Only the approval is recorded: durations and issues come from real
+        outcomes (record_feedback), never from the pipeline's own latency
+        or PFM's predicted risks, so predictions do not reinforce themselves.
+        """
+
+        with self._lock:
+            aggregate = self._get_or_create(module, action)
+            aggregate.decisions += 1
+            aggregate.approved += int(bool(approved))
+
+    def record_feedback(
+        self,
+        module: str,
+        action: str,
+        success: bool,
+        duration_ms: Optional[float] = None,
+        issues: Optional[Iterable[str]] = None
+    ):
+        """Fold an actual-outcome feedback event into the aggregate"""
+
+        with self._lock:
+            aggregate = self._get_or_create(module, action)
+            aggregate.feedback += 1
+            aggregate.feedback_success += int(bool(success))
+            if duration_ms is not None:
+                aggregate.durations.add(duration_ms)
+            for issue in issues or []:
+                aggregate.issues.add(issue)
+
+    def get(self, module: str, action: str) -> Optional[Dict]:
+        """Snapshot for PFM, or None when nothing has been recorded"""
+
+        with self._lock:
+            aggregate = self._aggregates.get((module, action))
+            if aggregate is None or aggregate.success_rate(self.min_feedback) is None:
+                return None
+            return aggregate.snapshot(self.min_feedback)
+
+    def get_stats(self) -> Dict:
+        """Get store statistics"""
+
+        with self._lock:
+            return {
+                'tracked_actions': len(self._aggregates),
+                'total_decisions': sum(a.decisions for a in self._aggregates.values()),
+                'total_feedback': sum(a.feedback for a in self._aggregates.values())
+            }
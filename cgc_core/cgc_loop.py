@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 import json
 
+from .action_aggregates import ActionAggregateStore
+
 
 class GovernanceOrchestrator:
     """
@@ -20,7 +22,8 @@ class GovernanceOrchestrator:
         ecm_module,
         pfm_module,
         sda_module,
-        tco_module
+        tco_module,
+        aggregate_store: Optional[ActionAggregateStore] = None
     ):
         self.module_name = "CGC_LOOP"
         self.version = "2.1.4"
@@ -38,6 +41,9 @@ class GovernanceOrchestrator:
         self.sda = sda_module
         self.tco = tco_module
         
+        # Per-(module, action) history handed to PFM
+        self.aggregates = aggregate_store or ActionAggregateStore()
+        
         # System state
         self.system_state = {
             'initialized': datetime.now().isoformat(),
@@ -87,7 +93,13 @@ class GovernanceOrchestrator:
         
         # PHASE 3: PREDICTIVE FEEDBACK (PFM)
         print("   3️⃣ PFM: Predicting outcome...")
-        prediction_result = self.pfm.predict(action, input_data, context)
+        prediction_result = self.pfm.predict(
+            action,
+            input_data,
+            context,
+            aggregate=self.aggregates.get(module, action),
+            perception=perception_result
+        )
         
         # PHASE 4: SMART DATA ADVISORY (SDA)
         print("   4️⃣ SDA: Generating insights...")
@@ -113,7 +125,11 @@ class GovernanceOrchestrator:
         )
         
         # Calculate total processing time
-        total_time = (datetime.now() - start_time).total_microseconds() / 1000
+        total_time = (datetime.now() - start_time).total_seconds() * 1000
+        
+        # Fold the approval into per-action history (durations and issues
+        # come only from real outcomes, see record_outcome)
+        self.aggregates.record_decision(module, action, approved=decision['approved'])
         
         # Update orchestration count
         self.total_orchestrations += 1
@@ -163,6 +179,35 @@ class GovernanceOrchestrator:
         
         return complete_result
     
+    def record_outcome(
+        self,
+        module: str,
+        action: str,
+        prediction_id: str,
+        actual_outcome: Dict
+    ):
+        """
+        Feed an actual outcome back into PFM and the action aggregates
+        
+        Args:
+            module: Module that requested the decision
+            action: Action that was performed
+            prediction_id: PFM prediction_id from the decision's module results
+            actual_outcome: What actually happened ('result', optional 'success',
+                            'duration_ms', 'issues')
+        """
+        
+        self.pfm.feedback_actual_outcome(prediction_id, actual_outcome)
+        
+        success = actual_outcome.get('success', actual_outcome.get('result') == 'success')
+        self.aggregates.record_feedback(
+            module,
+            action,
+            success=success,
+            duration_ms=actual_outcome.get('duration_ms'),
+            issues=actual_outcome.get('issues', [])
+        )
+    
     def _synthesize_decision(
         self,
         perception: Dict,
@@ -304,6 +349,7 @@ class GovernanceOrchestrator:
             'error_rate': self.error_rate,
             'total_orchestrations': self.total_orchestrations,
             'success_rate': round(success_rate * 100, 1),
+            'action_aggregates': self.aggregates.get_stats(),
             'modules_managed': 5
         }
 
@@ -315,11 +361,11 @@ if __name__ == '__main__':
     print("="*70 + "\n")
     
     # Initialize all modules
-    from pan_module import PerceptionAnalysisNode
-    from ecm_module import EthicalCalibrationModule
-    from pfm_module import PredictiveFeedbackMechanism
-    from sda_module import SmartDataAdvisor
-    from tco_module import TraceabilityOversight
+    from .pan_module import PerceptionAnalysisNode
+    from .ecm_module import EthicalCalibrationModule
+    from .pfm_module import PredictiveFeedbackMechanism
+    from .sda_module import SmartDataAdvisor
+    from .tco_module import TraceabilityOversight
     
     pan = PerceptionAnalysisNode()
     ecm = EthicalCalibrationModule()
@@ -67,7 +67,7 @@ class EthicalCalibrationModule:
         recommendations = self._generate_recommendations(concerns)
         
         # Processing time
-        processing_time = (datetime.now() - start_time).total_microseconds() / 1000
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
         self.total_calibrations += 1
         
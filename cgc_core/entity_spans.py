@@ -0,0 +1,134 @@
+"""
+Entity Spans
+Offset-based extraction of monetary amounts and dates shared by PAN and
+the DiscipleAI Legal analyzers
+"""
+
+from datetime import date, datetime
+from typing import Dict, Iterator, Optional, Sequence
+import re
+
+
+AMOUNT_PATTERN = re.compile(r'\$[\d,]+(?:\.\d{2})?')
+
+MONTHS = (
+    'January|February|March|April|May|June|July|August|'
+    'September|October|November|December'
+)
+
+# Date formats by kind, matched in one left-to-right scan
+DATE_FORMATS = {
+    'slash': r'\d{1,2}/\d{1,2}/\d{4}',
+    'iso': r'\d{4}-\d{2}-\d{2}',
+    'long': rf'(?:{MONTHS})\s+\d{{1,2}},?\s+\d{{4}}'
+}
+
+_date_patterns: Dict[Sequence[str], 're.Pattern'] = {}
+
+
+def _date_pattern(kinds: Sequence[str]) -> 're.Pattern':
+    kinds = tuple(kinds)
+    pattern = _date_patterns.get(kinds)
+    if pattern is None:
+        alternation = '|'.join(f'(?P<{kind}>{DATE_FORMATS[kind]})' for kind in kinds)
+        pattern = re.compile(alternation, re.IGNORECASE)
+        _date_patterns[kinds] = pattern
+    return pattern
+
+
+def _context(text: str, start: int, before: int, after: int) -> str:
+    return text[max(0, start - before):start + after].strip()
+
+
+def parse_amount(value: str) -> Optional[float]:
+    """'$1,250.00' -> 1250.0 (None when there are no digits)"""
+
+    digits = value.replace('$', '').replace(',', '')
+    try:
+        return float(digits)
+    except ValueError:
+        return None
+
+
+def parse_date(value: str, kind: str) -> Optional[str]:
+    """
+    ISO form of a matched date
+
+    Slash dates are read as US month/day/year. Returns None for impossible
+    calendar dates.
+    """
+
+    try:
+        if kind == 'iso':
+            return date.fromisoformat(value).isoformat()
+        if kind == 'slash':
+            month, day, year = (int(part) for part in value.split('/'))
+            return date(year, month, day).isoformat()
+        if kind == 'long':
+            normalized = ' '.join(value.replace(',', ' ').split()).title()
+            return datetime.strptime(normalized, '%B %d %Y').date().isoformat()
+    except ValueError:
+        return None
+    return None
+
+
+def iter_amounts(text: str, context_before: int = 50, context_after: int = 100) -> Iterator[Dict]:
+    """
+    Yield every monetary amount in document order
+
+    Each item carries the matched text, its offsets, the context window
+    around that occurrence and the parsed numeric value.
+    """
+
+    for match in AMOUNT_PATTERN.finditer(text):
+        start = match.start()
+        yield {
+            'amount': match.group(),
+            'start': start,
+            'end': match.end(),
+            'numeric': parse_amount(match.group()),
+            'context': _context(text, start, context_before, context_after)
+        }
+
+
+def iter_dates(
+    text: str,
+    kinds: Sequence[str] = ('slash', 'iso', 'long'),
+    context_before: int = 50,
+    context_after: int = 100
+) -> Iterator[Dict]:
+    """
+    Yield every date in document order
+
+    Args:
+        text: Text to scan
+        kinds: Date formats to recognize (see DATE_FORMATS)
+        context_before: Characters of context before the match
+        context_after: Characters of context from the match start
+
+    Each item carries the matched text, its offsets, the format kind, the
+    ISO date (None if the calendar date is invalid) and its context.
+    """
+
+    for match in _date_pattern(kinds).finditer(text):
+        start = match.start()
+        kind = match.lastgroup
+        yield {
+            'date': match.group(),
+            'start': start,
+            'end': match.end(),
+            'kind': kind,
+            'iso': parse_date(match.group(), kind),
+            'context': _context(text, start, context_before, context_after)
+        }
+
+
+def first_unique(spans: Iterator[Dict], key: str, limit: int) -> list:
+    """First `limit` distinct values of `key`, consuming only as much of the stream as needed"""
+
+    seen = {}
+    for span in spans:
+        seen.setdefault(span[key], None)
+        if len(seen) >= limit:
+            break
+    return list(seen)
@@ -0,0 +1,304 @@
+"""
+PFM Outcome Model
+Online logistic regression over hashed PAN features
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import json
+import math
+import os
+import threading
+import zlib
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Sparse feature vector: (indices, values)
+Features = Tuple[List[int], List[float]]
+
+
+def hash_features(action: str, data: Dict, perception: Optional[Dict] = None, dim: int = 4096) -> Features:
+    """
+    Build a compact hashed feature vector
+
+    Args:
+        action: Action being predicted
+        data: Input data
+        perception: PAN analysis output (preferred source of features)
+        dim: Hashing space size
+
+    Returns:
+        Sorted unique indices and their values
+    """
+
+    tokens = [f'action={action}']
+    numeric = {}
+
+    if perception:
+        semantic = perception.get('semantic_analysis', {})
+        tokens.append(f"domain={semantic.get('domain', 'unknown')}")
+        tokens.append(f"complexity={semantic.get('complexity', 'unknown')}")
+        tokens.extend(f'concept={c}' for c in semantic.get('key_concepts', []))
+
+        for field in perception.get('context', {}).get('fields', [])[:20]:
+            tokens.append(f'field={field}')
+
+        for kind, found in perception.get('entities', {}).items():
+            if found:
+                tokens.append(f'has_{kind}')
+
+        numeric['data_quality'] = float(perception.get('data_quality_score', 0.0))
+    elif isinstance(data, dict):
+        tokens.extend(f'field={k}' for k in list(data.keys())[:20])
+
+    values: Dict[int, float] = {}
+    for token in tokens:
+        values[zlib.crc32(token.encode('utf-8')) % dim] = 1.0
+    for name, value in numeric.items():
+        values[zlib.crc32(f'num={name}'.encode('utf-8')) % dim] = value
+
+    indices = sorted(values)
+    return indices, [values[i] for i in indices]
+
+
+class OnlineOutcomeModel:
+    """
+    Online outcome model for PFM
+    Serving is a sparse dot product; SGD updates run in a background thread
+    and publish a new weight vector (and version) per batch.
+    """
+
+    def __init__(
+        self,
+        dim: int = 4096,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        batch_size: int = 32,
+        train_interval: float = 5.0,
+        min_examples: int = 20,
+        model_path: Optional[str] = None,
+        snapshot_every: int = 10
+    ):
+        """
+        Args:
+            dim: Hashed feature space size
+            learning_rate: SGD step size
+            l2: L2 regularization strength
+            batch_size: Examples that trigger a training batch
+            train_interval: Max seconds queued examples wait for training
+            min_examples: Examples required before the model is used
+            model_path: JSON file for weight snapshots (None disables persistence)
+            snapshot_every: Batches between snapshots
+        """
+
+        self.dim = dim
+        self.learning_rate = learning_rate
+        self.l2 = l2
+        self.batch_size = batch_size
+        self.train_interval = train_interval
+        self.min_examples = min_examples
+        self.model_path = model_path
+        self.snapshot_every = snapshot_every
+
+        # Published model state, swapped atomically by the trainer
+        self._weights = self._zeros()
+        self._bias = 0.0
+        self.version = 0
+        self.examples_seen = 0
+        self.trained_at = None
+
+        # Training queue
+        self._queue = deque()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._train_lock = threading.Lock()
+        self._thread = None
+        self._batches = 0
+
+        if self.model_path and os.path.exists(self.model_path):
+            self.load(self.model_path)
+
+    def _zeros(self):
+        return np.zeros(self.dim, dtype=np.float64) if NUMPY_AVAILABLE else [0.0] * self.dim
+
+    @property
+    def model_version(self) -> str:
+        return f"outcome-v{self.version}"
+
+    @property
+    def ready(self) -> bool:
+        """Whether the model has seen enough feedback to be trusted"""
+        return self.examples_seen >= self.min_examples
+
+    def predict_proba(self, features: Features) -> float:
+        """Probability of a successful outcome"""
+
+        indices, values = features
+        weights, bias = self._weights, self._bias
+
+        if NUMPY_AVAILABLE:
+            z = bias + float(np.dot(weights[indices], values)) if indices else bias
+        else:
+            z = bias + sum(weights[i] * v for i, v in zip(indices, values))
+
+        return _sigmoid(z)
+
+    def observe(self, features: Features, label: bool):
+        """Queue a labelled example for background training"""
+
+        self._queue.append((features, 1.0 if label else 0.0))
+        self._ensure_trainer()
+
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_trainer(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._train_loop, name='pfm-outcome-trainer', daemon=True)
+            self._thread.start()
+
+    def _train_loop(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.train_interval)
+            self._wakeup.clear()
+            self.train_pending()
+
+    def train_pending(self) -> int:
+        """
+        Train on all queued examples
+
+        Returns:
+            Number of examples consumed
+        """
+
+        with self._train_lock:
+            batch = []
+            while self._queue:
+                batch.append(self._queue.popleft())
+
+            if not batch:
+                return 0
+
+            weights = self._weights.copy() if NUMPY_AVAILABLE else list(self._weights)
+            bias = self._bias
+
+            for start in range(0, len(batch), self.batch_size):
+                weights, bias = self._sgd_step(weights, bias, batch[start:start + self.batch_size])
+
+            # Publish the new model
+            self._weights, self._bias = weights, bias
+            self.version += 1
+            self.examples_seen += len(batch)
+            self.trained_at = datetime.now().isoformat()
+            self._batches += 1
+
+            if self.model_path and self._batches % self.snapshot_every == 0:
+                self.save(self.model_path)
+
+            return len(batch)
+
+    def _sgd_step(self, weights, bias: float, batch: List):
+        """One mini-batch logistic-loss gradient step"""
+
+        rate = self.learning_rate / len(batch)
+        gradient: Dict[int, float] = {}
+        bias_gradient = 0.0
+
+        for (indices, values), label in batch:
+            if NUMPY_AVAILABLE:
+                z = bias + float(np.dot(weights[indices], values)) if indices else bias
+            else:
+                z = bias + sum(weights[i] * v for i, v in zip(indices, values))
+            error = _sigmoid(z) - label
+            bias_gradient += error
+            for i, v in zip(indices, values):
+                gradient[i] = gradient.get(i, 0.0) + error * v
+
+        if gradient:
+            touched = list(gradient)
+            if NUMPY_AVAILABLE:
+                grad = np.fromiter((gradient[i] for i in touched), dtype=np.float64, count=len(touched))
+                weights[touched] -= rate * (grad + self.l2 * weights[touched])
+            else:
+                for i in touched:
+                    weights[i] -= rate * (gradient[i] + self.l2 * weights[i])
+
+        return weights, bias - rate * bias_gradient
+
+    def save(self, path: str):
+        """Snapshot weights to JSON"""
+
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        weights = self._weights
+        snapshot = {
+            'dim': self.dim,
+            'version': self.version,
+            'examples_seen': self.examples_seen,
+            'trained_at': self.trained_at,
+            'bias': self._bias,
+            'weights': {str(i): float(w) for i, w in enumerate(weights) if w != 0.0}
+        }
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str):
+        """Restore weights from a JSON snapshot"""
+
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+
+        if snapshot.get('dim') != self.dim:
+            return
+
+        weights = self._zeros()
+        for i, w in snapshot.get('weights', {}).items():
+            weights[int(i)] = w
+
+        self._weights = weights
+        self._bias = snapshot.get('bias', 0.0)
+        self.version = snapshot.get('version', 0)
+        self.examples_seen = snapshot.get('examples_seen', 0)
+        self.trained_at = snapshot.get('trained_at')
+
+    def close(self):
+        """Stop the trainer, train leftovers and snapshot"""
+
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.train_pending()
+        if self.model_path and self.version:
+            self.save(self.model_path)
+
+    def get_stats(self) -> Dict:
+        """Get model statistics"""
+
+        return {
+            'model_version': self.model_version,
+            'examples_seen': self.examples_seen,
+            'queued_examples': len(self._queue),
+            'ready': self.ready,
+            'trained_at': self.trained_at,
+            'backend': 'numpy' if NUMPY_AVAILABLE else 'python'
+        }
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
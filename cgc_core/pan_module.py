@@ -5,9 +5,13 @@ Real-time data interpretation and context synthesis
 
 import json
 from datetime import datetime
-from typing import Dict, Any
+from itertools import islice
+from typing import Dict, Any, Optional
 import hashlib
 
+from .entity_spans import iter_amounts, iter_dates
+from .shape_cache import ShapeCache, get_shape_cache
+
 
 class PerceptionAnalysisNode:
     """
@@ -15,7 +19,7 @@ class PerceptionAnalysisNode:
     Interprets input data and extracts meaningful context
     """
     
-    def __init__(self):
+    def __init__(self, shape_cache: Optional[ShapeCache] = None):
         self.module_name = "PAN"
         self.version = "2.1.4"
         self.status = "active"
@@ -25,6 +29,9 @@ class PerceptionAnalysisNode:
         self.avg_response_time = 127  # milliseconds
         self.error_rate = 0.02
         
+        # Structural facts shared with SDA
+        self.shape_cache = shape_cache or get_shape_cache()
+        
         print(f"✅ {self.module_name}™ v{self.version} initialized")
     
     def analyze(self, input_data: Dict[str, Any], context: Dict = None) -> Dict:
@@ -54,7 +61,7 @@ class PerceptionAnalysisNode:
         entities = self._recognize_entities(input_data)
         
         # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_microseconds() / 1000
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
         self.total_processed += 1
         
@@ -89,12 +96,10 @@ class PerceptionAnalysisNode:
         else:
             quality *= 0.8
         
-        # Check for null/empty values
-        if isinstance(data, dict):
-            total_fields = len(data)
-            empty_fields = sum(1 for v in data.values() if not v)
-            if total_fields > 0:
-                quality *= (1 - (empty_fields / total_fields) * 0.3)
+        # Check for null/empty values (cached per payload shape)
+        facts = self.shape_cache.facts(data)
+        if facts and facts['total_fields'] > 0:
+            quality *= (1 - (facts['empty_fields'] / facts['total_fields']) * 0.3)
         
         return round(quality, 3)
     
@@ -167,13 +172,10 @@ class PerceptionAnalysisNode:
         text = str(data)
         
         # Dates (basic detection)
-        import re
-        date_pattern = r'\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}'
-        entities['dates'] = re.findall(date_pattern, text)[:5]
+        entities['dates'] = [d['date'] for d in islice(iter_dates(text, kinds=('iso', 'slash')), 5)]
         
         # Amounts (basic detection)
-        amount_pattern = r'\$[\d,]+(?:\.\d{2})?'
-        entities['amounts'] = re.findall(amount_pattern, text)[:5]
+        entities['amounts'] = [a['amount'] for a in islice(iter_amounts(text), 5)]
         
         return entities
     
@@ -197,7 +199,8 @@ class PerceptionAnalysisNode:
             'accuracy': self.accuracy_rate,
             'response_time_ms': self.avg_response_time,
             'error_rate': self.error_rate,
-            'total_processed': self.total_processed
+            'total_processed': self.total_processed,
+            'shape_cache': self.shape_cache.get_stats()
         }
 
 
@@ -0,0 +1,32 @@
+"""
+Payload Facts
+Structural data-quality facts of a payload (cached per shape by shape_cache)
+"""
+
+from typing import Any, Dict, Optional
+
+
+def payload_facts(data: Any) -> Optional[Dict]:
+    """
+    Structural quality facts of a payload, in one pass over its top level
+
+    Returns:
+        Facts dict, or None for non-dict payloads
+    """
+
+    if not isinstance(data, dict):
+        return None
+
+    keys_lower = [str(k).lower() for k in data.keys()]
+    total_fields = len(data)
+    empty_fields = sum(1 for v in data.values() if not v)
+
+    return {
+        'total_fields': total_fields,
+        'empty_fields': empty_fields,
+        'filled_fields': total_fields - empty_fields,
+        'has_metadata': 'metadata' in data,
+        'has_timestamp': any('time' in k or 'date' in k for k in keys_lower),
+        'has_identifiers': any('id' in k for k in keys_lower),
+        'nested': any(isinstance(v, dict) for v in data.values())
+    }
@@ -4,9 +4,14 @@ Predictive analytics and adaptive learning
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import atexit
 import json
 import random
+import uuid
+
+from .prediction_store import PredictionStore
+from .outcome_model import OnlineOutcomeModel, hash_features
 
 
 class PredictiveFeedbackMechanism:
@@ -15,7 +20,12 @@ class PredictiveFeedbackMechanism:
     Generates forecasts and monitors outcomes
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        history_size: int = 1000,
+        history_db_path: Optional[str] = 'data/pfm_history.db',
+        model_path: Optional[str] = 'data/pfm_model.json'
+    ):
         self.module_name = "PFM"
         self.version = "2.1.4"
         self.status = "active"
@@ -25,8 +35,17 @@ class PredictiveFeedbackMechanism:
         self.avg_response_time = 342  # ms
         self.error_rate = 0.06
         
-        # Historical predictions for learning
-        self.prediction_history = []
+        # Historical predictions for learning (bounded, indexed by prediction_id)
+        self.prediction_history = PredictionStore(
+            capacity=history_size,
+            db_path=history_db_path
+        )
+        
+        # Outcome model trained online from feedback
+        self.outcome_model = OnlineOutcomeModel(model_path=model_path)
+        
+        # Buffered history and model weights are written out when the process exits
+        atexit.register(self.shutdown)
         
         print(f"✅ {self.module_name}™ v{self.version} initialized")
     
@@ -35,7 +54,9 @@ class PredictiveFeedbackMechanism:
         action: str, 
         data: Dict, 
         context: Dict = None,
-        historical_data: List[Dict] = None
+        historical_data: List[Dict] = None,
+        aggregate: Optional[Dict] = None,
+        perception: Optional[Dict] = None
     ) -> Dict:
         """
         Generate prediction for action outcome
@@ -45,6 +66,9 @@ class PredictiveFeedbackMechanism:
             data: Input data
             context: Context information
             historical_data: Past similar actions
+            aggregate: Precomputed patterns for this action (see ActionAggregateStore);
+                       takes precedence over historical_data
+            perception: PAN output, used to build the outcome model features
             
         Returns:
             Prediction with confidence
@@ -52,17 +76,24 @@ class PredictiveFeedbackMechanism:
         
         start_time = datetime.now()
         
-        # Analyze historical patterns
-        patterns = self._analyze_patterns(action, historical_data or [])
+        # Analyze historical patterns (aggregates are already summarized)
+        if aggregate and aggregate.get('sample_size', 0) > 0:
+            patterns = aggregate
+        else:
+            patterns = self._analyze_patterns(action, historical_data or [])
+        
+        # Outcome model (a sparse dot product; training happens in the background)
+        features = hash_features(action, data, perception, self.outcome_model.dim)
+        model_probability = self.outcome_model.predict_proba(features) if self.outcome_model.ready else None
         
         # Generate outcome prediction
-        outcome_prediction = self._predict_outcome(action, data, patterns)
+        outcome_prediction = self._predict_outcome(action, data, patterns, model_probability)
         
         # Assess risks
         risk_assessment = self._assess_risks(action, data, outcome_prediction)
         
         # Calculate confidence
-        confidence = self._calculate_confidence(patterns, data)
+        confidence = self._calculate_confidence(patterns, data, model_probability)
         
         # Estimate timeline
         timeline = self._estimate_timeline(action, patterns)
@@ -71,7 +102,7 @@ class PredictiveFeedbackMechanism:
         insights = self._generate_insights(outcome_prediction, risk_assessment)
         
         # Processing time
-        processing_time = (datetime.now() - start_time).total_microseconds() / 1000
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
         self.total_predictions += 1
         
@@ -87,17 +118,24 @@ class PredictiveFeedbackMechanism:
             'insights': insights,
             'processing_time_ms': round(processing_time, 2),
             'timestamp': datetime.now().isoformat(),
-            'prediction_id': f"PFM-{self.total_predictions:06d}"
+            'prediction_id': self._generate_prediction_id(),
+            'model_version': self.outcome_model.model_version
         }
         
         # Store for learning
-        self.prediction_history.append({
+        self.prediction_history.add({
             'prediction': prediction,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            'features': features
         })
         
         return prediction
     
+    def _generate_prediction_id(self) -> str:
+        """Unique across processes and restarts (the id keys the shared history table)"""
+        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        return f"PFM-{timestamp}-{uuid.uuid4().hex[:12]}"
+    
     def _analyze_patterns(self, action: str, historical: List[Dict]) -> Dict:
         """Analyze historical patterns"""
         
@@ -120,14 +158,26 @@ class PredictiveFeedbackMechanism:
             'common_issues': self._extract_common_issues(historical)
         }
     
-    def _predict_outcome(self, action: str, data: Dict, patterns: Dict) -> Dict:
+    def _predict_outcome(
+        self,
+        action: str,
+        data: Dict,
+        patterns: Dict,
+        model_probability: Optional[float] = None
+    ) -> Dict:
         """Predict action outcome"""
         
-        base_success_rate = patterns.get('success_rate', 0.85)
-        
-        # Adjust based on data quality
-        data_quality = len(str(data)) / 1000  # Simple heuristic
-        adjusted_rate = min(base_success_rate * (0.9 + data_quality * 0.1), 0.99)
+        if model_probability is not None:
+            # Learned from feedback
+            adjusted_rate = min(model_probability, 0.99)
+            basis = 'online_model'
+        else:
+            base_success_rate = patterns.get('success_rate', 0.85)
+            
+            # Adjust based on data quality
+            data_quality = len(str(data)) / 1000  # Simple heuristic
+            adjusted_rate = min(base_success_rate * (0.9 + data_quality * 0.1), 0.99)
+            basis = 'historical_patterns' if patterns['sample_size'] > 0 else 'baseline_model'
         
         # Determine outcome
         if adjusted_rate >= 0.85:
@@ -143,7 +193,7 @@ class PredictiveFeedbackMechanism:
         return {
             'predicted': outcome,
             'probability': round(probability, 3),
-            'basis': 'historical_patterns' if patterns['sample_size'] > 0 else 'baseline_model'
+            'basis': basis
         }
     
     def _assess_risks(self, action: str, data: Dict, outcome: Dict) -> Dict:
@@ -192,9 +242,19 @@ class PredictiveFeedbackMechanism:
             'count': len(risks)
         }
     
-    def _calculate_confidence(self, patterns: Dict, data: Dict) -> float:
+    def _calculate_confidence(
+        self,
+        patterns: Dict,
+        data: Dict,
+        model_probability: Optional[float] = None
+    ) -> float:
         """Calculate prediction confidence"""
         
+        if model_probability is not None:
+            # Confidence grows with how decisive the model is
+            certainty = abs(model_probability - 0.5) * 2
+            return min(0.80 + certainty * 0.15, 0.95)
+        
         base_confidence = 0.85
         
         # Increase confidence with more historical data
@@ -287,33 +347,48 @@ class PredictiveFeedbackMechanism:
             actual_outcome: What actually happened
         """
         
-        # Find prediction
-        for entry in self.prediction_history:
-            if entry['prediction']['prediction_id'] == prediction_id:
-                entry['actual_outcome'] = actual_outcome
-                entry['feedback_timestamp'] = datetime.now().isoformat()
-                
-                # Calculate accuracy
-                predicted = entry['prediction']['outcome']['predicted']
-                actual = actual_outcome.get('result', 'unknown')
-                
-                if predicted == actual:
-                    entry['accurate'] = True
-                    print(f"✅ Prediction {prediction_id} was accurate")
-                else:
-                    entry['accurate'] = False
-                    print(f"⚠️ Prediction {prediction_id} needs adjustment")
-                
-                break
+        # O(1) lookup by prediction_id (spilled predictions come from SQLite)
+        entry = self.prediction_history.get(prediction_id)
+        if entry is None:
+            print(f"⚠️ Prediction {prediction_id} not found")
+            return
+        
+        # Calculate accuracy
+        predicted = entry['prediction']['outcome']['predicted']
+        actual = actual_outcome.get('result', 'unknown')
+        accurate = predicted == actual
+        
+        self.prediction_history.record_feedback(
+            prediction_id,
+            actual_outcome,
+            accurate,
+            datetime.now().isoformat()
+        )
+        
+        # Queue a training example for the outcome model
+        if entry.get('features'):
+            success = actual_outcome.get('success', actual == 'success')
+            self.outcome_model.observe(tuple(entry['features']), bool(success))
+        
+        if accurate:
+            print(f"✅ Prediction {prediction_id} was accurate")
+        else:
+            print(f"⚠️ Prediction {prediction_id} needs adjustment")
+    
+    def shutdown(self):
+        """Flush buffered prediction history and snapshot the outcome model"""
+        
+        self.prediction_history.close()
+        self.outcome_model.close()
     
     def get_metrics(self) -> Dict:
         """Get module metrics"""
         
-        # Calculate accuracy from feedback
-        accurate = sum(1 for e in self.prediction_history if e.get('accurate', False))
-        total_feedback = sum(1 for e in self.prediction_history if 'actual_outcome' in e)
+        # Accuracy from feedback (maintained incrementally by the store)
+        total_feedback = self.prediction_history.total_feedback
+        accuracy = self.prediction_history.accuracy()
         
-        calculated_accuracy = (accurate / total_feedback * 100) if total_feedback > 0 else self.accuracy_rate
+        calculated_accuracy = accuracy * 100 if accuracy is not None else self.accuracy_rate
         
         return {
             'module': self.module_name,
@@ -326,6 +401,8 @@ class PredictiveFeedbackMechanism:
             'error_rate': self.error_rate,
             'total_predictions': self.total_predictions,
             'predictions_with_feedback': total_feedback,
+            'history': self.prediction_history.get_stats(),
+            'outcome_model': self.outcome_model.get_stats(),
             'learning_active': True
         }
 
@@ -336,7 +413,7 @@ if __name__ == '__main__':
     print("PFM MODULE - Test")
     print("="*70 + "\n")
     
-    pfm = PredictiveFeedbackMechanism()
+    pfm = PredictiveFeedbackMechanism(history_db_path=None, model_path=None)
     
     test_data = {
         'action': 'analyze_contract',
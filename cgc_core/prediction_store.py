@@ -0,0 +1,303 @@
+"""
+PFM Prediction Store
+Bounded, indexed prediction history with SQLite spill-over
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Optional
+import json
+import os
+import sqlite3
+import threading
+
+
+class PredictionStore:
+    """
+    Prediction history for PFM
+    Ring buffer of recent predictions indexed by prediction_id.
+    Evicted predictions are spilled to SQLite so late feedback still lands.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        db_path: Optional[str] = 'data/pfm_history.db',
+        spill_batch: int = 100
+    ):
+        """
+        Args:
+            capacity: Max predictions kept in memory
+            db_path: SQLite file for evicted predictions (None disables spill-over)
+            spill_batch: Evicted entries buffered before a write to SQLite
+        """
+
+        self.capacity = max(1, capacity)
+        self.db_path = db_path
+        self.spill_batch = max(1, spill_batch)
+
+        # Recent predictions: ids in insertion order + O(1) index
+        self._ring = deque()
+        self._index: Dict[str, Dict] = {}
+
+        # Evicted entries waiting to be written
+        self._pending: Dict[str, Dict] = {}
+
+        self._lock = threading.RLock()
+        self._conn = None
+
+        # Incremental statistics
+        self.total_stored = 0
+        self.total_spilled = 0
+        self.total_feedback = 0
+        self.accurate_feedback = 0
+
+        if self.db_path:
+            parent = os.path.dirname(self.db_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            self._init_db()
+
+    def _init_db(self):
+        """Initialize spill-over database"""
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS prediction_history (
+                prediction_id TEXT PRIMARY KEY,
+                timestamp TEXT,
+                prediction TEXT,
+                actual_outcome TEXT,
+                feedback_timestamp TEXT,
+                accurate INTEGER,
+                extra TEXT
+            )
+        ''')
+        # Feedback counters shared by every process using this database
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS prediction_feedback_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_feedback INTEGER NOT NULL DEFAULT 0,
+                accurate_feedback INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self._conn.execute('INSERT OR IGNORE INTO prediction_feedback_stats (id) VALUES (1)')
+        self._conn.commit()
+        self.total_feedback, self.accurate_feedback = self._conn.execute(
+            'SELECT total_feedback, accurate_feedback FROM prediction_feedback_stats WHERE id = 1'
+        ).fetchone()
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Iterate over in-memory entries, oldest first"""
+
+        with self._lock:
+            entries = [self._index[pid] for pid in self._ring]
+        return iter(entries)
+
+    def add(self, entry: Dict) -> None:
+        """
+        Store a prediction entry
+
+        Args:
+            entry: Dict with at least 'prediction' (carrying 'prediction_id') and 'timestamp'
+        """
+
+        prediction_id = entry['prediction']['prediction_id']
+
+        with self._lock:
+            if prediction_id in self._index:
+                self._index[prediction_id] = entry
+                return
+
+            if len(self._ring) >= self.capacity:
+                evicted_id = self._ring.popleft()
+                self._evict(self._index.pop(evicted_id))
+
+            self._ring.append(prediction_id)
+            self._index[prediction_id] = entry
+            self.total_stored += 1
+
+    def get(self, prediction_id: str) -> Optional[Dict]:
+        """Look up a prediction entry (memory first, then spill-over)"""
+
+        with self._lock:
+            entry = self._index.get(prediction_id) or self._pending.get(prediction_id)
+            if entry is not None:
+                return entry
+            return self._load(prediction_id)
+
+    def record_feedback(
+        self,
+        prediction_id: str,
+        actual_outcome: Dict,
+        accurate: bool,
+        feedback_timestamp: str
+    ) -> Optional[Dict]:
+        """
+        Attach an actual outcome to a stored prediction
+
+        Repeated feedback for the same prediction replaces the previous
+        one without double counting.
+
+        Returns:
+            Updated entry, or None if the prediction is unknown
+        """
+
+        with self._lock:
+            entry = self.get(prediction_id)
+            if entry is None:
+                return None
+
+            total_delta, accurate_delta = 1, int(accurate)
+            if 'actual_outcome' in entry:
+                total_delta -= 1
+                accurate_delta -= int(bool(entry.get('accurate')))
+
+            entry['actual_outcome'] = actual_outcome
+            entry['feedback_timestamp'] = feedback_timestamp
+            entry['accurate'] = accurate
+
+            self._count_feedback(total_delta, accurate_delta)
+
+            # Entries already on disk are updated in place
+            if prediction_id not in self._index and prediction_id not in self._pending:
+                self._write([entry])
+
+            return entry
+
+    def _count_feedback(self, total_delta: int, accurate_delta: int) -> None:
+        """Apply counter deltas (persisted when spill-over is enabled), never below zero"""
+
+        if self._conn is None:
+            self.total_feedback = max(0, self.total_feedback + total_delta)
+            self.accurate_feedback = max(0, min(self.total_feedback, self.accurate_feedback + accurate_delta))
+            return
+
+        # Relative update, so concurrent processes do not overwrite each other
+        self._conn.execute('''
+            UPDATE prediction_feedback_stats
+            SET total_feedback = MAX(0, total_feedback + ?),
+                accurate_feedback = MAX(0, accurate_feedback + ?)
+            WHERE id = 1
+        ''', (total_delta, accurate_delta))
+        self._conn.commit()
+        self.total_feedback, self.accurate_feedback = self._conn.execute(
+            'SELECT total_feedback, accurate_feedback FROM prediction_feedback_stats WHERE id = 1'
+        ).fetchone()
+
+    def accuracy(self) -> Optional[float]:
+        """Accuracy over predictions with feedback (None without feedback)"""
+
+        if self.total_feedback == 0:
+            return None
+        return self.accurate_feedback / self.total_feedback
+
+    def flush(self) -> None:
+        """Write buffered evictions to SQLite"""
+
+        with self._lock:
+            if self._pending:
+                self._write(list(self._pending.values()))
+                self._pending.clear()
+
+    def close(self) -> None:
+        """Flush and close the spill-over database"""
+
+        with self._lock:
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        """Most recent entries, newest first"""
+
+        with self._lock:
+            ids = list(self._ring)[-limit:] if limit > 0 else []
+            return [self._index[pid] for pid in reversed(ids)]
+
+    def _evict(self, entry: Dict) -> None:
+        """Move an entry out of the ring buffer"""
+
+        if self._conn is None:
+            return
+
+        self._pending[entry['prediction']['prediction_id']] = entry
+        self.total_spilled += 1
+
+        if len(self._pending) >= self.spill_batch:
+            self.flush()
+
+    def _write(self, entries: List[Dict]) -> None:
+        """Upsert entries into SQLite"""
+
+        if self._conn is None:
+            return
+
+        rows = []
+        for entry in entries:
+            extra = {
+                k: v for k, v in entry.items()
+                if k not in ('prediction', 'timestamp', 'actual_outcome', 'feedback_timestamp', 'accurate')
+            }
+            rows.append((
+                entry['prediction']['prediction_id'],
+                entry.get('timestamp'),
+                json.dumps(entry['prediction'], default=str),
+                json.dumps(entry['actual_outcome'], default=str) if 'actual_outcome' in entry else None,
+                entry.get('feedback_timestamp'),
+                int(entry['accurate']) if 'accurate' in entry else None,
+                json.dumps(extra, default=str) if extra else None
+            ))
+
+        self._conn.executemany('''
+            INSERT OR REPLACE INTO prediction_history
+            (prediction_id, timestamp, prediction, actual_outcome, feedback_timestamp, accurate, extra)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        self._conn.commit()
+
+    def _load(self, prediction_id: str) -> Optional[Dict]:
+        """Load a spilled entry by primary key"""
+
+        if self._conn is None:
+            return None
+
+        row = self._conn.execute('''
+            SELECT timestamp, prediction, actual_outcome, feedback_timestamp, accurate, extra
+            FROM prediction_history WHERE prediction_id = ?
+        ''', (prediction_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        timestamp, prediction, actual_outcome, feedback_timestamp, accurate, extra = row
+
+        entry = {
+            'prediction': json.loads(prediction),
+            'timestamp': timestamp
+        }
+        if extra:
+            entry.update(json.loads(extra))
+        if actual_outcome is not None:
+            entry['actual_outcome'] = json.loads(actual_outcome)
+            entry['feedback_timestamp'] = feedback_timestamp
+            entry['accurate'] = bool(accurate)
+
+        return entry
+
+    def get_stats(self) -> Dict:
+        """Get store statistics"""
+
+        return {
+            'capacity': self.capacity,
+            'in_memory': len(self._ring),
+            'pending_spill': len(self._pending),
+            'total_stored': self.total_stored,
+            'total_spilled': self.total_spilled,
+            'predictions_with_feedback': self.total_feedback,
+            'accurate_feedback': self.accurate_feedback,
+            'spill_enabled': self._conn is not None
+        }
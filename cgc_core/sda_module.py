@@ -4,9 +4,12 @@ Cognitive mentoring and data insight generation
 """
 
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 
+from .streaming_stats import RunningStats, EWMA, Histogram, ReservoirSample
+from .shape_cache import ShapeCache, get_shape_cache
+
 
 class SmartDataAdvisor:
     """
@@ -14,7 +17,7 @@ class SmartDataAdvisor:
     Analyzes historical data for actionable improvements
     """
     
-    def __init__(self):
+    def __init__(self, pattern_sample_size: int = 100, shape_cache: Optional[ShapeCache] = None):
         self.module_name = "SDA"
         self.version = "2.1.4"
         self.status = "active"
@@ -24,10 +27,19 @@ class SmartDataAdvisor:
         self.avg_response_time = 189  # ms
         self.error_rate = 0.03
         
-        # Knowledge base
+        # Structural facts shared with PAN
+        self.shape_cache = shape_cache or get_shape_cache()
+        
+        # Constant-memory history
+        self.size_stats = RunningStats()
+        self.size_trend = EWMA(alpha=0.1)
+        self.completeness_distribution = Histogram(bins=10)
+        self.pattern_sample = ReservoirSample(capacity=pattern_sample_size)
+        
+        # Knowledge base (patterns is a bounded reservoir of examples)
         self.knowledge_base = {
             'best_practices': [],
-            'patterns': [],
+            'patterns': self.pattern_sample.items,
             'optimizations': []
         }
         
@@ -53,15 +65,21 @@ class SmartDataAdvisor:
         
         start_time = datetime.now()
         
+        current_size = len(str(current_data))
+        
         # Analyze current operation
-        current_analysis = self._analyze_current(current_data)
+        current_analysis = self._analyze_current(current_data, current_size)
         
-        # Compare with historical patterns
+        # Compare with historical patterns (running statistics unless a history is given)
         comparative_analysis = self._compare_historical(
-            current_data, 
+            current_size,
             historical_data or []
         )
         
+        # Fold this operation into the running statistics
+        self.size_stats.add(current_size)
+        self.size_trend.add(current_size)
+        
         # Identify optimization opportunities
         optimizations = self._identify_optimizations(
             current_analysis,
@@ -82,7 +100,7 @@ class SmartDataAdvisor:
         quality_score = self._calculate_quality_score(current_analysis)
         
         # Processing time
-        processing_time = (datetime.now() - start_time).total_microseconds() / 1000
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
         self.total_advisories += 1
         
@@ -100,25 +118,29 @@ class SmartDataAdvisor:
             'confidence': 0.96
         }
     
-    def _analyze_current(self, data: Dict) -> Dict:
+    def _analyze_current(self, data: Dict, size: int) -> Dict:
         """Analyze current operation"""
         
+        # One structural lookup shared by all checks
+        facts = self.shape_cache.facts(data)
+        
         return {
-            'data_completeness': self._check_completeness(data),
-            'data_quality': self._assess_quality(data),
-            'structure': self._analyze_structure(data),
+            'data_completeness': self._check_completeness(data, facts),
+            'data_quality': self._assess_quality(data, size, facts),
+            'structure': self._analyze_structure(data, size, facts),
             'metadata_present': 'metadata' in data,
-            'size_bytes': len(str(data))
+            'size_bytes': size
         }
     
-    def _check_completeness(self, data: Dict) -> Dict:
+    def _check_completeness(self, data: Dict, facts: Optional[Dict] = None) -> Dict:
         """Check data completeness"""
         
-        if not isinstance(data, dict):
+        facts = facts or self.shape_cache.facts(data)
+        if facts is None:
             return {'complete': False, 'score': 0.5}
         
-        total_fields = len(data)
-        filled_fields = sum(1 for v in data.values() if v)
+        total_fields = facts['total_fields']
+        filled_fields = facts['filled_fields']
         
         completeness = filled_fields / total_fields if total_fields > 0 else 0
         
@@ -129,14 +151,16 @@ class SmartDataAdvisor:
             'filled_fields': filled_fields
         }
     
-    def _assess_quality(self, data: Dict) -> Dict:
+    def _assess_quality(self, data: Dict, size: int, facts: Optional[Dict] = None) -> Dict:
         """Assess data quality"""
         
+        facts = facts or self.shape_cache.facts(data)
+        
         quality_indicators = {
-            'has_metadata': 'metadata' in data,
-            'has_timestamp': any('time' in str(k).lower() or 'date' in str(k).lower() for k in data.keys()),
-            'has_identifiers': any('id' in str(k).lower() for k in data.keys()),
-            'adequate_size': len(str(data)) > 50
+            'has_metadata': facts['has_metadata'],
+            'has_timestamp': facts['has_timestamp'],
+            'has_identifiers': facts['has_identifiers'],
+            'adequate_size': size > 50
         }
         
         quality_score = sum(quality_indicators.values()) / len(quality_indicators)
@@ -147,28 +171,39 @@ class SmartDataAdvisor:
             'rating': 'excellent' if quality_score > 0.8 else 'good' if quality_score > 0.6 else 'fair'
         }
     
-    def _analyze_structure(self, data: Dict) -> Dict:
+    def _analyze_structure(self, data: Dict, size: int, facts: Optional[Dict] = None) -> Dict:
         """Analyze data structure"""
         
+        facts = facts or self.shape_cache.facts(data)
+        
         return {
             'type': type(data).__name__,
-            'nested': any(isinstance(v, dict) for v in data.values()) if isinstance(data, dict) else False,
-            'complexity': 'high' if len(str(data)) > 2000 else 'medium' if len(str(data)) > 500 else 'low'
+            'nested': facts['nested'] if facts else False,
+            'complexity': 'high' if size > 2000 else 'medium' if size > 500 else 'low'
         }
     
-    def _compare_historical(self, current: Dict, historical: List[Dict]) -> Dict:
+    def _compare_historical(self, current_size: int, historical: List[Dict]) -> Dict:
         """Compare with historical data"""
         
-        if not historical:
+        if historical:
+            # Explicit history: fold it once
+            stats = RunningStats()
+            for h in historical:
+                stats.add(len(str(h)))
+            recent_avg = None
+        else:
+            # Running statistics: O(1) regardless of history length
+            stats = self.size_stats
+            recent_avg = self.size_trend.value
+        
+        if stats.count == 0:
             return {
                 'baseline': 'insufficient_history',
                 'trend': 'unknown',
                 'comparison': 'no_data'
             }
         
-        # Calculate averages
-        avg_size = sum(len(str(h)) for h in historical) / len(historical)
-        current_size = len(str(current))
+        avg_size = stats.mean
         
         # Determine trend
         if current_size > avg_size * 1.2:
@@ -178,13 +213,19 @@ class SmartDataAdvisor:
         else:
             trend = 'stable'
         
-        return {
-            'historical_count': len(historical),
+        comparison = {
+            'historical_count': stats.count,
             'avg_size': round(avg_size, 0),
+            'size_stddev': round(stats.stddev, 1),
             'current_size': current_size,
             'trend': trend,
             'performance': 'above_average' if current_size > avg_size else 'below_average'
         }
+        
+        if recent_avg is not None:
+            comparison['recent_avg_size'] = round(recent_avg, 0)
+        
+        return comparison
     
     def _identify_optimizations(self, current: Dict, comparative: Dict) -> List[Dict]:
         """Identify optimization opportunities"""
@@ -259,8 +300,8 @@ class SmartDataAdvisor:
             practices.append('Include metadata for better traceability')
         
         # Timestamp everything
-        has_timestamp = any('time' in str(k).lower() or 'date' in str(k).lower() for k in data.keys())
-        if not has_timestamp:
+        facts = self.shape_cache.facts(data)
+        if not (facts and facts['has_timestamp']):
             practices.append('Add timestamps for temporal analysis')
         
         # Use consistent structure
@@ -293,15 +334,18 @@ class SmartDataAdvisor:
         
         # Extract patterns
         if outcome.get('success', False):
+            completeness = self._check_completeness(operation_data)['score']
+            self.completeness_distribution.add(completeness)
+            
             pattern = {
                 'data_characteristics': {
                     'size': len(str(operation_data)),
-                    'completeness': self._check_completeness(operation_data)['score']
+                    'completeness': completeness
                 },
                 'outcome': 'success',
                 'timestamp': datetime.now().isoformat()
             }
-            self.knowledge_base['patterns'].append(pattern)
+            self.pattern_sample.add(pattern)
         
         # Update knowledge base
         self.knowledge_base['best_practices'] = list(set(
@@ -323,6 +367,10 @@ class SmartDataAdvisor:
             'error_rate': self.error_rate,
             'total_advisories': self.total_advisories,
             'knowledge_base_size': len(self.knowledge_base['patterns']),
+            'shape_cache': self.shape_cache.get_stats(),
+            'patterns_observed': self.pattern_sample.seen,
+            'size_statistics': self.size_stats.to_dict(),
+            'completeness_distribution': self.completeness_distribution.to_dict(),
             'learning_active': True
         }
 
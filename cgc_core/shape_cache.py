@@ -0,0 +1,96 @@
+"""
+Shape Cache
+Structural payload signatures and cached data-quality facts shared by PAN and SDA
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import threading
+
+from .payload_facts import payload_facts
+
+
+def shape_signature(data: Any) -> Optional[Tuple]:
+    """
+    Structural signature of a payload
+
+    Top-level keys in order, an emptiness bitmap and the value types. All
+    three are built by C-level iteration, so a signature costs a fraction
+    of the per-key string introspection in payload_facts(). Payloads with
+    the same signature have the same structural quality facts.
+
+    Returns:
+        Hashable signature, or None for non-dict payloads
+    """
+
+    if not isinstance(data, dict):
+        return None
+    values = data.values()
+    return tuple(data), tuple(map(bool, values)), tuple(map(type, values))
+
+
+class ShapeCache:
+    """
+    LRU cache of structural facts keyed by shape signature
+    Most traffic uses a handful of payload schemas, so repeated shapes skip
+    the per-key introspection
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def facts(self, data: Any) -> Optional[Dict]:
+        """
+        Structural facts for a payload
+
+        Returns:
+            Facts dict (shared, do not mutate), or None for non-dict payloads
+        """
+
+        signature = shape_signature(data)
+        if signature is None:
+            return None
+
+        with self._lock:
+            cached = self._entries.get(signature)
+            if cached is not None:
+                self._entries.move_to_end(signature)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        facts = payload_facts(data)
+
+        with self._lock:
+            self._entries[signature] = facts
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return facts
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+_shape_cache_instance: Optional[ShapeCache] = None
+
+
+def get_shape_cache() -> ShapeCache:
+    """Process-wide cache shared by PAN and SDA"""
+
+    global _shape_cache_instance
+    if _shape_cache_instance is None:
+        _shape_cache_instance = ShapeCache()
+    return _shape_cache_instance
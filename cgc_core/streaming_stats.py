@@ -0,0 +1,113 @@
+"""
+Streaming Statistics
+Constant-memory running statistics for long-lived modules
+"""
+
+from typing import Any, Dict, List, Optional
+import math
+import random
+
+
+class RunningStats:
+    """Welford running mean and variance"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        """Fold one observation"""
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 2),
+            'stddev': round(self.stddev, 2),
+            'min': self.min,
+            'max': self.max
+        }
+
+
+class EWMA:
+    """Exponentially weighted moving average"""
+
+    def __init__(self, alpha: float = 0.1):
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def add(self, value: float):
+        """Fold one observation"""
+
+        if self.value is None:
+            self.value = float(value)
+        else:
+            self.value += self.alpha * (value - self.value)
+
+
+class Histogram:
+    """Fixed-bin histogram over [low, high]"""
+
+    def __init__(self, bins: int = 10, low: float = 0.0, high: float = 1.0):
+        self.bins = bins
+        self.low = low
+        self.high = high
+        self.counts = [0] * bins
+        self.total = 0
+
+    def add(self, value: float):
+        """Fold one observation (out-of-range values land in the edge bins)"""
+
+        span = self.high - self.low
+        index = int((value - self.low) / span * self.bins) if span > 0 else 0
+        self.counts[min(max(index, 0), self.bins - 1)] += 1
+        self.total += 1
+
+    def to_dict(self) -> Dict:
+        width = (self.high - self.low) / self.bins
+        return {
+            f"{self.low + i * width:.1f}-{self.low + (i + 1) * width:.1f}": count
+            for i, count in enumerate(self.counts)
+        }
+
+
+class ReservoirSample:
+    """Fixed-size uniform sample of a stream (Algorithm R)"""
+
+    def __init__(self, capacity: int = 100, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.items: List[Any] = []
+        self.seen = 0
+        self._random = random.Random(seed)
+
+    def add(self, item: Any):
+        """Offer one item to the sample"""
+
+        self.seen += 1
+        if len(self.items) < self.capacity:
+            self.items.append(item)
+        else:
+            slot = self._random.randrange(self.seen)
+            if slot < self.capacity:
+                self.items[slot] = item
+
+    def __len__(self) -> int:
+        return len(self.items)
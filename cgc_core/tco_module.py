@@ -128,7 +128,7 @@ class TraceabilityOversight:
         self.total_entries += 1
         
         # Processing time
-        processing_time = (datetime.now() - start_time).total_microseconds() / 1000
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
         
         return {
             'module': self.module_name,
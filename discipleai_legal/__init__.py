@@ -7,6 +7,7 @@ __version__ = "1.0.0"
 __subsidiary__ = "DiscipleAI Legal"
 __parent__ = "OlympusMont Systems LLC"
 
+from .contract_document import ContractDocument
 from .contract_analyzer_ai import ContractAnalyzerAI
 from .compliance_checker import ComplianceChecker
 from .risk_assessor import RiskAssessor
@@ -14,6 +15,7 @@ from .clause_extractor import ClauseExtractor
 from .legal_research_engine import LegalResearchEngine
 
 __all__ = [
+    'ContractDocument',
     'ContractAnalyzerAI',
     'ComplianceChecker',
     'RiskAssessor',
@@ -0,0 +1,420 @@
+"""
+Citation Graph
+Reporter citation extraction and a memory-mapped citation graph over the research index
+
+Nodes are authorities keyed by normalized citation ('123 F.3d 456');
+indexed opinions link to the authorities they cite. Adjacency is stored
+both ways as CSR arrays (offsets + neighbor lists) in the segment file
+layout, alongside a PageRank-style authority score per node.
+"""
+
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import os
+import re
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .index_segments import map_file, read_sections, write_sections
+
+
+MAGIC = b'DLCIT001'
+
+GRAPH_FILE = 'citations.graph'
+
+# Reporter abbreviations, spacing-insensitive; canonical form on the right
+REPORTERS = {
+    'U.S.': 'U.S.',
+    'S.Ct.': 'S. Ct.',
+    'L.Ed.': 'L. Ed.',
+    'L.Ed.2d': 'L. Ed. 2d',
+    'F.': 'F.',
+    'F.2d': 'F.2d',
+    'F.3d': 'F.3d',
+    'F.4th': 'F.4th',
+    'F.Supp.': 'F. Supp.',
+    'F.Supp.2d': 'F. Supp. 2d',
+    'F.Supp.3d': 'F. Supp. 3d',
+    "F.App'x": "F. App'x",
+    'B.R.': 'B.R.',
+    'Cal.Rptr.': 'Cal. Rptr.',
+    'Cal.Rptr.2d': 'Cal. Rptr. 2d',
+    'Cal.Rptr.3d': 'Cal. Rptr. 3d',
+    'P.2d': 'P.2d',
+    'P.3d': 'P.3d',
+    'N.E.2d': 'N.E.2d',
+    'N.E.3d': 'N.E.3d',
+    'N.W.2d': 'N.W.2d',
+    'S.W.2d': 'S.W.2d',
+    'S.W.3d': 'S.W.3d',
+    'So.2d': 'So. 2d',
+    'So.3d': 'So. 3d',
+    'A.2d': 'A.2d',
+    'A.3d': 'A.3d',
+}
+
+
+def _reporter_pattern() -> str:
+    # Optional spaces after each period; longest reporters first
+    alternatives = []
+    for reporter in sorted(REPORTERS, key=len, reverse=True):
+        alternatives.append(re.escape(reporter).replace(r'\.', r'\.\s?'))
+    return '|'.join(alternatives)
+
+
+CITATION_PATTERN = re.compile(
+    r'\b(\d{1,4})\s+(' + _reporter_pattern() + r')\s?(\d{1,5})\b'
+)
+
+
+@lru_cache(maxsize=None)
+def _canonical_reporter(reporter: str) -> str:
+    return REPORTERS[re.sub(r'\s+', '', reporter)]
+
+
+def extract_citations(text: str) -> List[str]:
+    """Normalized reporter citations in a text, deduplicated in order"""
+
+    found: Dict[str, None] = {}
+    for volume, reporter, page in CITATION_PATTERN.findall(text):
+        found.setdefault(f"{int(volume)} {_canonical_reporter(reporter)} {int(page)}", None)
+    return list(found)
+
+
+def normalize_citation(citation: Optional[str]) -> Optional[str]:
+    """First reporter citation in a citation string, normalized ('123 F.3d 456')"""
+
+    if not citation:
+        return None
+    match = CITATION_PATTERN.search(citation)
+    if match is None:
+        return None
+    volume, reporter, page = match.groups()
+    return f"{int(volume)} {_canonical_reporter(reporter)} {int(page)}"
+
+
+class CitationGraph:
+    """
+    Read-only citation graph
+
+    Queries: cited_by() / cites() neighbor lists, most_cited() by
+    in-degree (optionally within a jurisdiction) and authority() scores.
+    Authority is the PageRank percentile in [0, 1], so it can scale other
+    scores regardless of graph size.
+    """
+
+    def __init__(self, buffer, path: Optional[str] = None):
+        self.path = path
+        self._buffer = buffer
+        footer, self._columns = read_sections(memoryview(buffer), MAGIC, path or 'citation graph')
+        self.nodes: int = footer['nodes']
+        self.edges: int = footer['edges']
+        self.index_version: int = footer['index_version']
+        self.jurisdictions: List[str] = footer['jurisdictions']
+        self._arrays: Dict = {}
+
+    @classmethod
+    def open(cls, path: str) -> 'CitationGraph':
+        """Memory-map a graph file"""
+
+        return cls(map_file(path), path)
+
+    # --- Building ---
+
+    @classmethod
+    def build(cls, index, path: str, damping: float = 0.85, iterations: int = 100, tolerance: float = 1e-10) -> 'CitationGraph':
+        """
+        Build the graph from a ResearchIndex and write it to `path`
+
+        Indexed documents contribute their own citation (or id) as a node
+        and edges to each authority in their 'cites' metadata.
+        """
+
+        keys: Dict[str, int] = {}
+        sources: List[Tuple[int, set]] = []
+        documents: Dict[int, Dict] = {}
+
+        def node(key: str) -> int:
+            number = keys.get(key)
+            if number is None:
+                number = keys[key] = len(keys)
+            return number
+
+        for metadata in index.iter_documents():
+            key = normalize_citation(metadata.get('citation')) or f"id:{metadata['id']}"
+            source = node(key)
+            documents[source] = metadata
+            targets = {node(cited) for cited in metadata.get('cites') or ()} - {source}
+            sources.append((source, targets))
+
+        # Renumber nodes in sorted key order so lookups are binary searches
+        ordered = sorted(keys)
+        renumber = array('I', bytes(4 * len(keys)))
+        for number, key in enumerate(ordered):
+            renumber[keys[key]] = number
+        count = len(ordered)
+
+        # Documents sharing a citation (e.g. parallel versions) pool their edges
+        linked: Dict[int, set] = {}
+        for source, targets in sources:
+            linked.setdefault(renumber[source], set()).update(renumber[t] for t in targets)
+        adjacency: List[List[int]] = [sorted(linked.get(number, ())) for number in range(count)]
+
+        out_offsets, out_targets = cls._csr(adjacency)
+        reverse: List[List[int]] = [[] for _ in range(count)]
+        for source, targets in enumerate(adjacency):
+            for target in targets:
+                reverse[target].append(source)
+        in_offsets, in_sources = cls._csr(reverse)
+
+        jurisdictions: Dict[str, int] = {'': 0}
+        node_jurisdiction = array('I', bytes(4 * count))
+        node_year = array('i', [-1]) * count
+        id_blob = bytearray()
+        id_offsets = array('Q', [0])
+        documents = {renumber[number]: metadata for number, metadata in documents.items()}
+        for number in range(count):
+            metadata = documents.get(number)
+            if metadata is not None:
+                label = (metadata.get('jurisdiction') or '').lower()
+                node_jurisdiction[number] = jurisdictions.setdefault(label, len(jurisdictions))
+                year = metadata.get('year')
+                node_year[number] = year if isinstance(year, int) else -1
+                id_blob += str(metadata['id']).encode('utf-8')
+            id_offsets.append(len(id_blob))
+
+        key_blob = bytearray()
+        key_offsets = array('Q', [0])
+        for key in ordered:
+            key_blob += key.encode('utf-8')
+            key_offsets.append(len(key_blob))
+
+        rank = cls._pagerank(out_offsets, out_targets, damping, iterations, tolerance)
+        authority = cls._percentiles(rank)
+
+        write_sections(path, MAGIC, {
+            'key_blob': array('B', key_blob),
+            'key_offsets': key_offsets,
+            'id_blob': array('B', id_blob),
+            'id_offsets': id_offsets,
+            'out_offsets': out_offsets,
+            'out_targets': out_targets,
+            'in_offsets': in_offsets,
+            'in_sources': in_sources,
+            'jurisdiction': node_jurisdiction,
+            'year': node_year,
+            'pagerank': rank,
+            'authority': authority
+        }, {
+            'nodes': count,
+            'edges': len(out_targets),
+            'index_version': index.version,
+            'jurisdictions': sorted(jurisdictions, key=jurisdictions.get)
+        })
+        return cls.open(path)
+
+    @staticmethod
+    def _csr(adjacency: List[List[int]]) -> Tuple[array, array]:
+        offsets = array('Q', [0])
+        neighbors = array('I')
+        for row in adjacency:
+            neighbors.extend(row)
+            offsets.append(len(neighbors))
+        return offsets, neighbors
+
+    @staticmethod
+    def _pagerank(offsets: array, targets: array, damping: float, iterations: int, tolerance: float) -> array:
+        """Power iteration; dangling nodes spread their rank uniformly"""
+
+        count = len(offsets) - 1
+        if count == 0:
+            return array('d')
+
+        if NUMPY_AVAILABLE:
+            offsets_np = np.frombuffer(offsets, dtype=np.uint64).astype(np.int64)
+            degree = np.diff(offsets_np)
+            sources = np.repeat(np.arange(count), degree)
+            targets_np = np.frombuffer(targets, dtype=np.uint32)
+            dangling = degree == 0
+            rank = np.full(count, 1.0 / count)
+            for _ in range(iterations):
+                share = np.where(dangling, 0.0, rank / np.maximum(degree, 1))
+                updated = np.bincount(targets_np, weights=share[sources], minlength=count)
+                updated = (1 - damping) / count + damping * (updated + rank[dangling].sum() / count)
+                converged = np.abs(updated - rank).sum() < tolerance
+                rank = updated
+                if converged:
+                    break
+            return array('d', rank.tobytes())
+
+        degree = [offsets[i + 1] - offsets[i] for i in range(count)]
+        rank = [1.0 / count] * count
+        for _ in range(iterations):
+            updated = [0.0] * count
+            dangling_mass = 0.0
+            for source in range(count):
+                if degree[source] == 0:
+                    dangling_mass += rank[source]
+                    continue
+                share = rank[source] / degree[source]
+                for target in targets[offsets[source]:offsets[source + 1]]:
+                    updated[target] += share
+            base = (1 - damping) / count + damping * dangling_mass / count
+            updated = [base + damping * value for value in updated]
+            converged = sum(abs(a - b) for a, b in zip(updated, rank)) < tolerance
+            rank = updated
+            if converged:
+                break
+        return array('d', rank)
+
+    @staticmethod
+    def _percentiles(rank: array) -> array:
+        """Share of nodes ranked strictly lower; ties share a percentile"""
+
+        count = len(rank)
+        if count < 2:
+            return array('d', [1.0]) * count
+        if NUMPY_AVAILABLE:
+            values = np.frombuffer(rank, dtype=np.float64)
+            positions = np.searchsorted(np.sort(values), values, side='left')
+            return array('d', (positions / (count - 1)).tobytes())
+        ordered = sorted(rank)
+        return array('d', (bisect_left(ordered, value) / (count - 1) for value in rank))
+
+    # --- Queries ---
+
+    def _array(self, name: str):
+        cached = self._arrays.get(name)
+        if cached is None:
+            cached = self._arrays[name] = np.asarray(self._columns[name])
+        return cached
+
+    def _key(self, number: int) -> str:
+        offsets = self._columns['key_offsets']
+        return self._columns['key_blob'][offsets[number]:offsets[number + 1]].tobytes().decode('utf-8')
+
+    def _doc_id(self, number: int) -> Optional[str]:
+        offsets = self._columns['id_offsets']
+        value = self._columns['id_blob'][offsets[number]:offsets[number + 1]].tobytes()
+        return value.decode('utf-8') if value else None
+
+    def find(self, citation: str) -> Optional[int]:
+        """Node number of a citation (any spacing), or None"""
+
+        key = normalize_citation(citation) or citation
+        wanted = key.encode('utf-8')
+        blob = self._columns['key_blob']
+        offsets = self._columns['key_offsets']
+        low, high = 0, self.nodes
+        while low < high:
+            middle = (low + high) // 2
+            value = blob[offsets[middle]:offsets[middle + 1]].tobytes()
+            if value < wanted:
+                low = middle + 1
+            elif value > wanted:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def describe(self, number: int) -> Dict:
+        """Node summary: citation, indexed document id, counts and scores"""
+
+        in_offsets = self._columns['in_offsets']
+        out_offsets = self._columns['out_offsets']
+        year = self._columns['year'][number]
+        return {
+            'citation': self._key(number),
+            'id': self._doc_id(number),
+            'jurisdiction': self.jurisdictions[self._columns['jurisdiction'][number]] or None,
+            'year': year if year >= 0 else None,
+            'cited_by_count': in_offsets[number + 1] - in_offsets[number],
+            'cites_count': out_offsets[number + 1] - out_offsets[number],
+            'pagerank': self._columns['pagerank'][number],
+            'authority': round(self._columns['authority'][number], 4)
+        }
+
+    def _neighbors(self, citation: str, offsets_name: str, neighbors_name: str, limit: Optional[int]) -> List[Dict]:
+        number = self.find(citation)
+        if number is None:
+            return []
+        offsets = self._columns[offsets_name]
+        neighbors = self._columns[neighbors_name][offsets[number]:offsets[number + 1]]
+        authority = self._columns['authority']
+        ranked = sorted(neighbors, key=lambda n: (-authority[n], n))
+        return [self.describe(n) for n in ranked[:limit]]
+
+    def cited_by(self, citation: str, limit: Optional[int] = None) -> List[Dict]:
+        """Cases citing an authority, most authoritative first"""
+
+        return self._neighbors(citation, 'in_offsets', 'in_sources', limit)
+
+    def cites(self, citation: str, limit: Optional[int] = None) -> List[Dict]:
+        """Authorities a case cites, most authoritative first"""
+
+        return self._neighbors(citation, 'out_offsets', 'out_targets', limit)
+
+    def most_cited(self, jurisdiction: Optional[str] = None, limit: int = 10) -> List[Dict]:
+        """
+        Indexed authorities by citation count
+
+        Args:
+            jurisdiction: Only authorities of this jurisdiction (case-insensitive)
+            limit: Authorities to return
+        """
+
+        code = None
+        if jurisdiction:
+            label = jurisdiction.lower()
+            if label not in self.jurisdictions:
+                return []
+            code = self.jurisdictions.index(label)
+
+        if NUMPY_AVAILABLE:
+            counts = np.diff(self._array('in_offsets').astype(np.int64))
+            codes = self._array('jurisdiction')
+            eligible = np.flatnonzero(codes == code if code is not None else codes > 0)
+            if len(eligible) > limit:
+                # Keep everything tied with the k-th count so ties break by node order
+                kth = np.partition(counts[eligible], len(eligible) - limit)[len(eligible) - limit]
+                eligible = eligible[counts[eligible] >= kth]
+            top = sorted(eligible.tolist(), key=lambda n: (-counts[n], n))[:limit]
+        else:
+            offsets = self._columns['in_offsets']
+            codes = self._columns['jurisdiction']
+            eligible = (
+                n for n in range(self.nodes)
+                if (codes[n] == code if code is not None else codes[n] > 0)
+            )
+            top = sorted(eligible, key=lambda n: (-(offsets[n + 1] - offsets[n]), n))[:limit]
+
+        return [self.describe(n) for n in top]
+
+    def authority(self, citation: Optional[str]) -> float:
+        """PageRank percentile of an authority (0.0 if unknown)"""
+
+        number = self.find(citation) if citation else None
+        return self._columns['authority'][number] if number is not None else 0.0
+
+    def authorities(self, citations: Iterable[Optional[str]]) -> List[float]:
+        return [self.authority(citation) for citation in citations]
+
+    def get_stats(self) -> Dict:
+        """Get graph statistics"""
+
+        return {
+            'nodes': self.nodes,
+            'edges': self.edges,
+            'index_version': self.index_version,
+            'jurisdictions': [j for j in self.jurisdictions if j]
+        }
+
+
+def graph_path(index_dir: str) -> str:
+    return os.path.join(index_dir, GRAPH_FILE)
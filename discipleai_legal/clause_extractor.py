@@ -3,10 +3,15 @@ Clause Extractor
 AI-powered extraction and analysis of contract clauses
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 import json
-import re
+
+from cgc_core.entity_spans import iter_amounts, iter_dates
+
+from .contract_document import ContractDocument
+from .lexicon import KeywordLexicon
+from .party_recognizer import PartyRecognizer
 
 
 class ClauseExtractor:
@@ -91,12 +96,20 @@ class ClauseExtractor:
             }
         }
         
+        # Compiled once: one scan finds the first hit of every keyword
+        self.lexicon = KeywordLexicon(
+            keyword
+            for config in self.clause_categories.values()
+            for keyword in config['keywords']
+        )
+        self.party_recognizer = PartyRecognizer()
+        
         print(f"✅ Clause Extractor v{self.version} initialized")
         print(f"   Clause categories: {len(self.clause_categories)}")
     
     def extract_clauses(
         self,
-        contract_text: str,
+        contract_text: Union[str, ContractDocument],
         extract_full_text: bool = True,
         categorize: bool = True
     ) -> Dict:
@@ -104,7 +117,7 @@ class ClauseExtractor:
         Extract and analyze contract clauses
         
         Args:
-            contract_text: Full contract text
+            contract_text: Full contract text or a parsed ContractDocument
             extract_full_text: Whether to extract full clause text
             categorize: Whether to categorize clauses
             
@@ -112,33 +125,55 @@ class ClauseExtractor:
             Extracted clauses with analysis
         """
         
-        self.extractions_performed += 1
+        doc = ContractDocument.ensure(contract_text)
+        contract_text = doc.text
+        
+        return self.extract_from_scan(
+            doc,
+            hits=self.lexicon.first_hits(doc) if categorize else None,
+            amounts=self._extract_amounts(contract_text),
+            dates=self._extract_dates(contract_text),
+            parties=self._extract_parties(contract_text),
+            extract_full_text=extract_full_text
+        )
+    
+    def extract_from_scan(
+        self,
+        doc: ContractDocument,
+        hits: Optional[Dict[str, int]],
+        amounts: List[Dict],
+        dates: List[Dict],
+        parties: List[str],
+        extract_full_text: bool = True
+    ) -> Dict:
+        """
+        Build the extraction from an already scanned document
         
-        # Split into sections
-        sections = self._split_sections(contract_text)
+        Args:
+            doc: Parsed contract
+            hits: First offset of each lexicon keyword (None skips categorization)
+            amounts: Amount spans, as from iter_amounts
+            dates: Date spans, as from iter_dates
+            parties: Party names in order of appearance
+            extract_full_text: Whether to extract full clause text
+        """
+        
+        self.extractions_performed += 1
         
         # Identify clauses
         clauses = []
         
-        if categorize:
+        if hits is not None:
             for category, config in self.clause_categories.items():
                 found = self._find_category_clauses(
-                    contract_text,
+                    doc,
                     category,
                     config,
-                    extract_full_text
+                    extract_full_text,
+                    hits
                 )
                 clauses.extend(found)
         
-        # Extract monetary amounts
-        amounts = self._extract_amounts(contract_text)
-        
-        # Extract dates
-        dates = self._extract_dates(contract_text)
-        
-        # Extract parties
-        parties = self._extract_parties(contract_text)
-        
         # Analyze clause coverage
         coverage = self._analyze_coverage(clauses)
         
@@ -161,137 +196,78 @@ class ClauseExtractor:
     def _split_sections(self, text: str) -> List[str]:
         """Split contract into sections"""
         
-        # Split by numbered sections or headers
-        sections = []
-        
-        # Try numbered sections (1., 2., etc.)
-        numbered = re.split(r'\n\s*\d+\.', text)
-        if len(numbered) > 3:
-            return numbered
-        
-        # Try lettered sections (A., B., etc.)
-        lettered = re.split(r'\n\s*[A-Z]\.', text)
-        if len(lettered) > 3:
-            return lettered
-        
-        # Default: split by double newlines
-        paragraphs = text.split('\n\n')
-        return [p.strip() for p in paragraphs if p.strip()]
+        return ContractDocument.ensure(text).sections
     
     def _find_category_clauses(
         self,
-        text: str,
+        doc: ContractDocument,
         category: str,
         config: Dict,
-        extract_full: bool
+        extract_full: bool,
+        hits: Optional[Dict[str, int]] = None
     ) -> List[Dict]:
         """Find clauses for specific category"""
         
+        if hits is None:
+            hits = self.lexicon.first_hits(doc)
+        
         clauses = []
-        text_lower = text.lower()
         
         for keyword in config['keywords']:
-            # Find occurrences
-            pattern = re.compile(
-                f'.{{0,50}}{re.escape(keyword)}.{{0,200}}',
-                re.IGNORECASE | re.DOTALL
-            )
+            offset = hits.get(keyword.lower())
+            if offset is None:
+                continue
             
-            matches = pattern.findall(text)
-            
-            for match in matches[:1]:  # First occurrence per keyword
-                clauses.append({
-                    'category': category,
-                    'importance': config['importance'],
-                    'keyword': keyword,
-                    'snippet': match.strip(),
-                    'full_text': self._extract_full_clause(text, keyword) if extract_full else None
-                })
+            # First occurrence per keyword
+            clauses.append({
+                'category': category,
+                'importance': config['importance'],
+                'keyword': keyword,
+                'snippet': self._snippet(doc, keyword, offset),
+                'full_text': doc.paragraph_at(offset) if extract_full else None
+            })
         
         return clauses
     
-    def _extract_full_clause(self, text: str, keyword: str) -> str:
+    def _snippet(self, doc: ContractDocument, keyword: str, offset: int) -> str:
+        """Up to 50 characters before and 200 after the keyword hit"""
+        
+        # Within the first 50 characters the window starts at 0 and
+        # stretches to the last occurrence that still fits
+        if offset <= 50 and len(doc.lower) == len(doc.text):
+            needle = keyword.lower()
+            following = doc.lower.find(needle, offset + 1)
+            while following != -1 and following <= 50:
+                offset = following
+                following = doc.lower.find(needle, offset + 1)
+        
+        start = max(0, offset - 50)
+        return doc.text[start:offset + len(keyword) + 200].strip()
+    
+    def _extract_full_clause(self, doc: ContractDocument, keyword: str) -> str:
         """Extract full clause text around keyword"""
         
-        # Find the paragraph containing keyword
-        paragraphs = text.split('\n\n')
-        
-        for para in paragraphs:
-            if keyword.lower() in para.lower():
-                return para.strip()
+        # Find the paragraph containing the first occurrence of keyword
+        offset = doc.lower.find(keyword.lower())
+        if offset == -1:
+            return ""
         
-        return ""
+        return doc.paragraph_at(offset)
     
     def _extract_amounts(self, text: str) -> List[Dict]:
-        """Extract monetary amounts"""
-        
-        amounts = []
-        
-        # Pattern for dollar amounts
-        pattern = r'\$[\d,]+(?:\.\d{2})?'
-        matches = re.findall(pattern, text)
+        """Extract monetary amounts (every occurrence with its own context)"""
         
-        for match in matches:
-            # Get context
-            idx = text.find(match)
-            context = text[max(0, idx-50):min(len(text), idx+100)]
-            
-            amounts.append({
-                'amount': match,
-                'numeric': float(match.replace('$', '').replace(',', '')),
-                'context': context.strip()
-            })
-        
-        return amounts
+        return list(iter_amounts(text))
     
     def _extract_dates(self, text: str) -> List[Dict]:
-        """Extract dates"""
-        
-        dates = []
-        
-        # Multiple date patterns
-        patterns = [
-            r'\d{1,2}/\d{1,2}/\d{4}',
-            r'\d{4}-\d{2}-\d{2}',
-            r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Get context
-                idx = text.find(match)
-                context = text[max(0, idx-50):min(len(text), idx+100)]
-                
-                dates.append({
-                    'date': match,
-                    'context': context.strip()
-                })
-        
-        return dates
+        """Extract dates (every occurrence with its own context)"""
+        
+        return list(iter_dates(text))
     
     def _extract_parties(self, text: str) -> List[str]:
         """Extract party names"""
         
-        parties = []
-        
-        # Look for common party patterns
-        patterns = [
-            r'between\s+([A-Z][A-Za-z\s&,.]+?)\s+\("',
-            r'party[:\s]+([A-Z][A-Za-z\s&,.]+)',
-            r'"([A-Z][A-Za-z\s&,.]+?)"\s+\(hereinafter',
-            r'([A-Z][A-Za-z\s]+(?:Inc|LLC|Ltd|Corp|Corporation))'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            parties.extend(matches)
-        
-        # Clean and deduplicate
-        parties = [p.strip() for p in parties if len(p.strip()) > 3]
-        parties = list(set(parties))[:10]
-        
-        return parties
+        return self.party_recognizer.extract(text)
     
     def _analyze_coverage(self, clauses: List[Dict]) -> Dict:
         """Analyze clause coverage"""
@@ -336,6 +312,7 @@ class ClauseExtractor:
             'version': self.version,
             'extractions_performed': self.extractions_performed,
             'categories_available': len(self.clause_categories),
+            'party_recognizer': self.party_recognizer.get_stats(),
             'status': 'active'
         }
 
@@ -3,9 +3,81 @@ Compliance Checker
 Verifies contract compliance with regulations and standards
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Union
 from datetime import datetime
 import json
+import os
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .contract_document import ContractDocument
+from .lexicon import KeywordLexicon
+
+
+PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'compliance_packs')
+
+# Built-in packs, in registration order
+BUILTIN_PACKS = ('gdpr', 'hipaa', 'sox', 'employment_law', 'ccpa')
+
+
+def normalize_pack(pack: Dict, source: str = '<pack>') -> Dict:
+    """
+    Validate a compliance pack and resolve its requirement terms
+    
+    Requirements are strings (met when any of their words appears) or
+    objects {"requirement": ..., "terms": [...]} with explicit terms.
+    Optional "applies_to" ({"jurisdictions", "industries",
+    "contract_types"}) makes a custom pack apply automatically.
+    """
+    
+    for key in ('id', 'name', 'requirements'):
+        if key not in pack:
+            raise ValueError(f"Compliance pack {source} is missing '{key}'")
+    
+    requirements = []
+    requirement_terms = []
+    for item in pack['requirements']:
+        if isinstance(item, str):
+            name, terms = item, item.lower().split()
+        else:
+            name = item['requirement']
+            terms = [t.lower() for t in item.get('terms') or name.split()]
+        requirements.append(name)
+        requirement_terms.append(terms)
+    
+    return {
+        'id': pack['id'],
+        'name': pack['name'],
+        'region': pack.get('region', ''),
+        'requirements': requirements,
+        'requirement_terms': requirement_terms,
+        'applies_to': pack.get('applies_to')
+    }
+
+
+def load_compliance_pack(path: str) -> Dict:
+    """Load one compliance pack from a JSON file"""
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return normalize_pack(json.load(f), source=path)
+
+
+def load_compliance_packs(paths: Iterable[str]) -> List[Dict]:
+    """Load packs from JSON files and directories of JSON files"""
+    
+    packs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.json'):
+                    packs.append(load_compliance_pack(os.path.join(path, name)))
+        else:
+            packs.append(load_compliance_pack(path))
+    return packs
 
 
 class ComplianceChecker:
@@ -14,87 +86,94 @@ class ComplianceChecker:
     GDPR, HIPAA, SOX, Employment Law, etc.
     """
     
-    def __init__(self):
+    def __init__(self, pack_paths: Optional[Sequence[str]] = None):
+        """
+        Args:
+            pack_paths: Extra compliance pack files or directories (custom
+                packs; a pack reusing a built-in id replaces it)
+        """
+        
         self.version = "1.0.0"
         self.checks_performed = 0
         
-        # Compliance frameworks
-        self.frameworks = {
-            'GDPR': {
-                'name': 'General Data Protection Regulation',
-                'region': 'EU',
-                'requirements': [
-                    'data processing consent',
-                    'right to erasure',
-                    'data portability',
-                    'privacy by design',
-                    'data breach notification'
-                ]
-            },
-            'HIPAA': {
-                'name': 'Health Insurance Portability and Accountability Act',
-                'region': 'US',
-                'requirements': [
-                    'PHI protection',
-                    'minimum necessary standard',
-                    'patient rights',
-                    'security safeguards',
-                    'breach notification'
-                ]
-            },
-            'SOX': {
-                'name': 'Sarbanes-Oxley Act',
-                'region': 'US',
-                'requirements': [
-                    'financial disclosure',
-                    'internal controls',
-                    'audit independence',
-                    'criminal penalties',
-                    'whistleblower protection'
-                ]
-            },
-            'EMPLOYMENT_LAW': {
-                'name': 'US Employment Law',
-                'region': 'US',
-                'requirements': [
-                    'at-will employment disclosure',
-                    'equal employment opportunity',
-                    'wage and hour compliance',
-                    'workplace safety',
-                    'anti-discrimination'
-                ]
-            },
-            'CCPA': {
-                'name': 'California Consumer Privacy Act',
-                'region': 'California',
-                'requirements': [
-                    'disclosure of data collection',
-                    'right to opt-out',
-                    'right to deletion',
-                    'non-discrimination',
-                    'data security'
-                ]
-            }
-        }
+        # Compliance frameworks, loaded from pack files
+        self.frameworks = {}
+        builtin = [os.path.join(PACKS_DIR, f"{name}.json") for name in BUILTIN_PACKS]
+        for pack in load_compliance_packs(builtin + list(pack_paths or [])):
+            self.frameworks[pack['id']] = pack
+        
+        self._compile()
         
         print(f"✅ Compliance Checker v{self.version} initialized")
         print(f"   Frameworks loaded: {len(self.frameworks)}")
     
+    def register_pack(self, pack: Dict):
+        """Add or replace a framework pack and recompile the term index"""
+        
+        pack = normalize_pack(pack)
+        self.frameworks[pack['id']] = pack
+        self._compile()
+    
+    def _compile(self):
+        """
+        Compile every requirement into one term index
+        
+        Requirements get consecutive bits per framework; a document pass
+        yields a bitmap all frameworks read from.
+        """
+        
+        self.lexicon = KeywordLexicon(
+            term
+            for pack in self.frameworks.values()
+            for terms in pack['requirement_terms']
+            for term in terms
+        )
+        columns = {term: i for i, term in enumerate(self.lexicon.keywords)}
+        
+        self._requirement_columns = []
+        self._framework_bits = {}
+        for framework_id, pack in self.frameworks.items():
+            start = len(self._requirement_columns)
+            for terms in pack['requirement_terms']:
+                self._requirement_columns.append([columns[t] for t in terms if t in columns])
+            self._framework_bits[framework_id] = (start, len(self._requirement_columns))
+        
+        if NUMPY_AVAILABLE:
+            # Terms x requirements incidence matrix for check_many
+            self._incidence = np.zeros((len(columns), len(self._requirement_columns)), dtype=np.int32)
+            for bit, cols in enumerate(self._requirement_columns):
+                self._incidence[cols, bit] = 1
+    
+    def _requirement_bitmap(self, doc: ContractDocument) -> int:
+        """Bit per compiled requirement, set when any of its terms appears"""
+        
+        flags = self.lexicon.vector(doc)
+        bitmap = 0
+        for bit, cols in enumerate(self._requirement_columns):
+            for col in cols:
+                if flags[col]:
+                    bitmap |= 1 << bit
+                    break
+        return bitmap
+    
     def check_compliance(
         self,
-        contract_text: str,
+        contract_text: Union[str, ContractDocument],
         contract_type: str = "general",
         jurisdiction: str = "US",
-        industry: Optional[str] = None
+        industry: Optional[str] = None,
+        frameworks: Optional[Sequence[str]] = None
     ) -> Dict:
         """
         Check contract compliance
         
         Args:
-            contract_text: Full contract text
+            contract_text: Full contract text or a parsed ContractDocument
             contract_type: Type of contract
             jurisdiction: Legal jurisdiction
             industry: Industry sector
+            frameworks: Framework ids to check (default: determined from
+                contract type, jurisdiction and industry)
             
         Returns:
             Compliance assessment
@@ -102,19 +181,86 @@ class ComplianceChecker:
         
         self.checks_performed += 1
         
+        doc = ContractDocument.ensure(contract_text)
+        
         # Determine applicable frameworks
-        applicable = self._determine_frameworks(
-            contract_type, jurisdiction, industry
-        )
+        applicable = self._resolve_frameworks(frameworks, contract_type, jurisdiction, industry)
+        
+        # One document pass serves every framework
+        bitmap = self._requirement_bitmap(doc)
         
         # Check each framework
         results = {}
         for framework_id in applicable:
             results[framework_id] = self._check_framework(
-                contract_text,
-                framework_id
+                doc,
+                framework_id,
+                bitmap
             )
         
+        return self._build_result(applicable, results)
+    
+    def check_many(
+        self,
+        contracts: Sequence[Union[str, ContractDocument]],
+        contract_type: str = "general",
+        jurisdiction: str = "US",
+        industry: Optional[str] = None,
+        frameworks: Optional[Sequence[str]] = None
+    ) -> List[Dict]:
+        """
+        Check a portfolio against the same frameworks
+        
+        Term presence for all documents forms one matrix; multiplying it by
+        the term x requirement incidence matrix gives the portfolio x
+        requirement hits every framework reads from. Each result equals
+        what check_compliance returns for that document.
+        
+        Returns:
+            One compliance assessment per contract, in input order
+        """
+        
+        applicable = self._resolve_frameworks(frameworks, contract_type, jurisdiction, industry)
+        docs = [ContractDocument.ensure(c) for c in contracts]
+        
+        if not NUMPY_AVAILABLE:
+            return [
+                self.check_compliance(doc, contract_type, jurisdiction, industry, frameworks=applicable)
+                for doc in docs
+            ]
+        if not docs:
+            return []
+        
+        terms = np.array([self.lexicon.vector(doc) for doc in docs], dtype=np.int32)
+        terms = terms.reshape(len(docs), self._incidence.shape[0])
+        hits = (terms @ self._incidence) > 0
+        
+        output = []
+        for i in range(len(docs)):
+            self.checks_performed += 1
+            results = {}
+            for framework_id in applicable:
+                start, end = self._framework_bits[framework_id]
+                results[framework_id] = self._framework_result(framework_id, hits[i, start:end])
+            output.append(self._build_result(applicable, results))
+        return output
+    
+    def _resolve_frameworks(
+        self,
+        frameworks: Optional[Sequence[str]],
+        contract_type: str,
+        jurisdiction: str,
+        industry: Optional[str]
+    ) -> List[str]:
+        if frameworks is None:
+            return self._determine_frameworks(contract_type, jurisdiction, industry)
+        
+        unknown = [f for f in frameworks if f not in self.frameworks]
+        if unknown:
+            raise ValueError(f"Unknown compliance frameworks: {', '.join(unknown)}")
+        return list(frameworks)
+    
+    def _build_result(self, applicable: List[str], results: Dict) -> Dict:
         # Calculate overall score
         overall_score = self._calculate_score(results)
         
@@ -170,23 +316,53 @@ class ComplianceChecker:
         if not applicable and 'data' in contract_type.lower():
             applicable.append('GDPR')
         
-        return applicable if applicable else ['EMPLOYMENT_LAW']
+        if not applicable:
+            applicable.append('EMPLOYMENT_LAW')
+        
+        # Custom packs that declare where they apply
+        for framework_id, pack in self.frameworks.items():
+            if framework_id not in applicable and self._pack_applies(pack, contract_type, jurisdiction, industry):
+                applicable.append(framework_id)
+        
+        return applicable
     
-    def _check_framework(self, text: str, framework_id: str) -> Dict:
+    def _pack_applies(
+        self,
+        pack: Dict,
+        contract_type: str,
+        jurisdiction: str,
+        industry: Optional[str]
+    ) -> bool:
+        """Whether any of a pack's applies_to criteria matches"""
+        
+        rules = pack.get('applies_to') or {}
+        
+        if jurisdiction.upper() in [j.upper() for j in rules.get('jurisdictions', [])]:
+            return True
+        if industry and any(i.lower() in industry.lower() for i in rules.get('industries', [])):
+            return True
+        return any(t.lower() in contract_type.lower() for t in rules.get('contract_types', []))
+    
+    def _check_framework(self, doc: ContractDocument, framework_id: str, bitmap: Optional[int] = None) -> Dict:
         """Check compliance with specific framework"""
         
+        if bitmap is None:
+            bitmap = self._requirement_bitmap(doc)
+        
+        start, end = self._framework_bits[framework_id]
+        met_flags = [bool(bitmap >> bit & 1) for bit in range(start, end)]
+        
+        return self._framework_result(framework_id, met_flags)
+    
+    def _framework_result(self, framework_id: str, met_flags: Sequence[bool]) -> Dict:
         framework = self.frameworks[framework_id]
         requirements = framework['requirements']
         
-        text_lower = text.lower()
-        
         met = []
         missing = []
         
-        for req in requirements:
-            # Simple keyword matching (in production, use NLP)
-            keywords = req.lower().split()
-            if any(kw in text_lower for kw in keywords):
+        for req, is_met in zip(requirements, met_flags):
+            if is_met:
                 met.append(req)
             else:
                 missing.append(req)
@@ -221,7 +397,7 @@ class ComplianceChecker:
         
         for framework_id, result in results.items():
             if result['requirements_missing']:
-                for missing in result['requirements_missing']:
+                for missing in result['missing']:
                     violations.append({
                         'framework': result['framework'],
                         'severity': 'HIGH' if result['compliance_rate'] < 50 else 'MEDIUM',
@@ -2,11 +2,15 @@
 Contract Analyzer: Base contract analysis functionality
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import datetime
-import re
 import json
 
+from cgc_core.entity_spans import first_unique, iter_amounts, iter_dates
+
+from .contract_document import ContractDocument
+from .party_recognizer import PartyRecognizer
+
 
 class ContractAnalyzer:
     """
@@ -17,15 +21,20 @@ class ContractAnalyzer:
     def __init__(self):
         self.version = "1.0.0"
         self.analyses_count = 0
+        self.party_recognizer = PartyRecognizer(legal_entities=False)
 
         print(f"✅ Contract Analyzer v{self.version} initialized")
 
-    def analyze_contract(self, contract_text: str, metadata: Optional[Dict] = None) -> Dict:
+    def analyze_contract(
+        self,
+        contract_text: Union[str, ContractDocument],
+        metadata: Optional[Dict] = None
+    ) -> Dict:
         """
         Analyze a contract
 
         Args:
-            contract_text: Full text of contract
+            contract_text: Full text of contract or a parsed ContractDocument
             metadata: Optional metadata (filename, etc)
 
         Returns:
@@ -34,66 +43,42 @@ class ContractAnalyzer:
 
         self.analyses_count += 1
 
+        doc = ContractDocument.ensure(contract_text)
+        contract_text = doc.text
+
         result = {
             'success': True,
             'analysis_id': f"CA-{self.analyses_count:06d}",
             'metadata': metadata or {},
             'contract_length': len(contract_text),
-            'word_count': len(contract_text.split()),
+            'word_count': doc.word_count,
             'timestamp': datetime.now().isoformat()
         }
 
         result['parties'] = self._extract_parties(contract_text)
         result['dates'] = self._extract_dates(contract_text)
         result['amounts'] = self._extract_amounts(contract_text)
-        result['clauses'] = self._identify_clauses(contract_text)
-        result['risk_level'] = self._assess_risk(contract_text)
+        result['clauses'] = self._identify_clauses(doc)
+        result['risk_level'] = self._assess_risk(doc)
 
         return result
 
     def _extract_parties(self, text: str) -> List[str]:
         """Extract party names from contract"""
 
-        parties = []
-
-        patterns = [
-            r'between\s+([A-Z][A-Za-z\s&,.]+?)\s+\("',
-            r'party[:\s]+([A-Z][A-Za-z\s&,.]+)',
-            r'"([A-Z][A-Za-z\s&,.]+?)"\s+\(hereinafter',
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            parties.extend(matches)
-
-        parties = [p.strip() for p in parties if len(p.strip()) > 3]
-        return list(set(parties))[:10]
+        return self.party_recognizer.extract(text)
 
     def _extract_dates(self, text: str) -> List[str]:
         """Extract dates from contract"""
 
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{4}',
-            r'\d{4}-\d{2}-\d{2}',
-            r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}'
-        ]
-
-        dates = []
-        for pattern in date_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            dates.extend(matches)
-
-        return list(set(dates))[:10]
+        return first_unique(iter_dates(text), 'date', 10)
 
     def _extract_amounts(self, text: str) -> List[str]:
         """Extract monetary amounts"""
 
-        pattern = r'\$[\d,]+(?:\.\d{2})?'
-        amounts = re.findall(pattern, text)
-
-        return list(set(amounts))[:10]
+        return first_unique(iter_amounts(text), 'amount', 10)
 
-    def _identify_clauses(self, text: str) -> List[Dict]:
+    def _identify_clauses(self, doc: ContractDocument) -> List[Dict]:
         """Identify contract clauses"""
 
         clauses = []
@@ -109,7 +94,7 @@ class ContractAnalyzer:
             'governing_law': ['governing law', 'jurisdiction']
         }
 
-        text_lower = text.lower()
+        text_lower = doc.lower
 
         for clause_type, keywords in clause_keywords.items():
             for keyword in keywords:
@@ -123,10 +108,10 @@ class ContractAnalyzer:
 
         return clauses
 
-    def _assess_risk(self, text: str) -> str:
+    def _assess_risk(self, doc: ContractDocument) -> str:
         """Basic risk assessment"""
 
-        text_lower = text.lower()
+        text_lower = doc.lower
 
         high_risk_terms = [
             'unlimited liability',
@@ -159,6 +144,7 @@ class ContractAnalyzer:
         return {
             'version': self.version,
             'analyses_count': self.analyses_count,
+            'party_recognizer': self.party_recognizer.get_stats(),
             'status': 'active'
         }
 
@@ -5,12 +5,14 @@ DiscipleAI Legal™ - OlympusMont Systems LLC
 """
 
 import json
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from datetime import datetime
 
 # Import both analyzers
 from .contract_analyzer import ContractAnalyzer as RuleBasedAnalyzer
-from .contract_analyzer_ai import AIContractAnalyzer
+from .contract_analyzer_ai import ContractAnalyzerAI, tenant_key
+from .contract_document import ContractDocument
+from .single_flight import SingleFlight
 
 
 class HybridContractAnalyzer:
@@ -23,37 +25,42 @@ class HybridContractAnalyzer:
     3. Merge results
     """
     
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(self, openai_api_key: Optional[str] = None, single_flight: Optional[SingleFlight] = None):
         """
         Initialize hybrid analyzer
         
         Args:
             openai_api_key: Optional OpenAI key. If None, falls back to rule-based only
+            single_flight: Coalescing table for concurrent identical requests
         """
         # Always have rule-based
         self.rule_analyzer = RuleBasedAnalyzer()
         
         # Try to init AI analyzer
         try:
-            self.ai_analyzer = AIContractAnalyzer(api_key=openai_api_key)
-            self.ai_available = True
-            print("✅ Hybrid Analyzer: AI + Rules enabled")
+            self.ai_analyzer = ContractAnalyzerAI(api_key=openai_api_key)
+            self.ai_available = self.ai_analyzer.ai_enabled
+            print("✅ Hybrid Analyzer: AI + Rules enabled" if self.ai_available else "⚠️ Hybrid Analyzer: Rules only (no OpenAI key)")
         except Exception as e:
             self.ai_analyzer = None
             self.ai_available = False
             print(f"⚠️ Hybrid Analyzer: Rules only (AI unavailable: {e})")
         
         self.analyses_performed = 0
+        self.single_flight = single_flight or SingleFlight()
     
     def analyze(
         self, 
-        contract_text: str, 
+        contract_text: Union[str, ContractDocument], 
         metadata: Optional[Dict] = None,
         use_ai: bool = True
     ) -> Dict:
         """
         Perform hybrid analysis
         
+        Concurrent identical requests from one tenant are coalesced: the
+        first runs the analysis, the others receive a copy of its result.
+        
         Args:
             contract_text: Contract to analyze
             metadata: Optional metadata
@@ -66,13 +73,24 @@ class HybridContractAnalyzer:
         if metadata is None:
             metadata = {}
         
+        doc = ContractDocument.ensure(contract_text)
+        key = (tenant_key(metadata), doc.content_hash, use_ai, bool(metadata.get('force_ai')))
+        result, shared = self.single_flight.do(key, self._analyze, doc, metadata, use_ai)
+        if shared:
+            result = dict(result, timestamp=datetime.now().isoformat(), coalesced=True)
+        return result
+    
+    def _analyze(self, doc: ContractDocument, metadata: Dict, use_ai: bool) -> Dict:
+        """Rule-based pass, optional AI pass and merge"""
+        
+        contract_text = doc.text
         start_time = datetime.now()
         
         # PHASE 1: Rule-based analysis (always)
         print("📊 Running rule-based analysis...")
         rule_result = self.rule_analyzer.analyze_contract(
-            contract_text=contract_text,
-            contract_metadata=metadata
+            contract_text=doc,
+            metadata=metadata
         )
         
         # Extract rule-based insights
@@ -97,9 +115,13 @@ class HybridContractAnalyzer:
                 print("🤖 Running AI analysis...")
                 try:
                     ai_result = self.ai_analyzer.analyze_contract(
-                        contract_text=contract_text,
+                        contract_text=doc,
                         metadata=metadata
                     )
+                    if ai_result.get('degraded'):
+                        # Model unavailable: the AI analyzer fell back to rules we already ran
+                        print(f"⚠️ AI analysis unavailable: {ai_result.get('fallback_reason')}")
+                        ai_result = None
                 except Exception as e:
                     print(f"⚠️ AI analysis failed: {e}")
                     ai_result = None
@@ -151,12 +173,17 @@ class HybridContractAnalyzer:
             'total_clauses': rule_analysis.get('total_clauses_found', 0)
         }
         
+        # Structured AI fields, when the model returned them (otherwise free text)
+        ai_details = ai_result.get('ai_analysis') if ai_result else None
+        if not isinstance(ai_details, dict):
+            ai_details = {}
+        
         # If AI available, prefer AI insights
         if ai_result:
             merged['analysis_method'] = 'ai_enhanced'
             
             # AI compliance (more detailed)
-            ai_compliance = ai_result.get('ai_analysis', {}).get('compliance', {})
+            ai_compliance = ai_details.get('compliance', {})
             if ai_compliance:
                 merged['compliance'] = ai_compliance
             else:
@@ -175,14 +202,14 @@ class HybridContractAnalyzer:
             }
             
             # AI extracted clauses
-            ai_clauses = ai_result.get('ai_analysis', {}).get('clauses', {})
+            ai_clauses = ai_details.get('clauses', {})
             if ai_clauses:
                 merged['clauses'] = ai_clauses
             else:
                 merged['clauses'] = rule_result.get('clauses', {})
             
             # AI recommendations
-            ai_recs = ai_result.get('ai_analysis', {}).get('recommendations', [])
+            ai_recs = ai_details.get('recommendations', [])
             if ai_recs:
                 merged['recommendations'] = ai_recs
             else:
@@ -211,7 +238,9 @@ class HybridContractAnalyzer:
         
         # Executive summary (prefer AI if available)
         if ai_result:
-            merged['executive_summary'] = ai_result.get('ai_analysis', {}).get('summary', 
+            ai_text = ai_result.get('ai_analysis')
+            merged['executive_summary'] = ai_details.get('summary') or (
+                ai_text if isinstance(ai_text, str) and ai_text else
                 rule_analysis.get('executive_summary', 'Analysis complete'))
         else:
             merged['executive_summary'] = rule_analysis.get('executive_summary', 'Analysis complete')
@@ -234,7 +263,8 @@ class HybridContractAnalyzer:
             },
             'metrics': {
                 'analyses_performed': self.analyses_performed,
-                'ai_available': self.ai_available
+                'ai_available': self.ai_available,
+                'single_flight': self.single_flight.get_stats()
             }
         }
 
@@ -271,4 +301,3 @@ if __name__ == '__main__':
     print(json.dumps(result, indent=2, default=str))
     print("\n" + "="*60)
     print(json.dumps(analyzer.get_status(), indent=2))
-```
@@ -0,0 +1,254 @@
+"""
+Contract Chunker
+Section-aware chunking and map-reduce analysis for long contracts
+
+Long contracts are cut at ContractDocument section boundaries into
+chunks of at most `max_chars` characters (oversized sections fall back
+to paragraph, sentence and whitespace boundaries). Chunks are analyzed
+concurrently on a bounded worker pool and the partial analyses are
+reduced into one result: the riskiest level wins, compliance scores are
+averaged by chunk length and findings are merged in document order.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Union
+import json
+import re
+
+from .contract_document import SENTENCE_BOUNDARY, ContractDocument
+from .llm_gateway import LLM_ERRORS
+
+
+RISK_ORDER = ('LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+
+RISK_PATTERN = re.compile(r'risk(?:\s+(?:level|assessment|rating))?\W{0,10}(critical|high|medium|low)\b', re.IGNORECASE)
+COMPLIANCE_PATTERN = re.compile(r'compliance(?:\s+score)?\W{0,10}(\d{1,3}(?:\.\d+)?)\s*(?:%|/\s*100)?', re.IGNORECASE)
+
+
+class ContractChunk:
+    """Contiguous slice of a contract covering whole sections where possible"""
+
+    __slots__ = ('index', 'start', 'end', 'text', 'first_section', 'last_section')
+
+    def __init__(self, index: int, start: int, end: int, text: str, first_section: int, last_section: int):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.text = text
+        self.first_section = first_section
+        self.last_section = last_section
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def describe(self) -> Dict:
+        return {
+            'index': self.index,
+            'start': self.start,
+            'end': self.end,
+            'sections': [self.first_section + 1, self.last_section + 1]
+        }
+
+
+def chunk_contract(document: Union[str, ContractDocument], max_chars: int = 15000) -> List[ContractChunk]:
+    """
+    Split a contract into chunks of at most max_chars characters
+
+    Chunks cover the whole text without overlap and break between
+    sections whenever a section fits; a contract that fits is one chunk.
+    """
+
+    doc = ContractDocument.ensure(document)
+    text = doc.text
+    if len(text) <= max_chars:
+        return [ContractChunk(0, 0, len(text), text, 0, max(len(doc.section_spans) - 1, 0))]
+
+    # Cut points between sections (section ends; headings start the next piece)
+    spans = doc.section_spans
+    bounds = [0] + [end for _, end in spans[:-1]] + [len(text)]
+    pieces = []
+    for section, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        for piece_start, piece_end in _split_span(text, start, end, max_chars):
+            pieces.append((piece_start, piece_end, section))
+
+    chunks = []
+    start, first = pieces[0][0], pieces[0][2]
+    end, last = start, first
+    for piece_start, piece_end, section in pieces:
+        if piece_end - start > max_chars and end > start:
+            chunks.append(ContractChunk(len(chunks), start, end, text[start:end], first, last))
+            start, first = piece_start, section
+        end, last = piece_end, section
+    chunks.append(ContractChunk(len(chunks), start, end, text[start:end], first, last))
+    return chunks
+
+
+def _split_span(text: str, start: int, end: int, max_chars: int) -> List[tuple]:
+    """Pieces of at most max_chars, cut at the latest paragraph, sentence or space break"""
+
+    pieces = []
+    while end - start > max_chars:
+        limit = start + max_chars
+        floor = start + max_chars // 4
+        cut = text.rfind('\n\n', floor, limit)
+        if cut != -1:
+            cut += 2
+        else:
+            cut = max(
+                (m.end() for m in SENTENCE_BOUNDARY.finditer(text, floor, limit)),
+                default=-1
+            )
+        if cut == -1:
+            cut = text.rfind(' ', floor, limit)
+            cut = cut + 1 if cut != -1 else limit
+        pieces.append((start, cut))
+        start = cut
+    if end > start:
+        pieces.append((start, end))
+    return pieces
+
+
+def map_chunks(
+    chunks: Sequence[ContractChunk],
+    fn: Callable[[ContractChunk], object],
+    max_workers: int = 8,
+    errors: tuple = LLM_ERRORS
+) -> List[object]:
+    """
+    Apply fn to every chunk on a bounded thread pool
+
+    Returns results in chunk order; a chunk whose call raised one of
+    `errors` (the model did not answer) holds the exception instead, so
+    one failed chunk does not discard the others. Any other exception
+    propagates.
+    """
+
+    def call(chunk):
+        try:
+            return fn(chunk)
+        except errors as e:
+            return e
+
+    if len(chunks) == 1 or max_workers <= 1:
+        return [call(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks)), thread_name_prefix='chunk') as pool:
+        return list(pool.map(call, chunks))
+
+
+def parse_risk_level(text: str) -> Optional[str]:
+    """Highest risk level stated in a free-text analysis, or None"""
+
+    levels = [match.group(1).upper() for match in RISK_PATTERN.finditer(text or '')]
+    return max(levels, key=RISK_ORDER.index) if levels else None
+
+
+def parse_compliance_score(text: str) -> Optional[float]:
+    """First 0-100 compliance score stated in a free-text analysis, or None"""
+
+    for match in COMPLIANCE_PATTERN.finditer(text or ''):
+        score = float(match.group(1))
+        if 0 <= score <= 100:
+            return score
+    return None
+
+
+def _successful(parts: Sequence[object], chunks: Sequence[ContractChunk]):
+    done = [(part, chunk) for part, chunk in zip(parts, chunks) if not isinstance(part, Exception)]
+    if not done:
+        errors = [part for part in parts if isinstance(part, Exception)]
+        raise errors[0] if errors else ValueError("no chunks to reduce")
+    return done
+
+
+def _weighted_score(scored: List[tuple]) -> Optional[float]:
+    """Length-weighted mean of (score, chunk) pairs"""
+
+    weight = sum(len(chunk) for _, chunk in scored)
+    if not weight:
+        return None
+    return round(sum(score * len(chunk) for score, chunk in scored) / weight, 1)
+
+
+def reduce_analyses(parts: Sequence[object], chunks: Sequence[ContractChunk]) -> Dict:
+    """
+    Combine free-text chunk analyses
+
+    Returns:
+        dict with the combined analysis text, overall_risk, compliance_score
+        (None when no chunk stated one), per-chunk details and failed chunk
+        indexes
+    """
+
+    done = _successful(parts, chunks)
+    total = len(chunks)
+
+    sections = []
+    details = []
+    risks = []
+    scores = []
+    for text, chunk in done:
+        risk = parse_risk_level(text)
+        score = parse_compliance_score(text)
+        if risk:
+            risks.append(risk)
+        if score is not None:
+            scores.append((score, chunk))
+        first, last = chunk.first_section + 1, chunk.last_section + 1
+        label = f"section {first}" if first == last else f"sections {first}-{last}"
+        sections.append(f"## Part {chunk.index + 1} of {total} ({label})\n\n{text.strip()}")
+        details.append(dict(chunk.describe(), risk=risk, compliance_score=score))
+
+    return {
+        'ai_analysis': '\n\n'.join(sections),
+        'overall_risk': max(risks, key=RISK_ORDER.index) if risks else None,
+        'compliance_score': _weighted_score(scores),
+        'chunks': details,
+        'failed_chunks': [c.index for part, c in zip(parts, chunks) if isinstance(part, Exception)]
+    }
+
+
+def reduce_json_analyses(parts: Sequence[object], chunks: Sequence[ContractChunk]) -> Dict:
+    """
+    Combine JSON chunk analyses (summary, risk_level, compliance_score,
+    key_findings, recommendation) into one of the same shape
+
+    The result is marked degraded when any chunk failed: its risk, score
+    and findings then cover only part of the contract.
+    """
+
+    done = _successful(parts, chunks)
+    failed = [c.index for part, c in zip(parts, chunks) if isinstance(part, Exception)]
+
+    summaries = []
+    findings = {}
+    scored = []
+    riskiest = None
+    riskiest_rank = -1
+    for part, chunk in done:
+        if not isinstance(part, dict):
+            continue
+        if part.get('summary'):
+            summaries.append(str(part['summary']).strip())
+        for finding in part.get('key_findings') or []:
+            # Findings may be dicts; dedupe on a canonical form, keep the value
+            findings.setdefault(json.dumps(finding, sort_keys=True, default=str), finding)
+        try:
+            scored.append((float(part.get('compliance_score')), chunk))
+        except (TypeError, ValueError):
+            pass
+        level = str(part.get('risk_level', '')).upper()
+        rank = RISK_ORDER.index(level) if level in RISK_ORDER else -1
+        if rank > riskiest_rank:
+            riskiest, riskiest_rank = part, rank
+
+    riskiest = riskiest or done[0][0]
+    return {
+        'summary': ' '.join(summaries),
+        'risk_level': riskiest.get('risk_level', 'medium') if isinstance(riskiest, dict) else 'medium',
+        'compliance_score': _weighted_score(scored) or 0,
+        'key_findings': list(findings.values()),
+        'recommendation': riskiest.get('recommendation', '') if isinstance(riskiest, dict) else '',
+        'chunks': len(chunks),
+        'failed_chunks': failed,
+        'degraded': bool(failed)
+    }
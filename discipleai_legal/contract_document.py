@@ -0,0 +1,210 @@
+"""
+Contract Document
+Parse-once contract model shared by all DiscipleAI Legal analyzers
+"""
+
+from bisect import bisect_right
+from functools import cached_property
+from typing import Dict, List, Tuple, Union
+import hashlib
+import re
+
+
+Span = Tuple[int, int]
+
+NUMBERED_SECTION = re.compile(r'\n\s*\d+\.')
+LETTERED_SECTION = re.compile(r'\n\s*[A-Z]\.')
+TOKEN = re.compile(r'\w+')
+SENTENCE_BOUNDARY = re.compile(r'[.!?]+(?=\s)|\n\s*\n')
+
+
+class ContractDocument:
+    """
+    Contract text parsed once per request
+    Holds the normalized text, its lowercased view, section and paragraph
+    offsets, a line map and a token index. Every analyzer accepts a
+    ContractDocument wherever it accepts contract text.
+
+    Line endings are normalized: CRLF and lone CR become LF. For input
+    with CR line endings, every offset, span, length and content hash the
+    analyzers report refers to the normalized text, not the caller's
+    string. Analyzing the raw string before ContractDocument existed gave
+    CR-based offsets and could split paragraphs and sections differently.
+    """
+
+    def __init__(self, text: str):
+        # Normalize line endings so paragraph/section splitting is stable.
+        # This changes offsets for CRLF / CR input (see the class docstring).
+        self.text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+    @classmethod
+    def ensure(cls, document: Union[str, 'ContractDocument']) -> 'ContractDocument':
+        """Wrap raw text; pass documents through unchanged"""
+
+        if isinstance(document, ContractDocument):
+            return document
+        return cls(document or '')
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    @cached_property
+    def lower(self) -> str:
+        """Lowercased view of the text"""
+        return self.text.lower()
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    @cached_property
+    def content_hash(self) -> str:
+        """SHA-256 of the normalized text"""
+        return hashlib.sha256(self.text.encode('utf-8')).hexdigest()
+
+    def contains(self, term: str) -> bool:
+        """Case-insensitive substring test (term must be lowercase)"""
+        return term in self.lower
+
+    # --- Paragraphs ---
+
+    @cached_property
+    def paragraph_spans(self) -> List[Span]:
+        """Spans of text.split('\\n\\n') pieces, in order"""
+
+        spans = []
+        start = 0
+        while True:
+            end = self.text.find('\n\n', start)
+            if end == -1:
+                spans.append((start, len(self.text)))
+                return spans
+            spans.append((start, end))
+            start = end + 2
+
+    @cached_property
+    def _paragraph_starts(self) -> List[int]:
+        return [start for start, _ in self.paragraph_spans]
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        """Non-empty stripped paragraphs"""
+
+        paragraphs = (self.text[s:e].strip() for s, e in self.paragraph_spans)
+        return [p for p in paragraphs if p]
+
+    def paragraph_index(self, offset: int) -> int:
+        """Index into paragraph_spans of the paragraph containing offset"""
+        return max(bisect_right(self._paragraph_starts, offset) - 1, 0)
+
+    def paragraph_at(self, offset: int) -> str:
+        """Stripped paragraph containing offset"""
+
+        start, end = self.paragraph_spans[self.paragraph_index(offset)]
+        return self.text[start:end].strip()
+
+    # --- Sections ---
+
+    @cached_property
+    def section_spans(self) -> List[Span]:
+        """
+        Section spans: numbered (1., 2.) or lettered (A., B.) headings,
+        falling back to non-empty paragraphs
+        """
+        return self._section_layout[1]
+
+    @cached_property
+    def section_source(self) -> str:
+        """How sections were found: 'numbered', 'lettered' or 'paragraphs'"""
+        return self._section_layout[0]
+
+    @cached_property
+    def _section_layout(self) -> Tuple[str, List[Span]]:
+        for source, pattern in (('numbered', NUMBERED_SECTION), ('lettered', LETTERED_SECTION)):
+            spans = []
+            start = 0
+            for match in pattern.finditer(self.text):
+                spans.append((start, match.start()))
+                start = match.end()
+            spans.append((start, len(self.text)))
+            if len(spans) > 3:
+                return source, spans
+
+        spans = []
+        for start, end in self.paragraph_spans:
+            piece = self.text[start:end]
+            stripped = piece.strip()
+            if stripped:
+                lead = len(piece) - len(piece.lstrip())
+                spans.append((start + lead, start + lead + len(stripped)))
+        return 'paragraphs', spans
+
+    @cached_property
+    def sections(self) -> List[str]:
+        return [self.text[s:e] for s, e in self.section_spans]
+
+    # --- Lines ---
+
+    @cached_property
+    def line_starts(self) -> List[int]:
+        starts = [0]
+        find = self.text.find
+        pos = find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+        return starts
+
+    def line_number(self, offset: int) -> int:
+        """1-based line number of offset"""
+        return bisect_right(self.line_starts, offset)
+
+    def line_span(self, offset: int) -> Span:
+        """Span of the line containing offset (without the newline)"""
+
+        index = bisect_right(self.line_starts, offset) - 1
+        start = self.line_starts[index]
+        end = self.line_starts[index + 1] - 1 if index + 1 < len(self.line_starts) else len(self.text)
+        return start, end
+
+    # --- Sentences ---
+
+    @cached_property
+    def sentence_starts(self) -> List[int]:
+        """Offsets where sentences start (after terminators or blank lines)"""
+
+        starts = [0]
+        for match in SENTENCE_BOUNDARY.finditer(self.text):
+            starts.append(match.end())
+        return starts
+
+    def sentence_span(self, offset: int) -> Span:
+        """Span of the sentence containing offset, without surrounding whitespace"""
+
+        starts = self.sentence_starts
+        index = bisect_right(starts, offset) - 1
+        start = starts[index]
+        end = starts[index + 1] if index + 1 < len(starts) else len(self.text)
+
+        while start < end and self.text[start].isspace():
+            start += 1
+        while end > start and self.text[end - 1].isspace():
+            end -= 1
+        return start, end
+
+    # --- Tokens ---
+
+    @cached_property
+    def token_index(self) -> Dict[str, List[int]]:
+        """Lowercased word -> offsets of its occurrences"""
+
+        index: Dict[str, List[int]] = {}
+        for match in TOKEN.finditer(self.lower):
+            index.setdefault(match.group(), []).append(match.start())
+        return index
+
+    def token_offsets(self, word: str) -> List[int]:
+        return self.token_index.get(word.lower(), [])
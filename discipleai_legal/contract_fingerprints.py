@@ -0,0 +1,409 @@
+"""
+Contract Fingerprints
+MinHash fingerprints and an LSH index over analyzed contracts
+
+Each analyzed contract is reduced to a MinHash signature over word
+shingles plus one hash per ContractDocument section. Signatures are
+bucketed by LSH bands in memory, so the nearest prior analysis of a new
+upload is a handful of dict lookups. Fingerprints are scoped to the
+tenant whose request produced them: a lookup only sees that tenant's
+prior analyses. Fingerprints and the analyses they point to persist in a
+`contract_fingerprints` table next to `contracts` in the CGC CORE
+database.
+"""
+
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import zlib
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .contract_document import TOKEN, ContractDocument
+
+
+MASK32 = (1 << 32) - 1
+MASK64 = (1 << 64) - 1
+SHINGLE_MULTIPLIER = 1000003
+
+# Shingles hashed per numpy block; bounds the (num_perm x block) temporary
+HASH_BLOCK = 8192
+
+
+class ContractFingerprint:
+    """MinHash signature, section hashes and titles and content hash of one contract"""
+
+    __slots__ = ('content_hash', 'signature', 'section_hashes', 'section_titles')
+
+    def __init__(
+        self,
+        content_hash: str,
+        signature: array,
+        section_hashes: List[str],
+        section_titles: Optional[List[str]] = None
+    ):
+        self.content_hash = content_hash
+        self.signature = signature
+        self.section_hashes = section_hashes
+        self.section_titles = section_titles or [''] * len(section_hashes)
+
+    @property
+    def empty(self) -> bool:
+        """True when the text had no tokens to shingle"""
+        return all(value == MASK32 for value in self.signature)
+
+
+class ContractFingerprintIndex:
+    """
+    Near-duplicate lookup over previously analyzed contracts
+    Banded LSH over MinHash signatures: with 32 bands of 4 rows, pairs
+    above ~0.5 Jaccard similarity almost always share a bucket. Buckets
+    are kept per tenant.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/cgc_core.db",
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 5,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.db_path = db_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = random.Random(seed)
+        # Multiply-shift hash family: h(x) = ((a * x + b) mod 2^64) >> 32, a odd
+        self._a = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self._b = [rng.getrandbits(64) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._a_np = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.uint64)[:, None]
+
+        # (tenant, content_hash) -> slot; slot -> signature / entry
+        self._slots: Dict[tuple, int] = {}
+        self._signatures: List[array] = []
+        self._matrix = np.zeros((0, num_perm), dtype=np.uint32) if NUMPY_AVAILABLE else None
+        self._entries: List[Dict] = []
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._last_rowid = 0
+        self._stamp = None
+        self._lock = threading.RLock()
+
+        self.lookups = 0
+        self.matches = 0
+
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._init_database()
+
+    def _init_database(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(contract_fingerprints)")]
+            if columns and not {'tenant', 'section_titles'} <= set(columns):
+                # Older tables lack the tenant or section titles; the rows are
+                # only a reuse cache, so they are rebuilt from new analyses
+                conn.execute('DROP TABLE contract_fingerprints')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS contract_fingerprints (
+                    tenant TEXT NOT NULL DEFAULT '',
+                    content_hash TEXT NOT NULL,
+                    contract_id TEXT,
+                    signature BLOB NOT NULL,
+                    section_hashes TEXT NOT NULL,
+                    section_titles TEXT NOT NULL,
+                    analysis_result TEXT NOT NULL,
+                    timestamp TEXT,
+                    PRIMARY KEY (tenant, content_hash)
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    # --- Fingerprinting ---
+
+    def fingerprint(self, document: Union[str, ContractDocument]) -> ContractFingerprint:
+        """Compute the MinHash signature and section hashes of a contract"""
+
+        doc = ContractDocument.ensure(document)
+        shingles = self._shingles(doc)
+        if NUMPY_AVAILABLE:
+            signature = self._minhash_numpy(shingles)
+        else:
+            signature = self._minhash_python(shingles)
+
+        section_hashes = [section_hash(section) for section in doc.sections]
+        section_titles = [section_title(section) for section in doc.sections]
+        return ContractFingerprint(doc.content_hash, signature, section_hashes, section_titles)
+
+    def _shingles(self, doc: ContractDocument) -> List[int]:
+        """Distinct 32-bit hashes of word k-shingles"""
+
+        token_hashes = {}
+        tokens = []
+        for token in TOKEN.findall(doc.lower):
+            value = token_hashes.get(token)
+            if value is None:
+                value = token_hashes[token] = zlib.crc32(token.encode('utf-8'))
+            tokens.append(value)
+
+        k = min(self.shingle_size, len(tokens))
+        if not k:
+            return []
+
+        # Polynomial rolling combination of k consecutive token hashes
+        count = len(tokens) - k + 1
+        if NUMPY_AVAILABLE:
+            values = np.array(tokens, dtype=np.uint64)
+            shingles = np.zeros(count, dtype=np.uint64)
+            for j in range(k):
+                shingles = (shingles * np.uint64(SHINGLE_MULTIPLIER) + values[j:j + count]) & np.uint64(MASK32)
+            return np.unique(shingles)
+
+        shingles = set()
+        for i in range(count):
+            value = 0
+            for j in range(i, i + k):
+                value = (value * SHINGLE_MULTIPLIER + tokens[j]) & MASK32
+            shingles.add(value)
+        return sorted(shingles)
+
+    def _minhash_numpy(self, shingles) -> array:
+        signature = np.full(self.num_perm, MASK32, dtype=np.uint64)
+        shift = np.uint64(32)
+        # uint64 arithmetic wraps; the Python path masks identically
+        with np.errstate(over='ignore'):
+            for start in range(0, len(shingles), HASH_BLOCK):
+                block = np.asarray(shingles[start:start + HASH_BLOCK], dtype=np.uint64)[None, :]
+                hashed = (self._a_np * block + self._b_np) >> shift
+                np.minimum(signature, hashed.min(axis=1), out=signature)
+        return array('I', signature.astype(np.uint32).tobytes())
+
+    def _minhash_python(self, shingles) -> array:
+        signature = array('I')
+        for a, b in zip(self._a, self._b):
+            lowest = MASK32
+            for value in shingles:
+                hashed = ((a * value + b) & MASK64) >> 32
+                if hashed < lowest:
+                    lowest = hashed
+            signature.append(lowest)
+        return signature
+
+    def _band_keys(self, tenant: str, signature: array) -> List[tuple]:
+        rows = self.rows
+        return [(tenant, band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    # --- Index ---
+
+    def add(
+        self,
+        fingerprint: ContractFingerprint,
+        analysis: Dict,
+        contract_id: Optional[str] = None,
+        tenant: str = ''
+    ) -> None:
+        """Persist a fingerprint with the analysis it produced for a tenant"""
+
+        if fingerprint.empty:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                INSERT OR REPLACE INTO contract_fingerprints
+                (tenant, content_hash, contract_id, signature, section_hashes, section_titles,
+                 analysis_result, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                tenant,
+                fingerprint.content_hash,
+                contract_id,
+                fingerprint.signature.tobytes(),
+                json.dumps(fingerprint.section_hashes),
+                json.dumps(fingerprint.section_titles, ensure_ascii=False),
+                json.dumps(analysis, ensure_ascii=False, default=str),
+                datetime.now().isoformat()
+            ))
+            conn.commit()
+        finally:
+            conn.close()
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Load fingerprints written since the last refresh (any process)"""
+
+        try:
+            stat = os.stat(self.db_path)
+        except OSError:
+            return
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        with self._lock:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                rows = conn.execute('''
+                    SELECT rowid, tenant, content_hash, contract_id, signature, section_hashes,
+                           section_titles, analysis_result
+                    FROM contract_fingerprints WHERE rowid > ? ORDER BY rowid
+                ''', (self._last_rowid,)).fetchall()
+            finally:
+                conn.close()
+
+            for rowid, tenant, content_hash, contract_id, blob, sections, titles, analysis in rows:
+                signature = array('I')
+                signature.frombytes(blob)
+                if len(signature) != self.num_perm:
+                    continue
+                self._insert(tenant, content_hash, signature, {
+                    'content_hash': content_hash,
+                    'contract_id': contract_id,
+                    'section_hashes': json.loads(sections),
+                    'section_titles': json.loads(titles),
+                    'analysis_result': analysis
+                })
+                self._last_rowid = rowid
+            self._stamp = stamp
+
+    def _insert(self, tenant: str, content_hash: str, signature: array, entry: Dict) -> None:
+        slot = self._slots.get((tenant, content_hash))
+        if slot is not None:
+            # Replaced row: unlink the old signature from its buckets
+            for key in self._band_keys(tenant, self._signatures[slot]):
+                bucket = self._buckets.get(key)
+                if bucket and slot in bucket:
+                    bucket.remove(slot)
+        else:
+            slot = len(self._signatures)
+            self._signatures.append(signature)
+            self._entries.append(entry)
+            self._slots[tenant, content_hash] = slot
+
+        self._signatures[slot] = signature
+        if self._matrix is not None:
+            if slot >= len(self._matrix):
+                grown = np.zeros((max(2 * len(self._matrix), 64), self.num_perm), dtype=np.uint32)
+                grown[:len(self._matrix)] = self._matrix
+                self._matrix = grown
+            self._matrix[slot] = np.frombuffer(signature, dtype=np.uint32)
+        self._entries[slot] = entry
+        for key in self._band_keys(tenant, signature):
+            self._buckets.setdefault(key, []).append(slot)
+
+    def nearest(self, fingerprint: ContractFingerprint, tenant: str = '') -> Optional[Dict]:
+        """
+        Most similar prior analysis of the tenant sharing at least one LSH band
+
+        Returns:
+            dict with content_hash, contract_id, similarity (estimated
+            Jaccard), section_hashes, section_titles and analysis, or None
+        """
+
+        self.refresh()
+        self.lookups += 1
+        if fingerprint.empty:
+            return None
+
+        with self._lock:
+            slot = self._slots.get((tenant, fingerprint.content_hash))
+            if slot is not None:
+                best, similarity = slot, 1.0
+            else:
+                candidates = set()
+                for key in self._band_keys(tenant, fingerprint.signature):
+                    bucket = self._buckets.get(key)
+                    if bucket:
+                        candidates.update(bucket)
+                if not candidates:
+                    return None
+
+                best, agree = self._best_candidate(fingerprint.signature, sorted(candidates))
+                similarity = agree / self.num_perm
+
+            entry = self._entries[best]
+
+        self.matches += 1
+        return {
+            'content_hash': entry['content_hash'],
+            'contract_id': entry['contract_id'],
+            'similarity': round(similarity, 4),
+            'section_hashes': entry['section_hashes'],
+            'section_titles': entry['section_titles'],
+            'analysis': json.loads(entry['analysis_result'])
+        }
+
+    def _best_candidate(self, signature: array, candidates: List[int]):
+        """(slot, agreeing positions) of the closest candidate; latest slot wins ties"""
+
+        if self._matrix is not None:
+            query = np.frombuffer(signature, dtype=np.uint32)
+            agreement = np.count_nonzero(self._matrix[candidates] == query, axis=1)
+            # Reverse so argmax picks the latest of tied candidates
+            position = len(candidates) - 1 - int(np.argmax(agreement[::-1]))
+            return candidates[position], int(agreement[position])
+
+        best, agree = None, -1
+        for candidate in candidates:
+            count = sum(1 for x, y in zip(signature, self._signatures[candidate]) if x == y)
+            if count >= agree:
+                best, agree = candidate, count
+        return best, agree
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._slots)
+
+    def get_stats(self) -> Dict:
+        """Get index statistics"""
+        return {
+            'fingerprints': len(self),
+            'buckets': len(self._buckets),
+            'lookups': self.lookups,
+            'matches': self.matches,
+            'numpy': NUMPY_AVAILABLE
+        }
+
+
+def section_hash(section: str) -> str:
+    """Hash of a section's lowercased tokens; insensitive to whitespace and punctuation"""
+    normalized = ' '.join(TOKEN.findall(section.lower()))
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def section_title(section: str, max_chars: int = 80) -> str:
+    """First line of a section"""
+    return section.strip().split('\n', 1)[0][:max_chars]
+
+
+def changed_sections(fingerprint: ContractFingerprint, section_hashes: List[str]) -> List[int]:
+    """Indexes of the fingerprint's sections that do not occur in section_hashes"""
+    previous = set(section_hashes)
+    return [i for i, value in enumerate(fingerprint.section_hashes) if value not in previous]
+
+
+def removed_sections(fingerprint: ContractFingerprint, section_hashes: List[str]) -> List[int]:
+    """Indexes into section_hashes of prior sections the fingerprint no longer contains"""
+    current = set(fingerprint.section_hashes)
+    return [i for i, value in enumerate(section_hashes) if value not in current]
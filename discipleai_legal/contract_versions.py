@@ -0,0 +1,422 @@
+"""
+Contract Versions
+Versioned contract tracking and section-incremental re-analysis
+
+A contract under negotiation is uploaded again after every redline. Each
+upload is registered as a new version of its contract key with one
+content hash per ContractDocument section. Keyword, entity and party
+scans are cached per section, so a revision only rescans the sections it
+changed; clause extraction and risk scores are then re-aggregated for
+the whole document from the per-section results. Documents without
+numbered or lettered headings are scanned whole: their paragraph
+sections can split a match (a date wrapped across a blank line), so a
+per-section scan would differ from a full run.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from cgc_core.entity_spans import iter_amounts, iter_dates, parse_amount
+
+from .contract_document import ContractDocument
+
+
+def section_digest(section: str) -> str:
+    """Exact content hash of one section (offsets depend on the exact text)"""
+    return hashlib.blake2b(section.encode('utf-8'), digest_size=12).hexdigest()
+
+
+class ContractVersionTracker:
+    """
+    Version history per contract key
+
+    Keeps the latest version of every key in memory; with a db_path the
+    history is also persisted in a `contract_versions` table.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path
+        self._latest: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+        if db_path:
+            parent = os.path.dirname(db_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            self._init_database()
+
+    def _init_database(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS contract_versions (
+                    contract_key TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    section_hashes TEXT NOT NULL,
+                    changed_sections TEXT NOT NULL,
+                    timestamp TEXT,
+                    PRIMARY KEY (contract_key, version)
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def latest(self, contract_key: str) -> Optional[Dict]:
+        """Most recent version of a contract key, or None"""
+
+        with self._lock:
+            return self._load_latest(contract_key)
+
+    def _load_latest(self, contract_key: str) -> Optional[Dict]:
+        """latest() body (caller holds the lock)"""
+
+        cached = self._latest.get(contract_key)
+        if cached is not None or not self.db_path:
+            return cached
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute('''
+                SELECT version, content_hash, section_hashes, changed_sections, timestamp
+                FROM contract_versions WHERE contract_key = ?
+                ORDER BY version DESC LIMIT 1
+            ''', (contract_key,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return self._entry(contract_key, *row)
+
+    def register(self, contract_key: str, document: Union[str, ContractDocument]) -> Dict:
+        """
+        Record a new version of a contract (an unchanged upload keeps its version)
+
+        Returns:
+            dict with contract_key, version, content_hash, section_hashes,
+            changed_sections (indexes into this version's sections, relative
+            to the previous version), removed_sections and previous_version
+
+        Raises:
+            sqlite3.IntegrityError: another process stored the same version
+        """
+
+        doc = ContractDocument.ensure(document)
+        section_hashes = [section_digest(section) for section in doc.sections]
+
+        # Version numbering reads the latest version and inserts the next
+        with self._lock:
+            return self._register(contract_key, doc, section_hashes)
+
+    def _register(self, contract_key: str, doc: ContractDocument, section_hashes: List[str]) -> Dict:
+        previous = self._load_latest(contract_key)
+        if previous is not None and previous['content_hash'] == doc.content_hash:
+            return dict(previous, changed_sections=[], removed_sections=0, unchanged=True)
+
+        if previous is None:
+            version = 1
+            changed = list(range(len(section_hashes)))
+            removed = 0
+        else:
+            version = previous['version'] + 1
+            before = set(previous['section_hashes'])
+            changed = [i for i, value in enumerate(section_hashes) if value not in before]
+            removed = len(before - set(section_hashes))
+
+        timestamp = datetime.now().isoformat()
+        if self.db_path:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute('''
+                    INSERT INTO contract_versions
+                    (contract_key, version, content_hash, section_hashes, changed_sections, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (contract_key, version, doc.content_hash, json.dumps(section_hashes), json.dumps(changed), timestamp))
+                conn.commit()
+            finally:
+                conn.close()
+
+        entry = self._entry(contract_key, version, doc.content_hash, section_hashes, changed, timestamp)
+        self._latest[contract_key] = entry
+        return dict(
+            entry,
+            removed_sections=removed,
+            previous_version=previous['version'] if previous else None,
+            unchanged=False
+        )
+
+    def history(self, contract_key: str) -> List[Dict]:
+        """All persisted versions of a contract key, oldest first"""
+
+        if not self.db_path:
+            latest = self.latest(contract_key)
+            return [latest] if latest else []
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute('''
+                SELECT version, content_hash, section_hashes, changed_sections, timestamp
+                FROM contract_versions WHERE contract_key = ? ORDER BY version
+            ''', (contract_key,)).fetchall()
+        finally:
+            conn.close()
+        return [self._entry(contract_key, *row) for row in rows]
+
+    @staticmethod
+    def _entry(contract_key, version, content_hash, section_hashes, changed, timestamp) -> Dict:
+        return {
+            'contract_key': contract_key,
+            'version': version,
+            'content_hash': content_hash,
+            'section_hashes': json.loads(section_hashes) if isinstance(section_hashes, str) else section_hashes,
+            'changed_sections': json.loads(changed) if isinstance(changed, str) else changed,
+            'timestamp': timestamp
+        }
+
+
+class SectionScanCache:
+    """LRU cache of per-section scan results keyed by section digest"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+class IncrementalContractAnalyzer:
+    """
+    Clause extraction and risk assessment that only rescans changed sections
+
+    Per section, one pass of each analyzer's keyword lexicon, the amount
+    and date patterns and the party recognizer are cached. Document-level
+    results are rebuilt from those scans with section offsets applied, so
+    they match a full ClauseExtractor / RiskAssessor run on the same text.
+    Documents whose sections fall back to paragraphs are scanned (and
+    cached) whole.
+    """
+
+    def __init__(
+        self,
+        clause_extractor=None,
+        risk_assessor=None,
+        ai_analyzer=None,
+        tracker: Optional[ContractVersionTracker] = None,
+        cache_size: int = 4096
+    ):
+        """
+        Args:
+            clause_extractor: ClauseExtractor (created when omitted)
+            risk_assessor: RiskAssessor (created when omitted)
+            ai_analyzer: Optional ContractAnalyzerAI; revisions reach it as
+                near-duplicates, so only changed sections are sent
+            tracker: Version tracker (in-memory when omitted)
+            cache_size: Section scans kept in the LRU cache
+        """
+
+        if clause_extractor is None:
+            from .clause_extractor import ClauseExtractor
+            clause_extractor = ClauseExtractor()
+        if risk_assessor is None:
+            from .risk_assessor import RiskAssessor
+            risk_assessor = RiskAssessor()
+
+        self.version = "1.0.0"
+        self.clause_extractor = clause_extractor
+        self.risk_assessor = risk_assessor
+        self.ai_analyzer = ai_analyzer
+        self.tracker = tracker or ContractVersionTracker()
+        self.cache = SectionScanCache(cache_size)
+        self._raw_terms = risk_assessor.feature_terms()[len(risk_assessor.lexicon):]
+
+        self.analyses_performed = 0
+        self.sections_scanned = 0
+        self.sections_reused = 0
+
+    def analyze(
+        self,
+        contract_key: str,
+        contract_text: Union[str, ContractDocument],
+        contract_value: Optional[float] = None,
+        metadata: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Analyze a new version of a contract
+
+        Args:
+            contract_key: Stable identifier of the contract across revisions
+            contract_text: Full text of this version or a parsed ContractDocument
+            contract_value: Total contract value in USD
+            metadata: Optional dict passed to the AI analyzer
+
+        Returns:
+            dict with version info, clause extraction, risk assessment,
+            optional AI analysis and per-section reuse counts
+        """
+
+        self.analyses_performed += 1
+        doc = ContractDocument.ensure(contract_text)
+        revision = self.tracker.register(contract_key, doc)
+
+        if doc.section_source == 'paragraphs':
+            # Matches may span paragraph sections: one scan of the whole text
+            units = [((0, len(doc.text)), doc.content_hash)]
+        else:
+            units = zip(doc.section_spans, revision['section_hashes'])
+
+        scans = []
+        recomputed = 0
+        for (start, end), digest in units:
+            scan = self.cache.get(digest)
+            if scan is None:
+                scan = self._scan_section(doc.text[start:end])
+                self.cache.put(digest, scan)
+                recomputed += 1
+            scans.append((start, scan))
+        self.sections_scanned += recomputed
+        self.sections_reused += len(scans) - recomputed
+
+        clause_hits = self._merge_hits(scans, 'clause_hits')
+        risk_hits = self._merge_hits(scans, 'risk_hits')
+
+        clauses = self.clause_extractor.extract_from_scan(
+            doc,
+            hits=clause_hits,
+            amounts=self._entities(doc, scans, 'amounts', 'amount'),
+            dates=self._entities(doc, scans, 'dates', 'date'),
+            parties=self._parties(scans)
+        )
+
+        row = [keyword in risk_hits for keyword in self.risk_assessor.lexicon.keywords]
+        row += [any(scan['raw_terms'][i] for _, scan in scans) for i in range(len(self._raw_terms))]
+        risk = self.risk_assessor.assess_features(doc, row, contract_value, indicator_hits=risk_hits)
+
+        result = {
+            'success': True,
+            'contract_key': contract_key,
+            'version': revision['version'],
+            'previous_version': revision.get('previous_version'),
+            'content_hash': revision['content_hash'],
+            'changed_sections': revision['changed_sections'],
+            'removed_sections': revision['removed_sections'],
+            'clauses': clauses,
+            'risk': risk,
+            'incremental': {
+                'sections': len(scans),
+                'recomputed': recomputed,
+                'reused': len(scans) - recomputed,
+                'full_scan': doc.section_source == 'paragraphs'
+            },
+            'timestamp': datetime.now().isoformat()
+        }
+
+        if self.ai_analyzer is not None:
+            result['ai'] = self.ai_analyzer.analyze_contract(doc, metadata)
+
+        return result
+
+    def _scan_section(self, text: str) -> Dict:
+        """Everything the aggregate needs from one section, with section-relative offsets"""
+
+        return {
+            'clause_hits': self.clause_extractor.lexicon.first_hits(text),
+            'risk_hits': self.risk_assessor.lexicon.first_hits(text),
+            'raw_terms': [term in text for term in self._raw_terms],
+            'amounts': [(span['start'], span['end']) for span in iter_amounts(text)],
+            'dates': [(span['start'], span['end'], span['kind'], span['iso']) for span in iter_dates(text)],
+            'parties': self.clause_extractor.party_recognizer.extract(text)
+        }
+
+    @staticmethod
+    def _merge_hits(scans, key: str) -> Dict[str, int]:
+        """First document offset of each keyword across sections"""
+
+        hits: Dict[str, int] = {}
+        for start, scan in scans:
+            for keyword, offset in scan[key].items():
+                if keyword not in hits:
+                    hits[keyword] = start + offset
+        return hits
+
+    @staticmethod
+    def _entities(doc: ContractDocument, scans, key: str, field: str) -> List[Dict]:
+        """Amount / date spans in document order, with context from the full text"""
+
+        spans = []
+        text = doc.text
+        for start, scan in scans:
+            for item in scan[key]:
+                begin, end = start + item[0], start + item[1]
+                span = {field: text[begin:end], 'start': begin, 'end': end}
+                if key == 'amounts':
+                    span['numeric'] = parse_amount(span[field])
+                else:
+                    span['kind'], span['iso'] = item[2], item[3]
+                span['context'] = text[max(0, begin - 50):begin + 100].strip()
+                spans.append(span)
+        return spans
+
+    def _parties(self, scans) -> List[str]:
+        parties = {}
+        for _, scan in scans:
+            for name in scan['parties']:
+                parties.setdefault(name, None)
+        return list(parties)[:self.clause_extractor.party_recognizer.max_parties]
+
+    def get_stats(self) -> Dict:
+        """Get analyzer statistics"""
+
+        total = self.sections_scanned + self.sections_reused
+        return {
+            'version': self.version,
+            'analyses_performed': self.analyses_performed,
+            'sections_scanned': self.sections_scanned,
+            'sections_reused': self.sections_reused,
+            'reuse_rate': round(self.sections_reused / total, 3) if total else 0.0,
+            'cache': self.cache.get_stats(),
+            'status': 'active'
+        }
+
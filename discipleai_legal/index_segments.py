@@ -0,0 +1,665 @@
+"""
+Index Segments
+Immutable, memory-mapped segment files for the research index
+
+A segment file holds, in order:
+
+    documents    JSON metadata per document, back to back
+    postings     per term: uint32 document numbers, then uint32 term frequencies
+    columns      lengths, years and jurisdiction/court/type codes per document
+    vectors      per document: term numbers and frequencies (forward index)
+    dictionaries sorted term and document-id tables
+    footer       JSON section table, its length and the magic bytes
+
+Every section is a flat, 8-byte aligned array, so an opened segment is
+read through memoryview casts (or numpy.frombuffer) over the mmap without
+copying; processes sharing a segment share its pages in the OS cache.
+"""
+
+from array import array
+from itertools import groupby, repeat
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+MAGIC = b'DLSEG001'
+FOOTER = struct.Struct('<Q8s')  # footer length, magic
+
+SEGMENT_SUFFIX = '.seg'
+
+# Document fields stored as per-document label codes (filter columns)
+LABEL_FIELDS = ('jurisdiction', 'court', 'type')
+
+Buffer = Union[bytes, bytearray, memoryview, array]
+
+
+def read_sections(view: memoryview, magic: bytes, label: str) -> Tuple[Dict, Dict[str, memoryview]]:
+    """
+    Footer and zero-copy section views of a file in the segment layout
+
+    Args:
+        view: Whole file (mmap or bytes)
+        magic: Expected magic bytes
+        label: Name used in error messages
+    """
+
+    footer_length, found = FOOTER.unpack_from(view, len(view) - FOOTER.size)
+    if found != magic or bytes(view[:len(magic)]) != magic:
+        raise ValueError(f"Not a {magic[:-3].decode()} file: {label}")
+    start = len(view) - FOOTER.size - footer_length
+    footer = json.loads(bytes(view[start:start + footer_length]))
+    if footer['byteorder'] != sys.byteorder:
+        raise ValueError(f"Written on a {footer['byteorder']}-endian machine: {label}")
+
+    columns = {
+        name: view[offset:offset + count * array(typecode).itemsize].cast(typecode)
+        for name, (offset, count, typecode) in footer['sections'].items()
+    }
+    return footer, columns
+
+
+def write_sections(path: str, magic: bytes, sections: Dict[str, array], metadata: Dict):
+    """
+    Atomically write named arrays in the segment layout
+
+    For derived structures (e.g. the citation graph) that are built in
+    one go rather than streamed.
+    """
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        position = 0
+
+        def write(data):
+            nonlocal position
+            data = memoryview(data).cast('B')
+            f.write(data)
+            position += len(data)
+
+        write(magic)
+        table = {}
+        for name, data in sections.items():
+            write(b'\0' * (-position % 8))
+            table[name] = [position, len(data), data.typecode]
+            write(data)
+
+        footer = json.dumps(dict(metadata, byteorder=sys.byteorder, sections=table)).encode('utf-8')
+        write(footer)
+        write(FOOTER.pack(len(footer), magic))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def map_file(path: str) -> mmap.mmap:
+    """Read-only mapping of a whole file"""
+
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class SegmentWriter:
+    """
+    Streams one segment to a binary file
+
+    Call add_document() for every document (document numbers are assigned
+    in call order), then add_postings() once per term in sorted term order,
+    then finish().
+    """
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._sections: Dict[str, List] = {}
+        self._position = 0
+        self._write(MAGIC)
+
+        self._doc_offsets = array('Q', [0])
+        self._doc_blob_start = self._position
+        self._lengths = array('I')
+        self._years = array('i')
+        self._codes = {field: array('I') for field in LABEL_FIELDS}
+        self._vocabularies: Dict[str, Dict[str, int]] = {field: {} for field in LABEL_FIELDS}
+        self._ids: List[Tuple[str, int]] = []
+        self._total_length = 0
+
+        # Forward index, filled in place as postings arrive
+        self._vector_offsets = array('Q', [0])
+        self._vector_terms: Optional[array] = None
+        self._vector_tfs: Optional[array] = None
+        self._vector_fill: Optional[array] = None
+
+        self._postings_start: Optional[int] = None
+        self._term_blob = bytearray()
+        self._term_offsets = array('Q', [0])
+        self._term_postings = array('Q')
+        self._term_df = array('I')
+        self._last_term: Optional[str] = None
+
+    def _write(self, data: Buffer):
+        data = memoryview(data).cast('B')
+        self._f.write(data)
+        self._position += len(data)
+
+    def _align(self):
+        padding = -self._position % 8
+        if padding:
+            self._write(b'\0' * padding)
+
+    def _write_section(self, name: str, data: array):
+        self._align()
+        self._sections[name] = [self._position, len(data), data.typecode]
+        self._write(data)
+
+    @property
+    def documents(self) -> int:
+        return len(self._lengths)
+
+    def add_document(
+        self,
+        doc_id: str,
+        metadata: bytes,
+        length: int,
+        year: Optional[int],
+        labels: Dict[str, str],
+        distinct_terms: int
+    ) -> int:
+        """
+        Append one document
+
+        Args:
+            doc_id: Document id (unique within the segment)
+            metadata: JSON-encoded metadata returned by Segment.document()
+            length: Token count (BM25 document length)
+            year: Decision year, if known
+            labels: jurisdiction, court and type labels
+            distinct_terms: Terms the document will get postings for
+
+        Returns:
+            Document number within the segment
+        """
+
+        if self._postings_start is not None:
+            raise ValueError("Documents must be added before postings")
+
+        docno = len(self._lengths)
+        self._write(metadata)
+        self._doc_offsets.append(self._position - self._doc_blob_start)
+        self._lengths.append(length)
+        self._years.append(year if year is not None else -1)
+        for field in LABEL_FIELDS:
+            vocabulary = self._vocabularies[field]
+            label = labels.get(field) or ''
+            code = vocabulary.get(label)
+            if code is None:
+                code = vocabulary[label] = len(vocabulary)
+            self._codes[field].append(code)
+        self._ids.append((doc_id, docno))
+        self._total_length += length
+        self._vector_offsets.append(self._vector_offsets[-1] + distinct_terms)
+        return docno
+
+    def _start_postings(self):
+        self._sections['documents'] = [self._doc_blob_start, self._position - self._doc_blob_start, 'B']
+        self._align()
+        self._postings_start = self._position
+
+        slots = self._vector_offsets[-1]
+        self._vector_terms = array('I', bytes(4 * slots))
+        self._vector_tfs = array('I', bytes(4 * slots))
+        self._vector_fill = array('Q', self._vector_offsets[:-1])
+
+    def _fill_vectors(self, term_number: int, docnos: Buffer, tfs: Buffer):
+        """Scatter one term's postings into the per-document vectors"""
+
+        # numpy call overhead only pays off for longer posting lists
+        if NUMPY_AVAILABLE and len(docnos) >= 64:
+            docnos = np.frombuffer(docnos, dtype=np.uint32)
+            fill = np.frombuffer(self._vector_fill, dtype=np.uint64)
+            slots = fill[docnos]
+            np.frombuffer(self._vector_terms, dtype=np.uint32)[slots] = term_number
+            np.frombuffer(self._vector_tfs, dtype=np.uint32)[slots] = np.frombuffer(tfs, dtype=np.uint32)
+            fill[docnos] += 1
+        else:
+            fill = self._vector_fill
+            for docno, tf in zip(memoryview(docnos).cast('B').cast('I'), memoryview(tfs).cast('B').cast('I')):
+                slot = fill[docno]
+                self._vector_terms[slot] = term_number
+                self._vector_tfs[slot] = tf
+                fill[docno] = slot + 1
+
+    def add_postings(self, term: str, docnos: Buffer, tfs: Buffer):
+        """Append the postings of one term (uint32 arrays, ascending docnos)"""
+
+        if self._last_term is not None and term <= self._last_term:
+            raise ValueError(f"Terms must be added in sorted order: {term!r}")
+        if self._postings_start is None:
+            self._start_postings()
+
+        df = len(docnos)
+        if df == 0:
+            return
+        self._fill_vectors(len(self._term_df), docnos, tfs)
+        self._term_postings.append((self._position - self._postings_start) // 4)
+        self._term_df.append(df)
+        self._write(docnos)
+        self._write(tfs)
+
+        self._term_blob += term.encode('utf-8')
+        self._term_offsets.append(len(self._term_blob))
+        self._last_term = term
+
+    def finish(self):
+        """Write columns, dictionaries and footer"""
+
+        if self._postings_start is None:
+            self._start_postings()
+        if self._vector_fill != self._vector_offsets[1:]:
+            raise ValueError("Postings do not match the documents' distinct_terms")
+        self._sections['postings'] = [self._postings_start, (self._position - self._postings_start) // 4, 'I']
+
+        self._write_section('doc_offsets', self._doc_offsets)
+        self._write_section('lengths', self._lengths)
+        self._write_section('years', self._years)
+        for field in LABEL_FIELDS:
+            self._write_section(f'{field}_codes', self._codes[field])
+
+        self._write_section('term_blob', array('B', self._term_blob))
+        self._write_section('term_offsets', self._term_offsets)
+        self._write_section('term_postings', self._term_postings)
+        self._write_section('term_df', self._term_df)
+
+        self._write_section('vector_offsets', self._vector_offsets)
+        self._write_section('vector_terms', self._vector_terms)
+        self._write_section('vector_tfs', self._vector_tfs)
+
+        self._ids.sort()
+        id_blob = bytearray()
+        id_offsets = array('Q', [0])
+        for doc_id, _ in self._ids:
+            id_blob += doc_id.encode('utf-8')
+            id_offsets.append(len(id_blob))
+        self._write_section('id_blob', array('B', id_blob))
+        self._write_section('id_offsets', id_offsets)
+        self._write_section('id_docnos', array('I', (docno for _, docno in self._ids)))
+
+        footer = json.dumps({
+            'documents': len(self._lengths),
+            'terms': len(self._term_df),
+            'total_length': self._total_length,
+            'byteorder': sys.byteorder,
+            'sections': self._sections,
+            'vocabularies': {
+                field: sorted(vocabulary, key=vocabulary.get)
+                for field, vocabulary in self._vocabularies.items()
+            }
+        }).encode('utf-8')
+        self._write(footer)
+        self._write(FOOTER.pack(len(footer), MAGIC))
+
+
+class Segment:
+    """
+    Read-only view of one segment
+
+    Backed by an mmap (open()) or by bytes (in-memory segments not yet
+    written to disk). Tombstones live in the index manifest, not in the
+    immutable file, and are tracked in `deleted`.
+    """
+
+    def __init__(self, name: str, buffer, path: Optional[str] = None):
+        self.name = name
+        self.path = path
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        footer, self._columns = read_sections(self._view, MAGIC, path or name)
+
+        self.documents: int = footer['documents']
+        self.terms: int = footer['terms']
+        self.total_length: int = footer['total_length']
+        self.vocabularies: Dict[str, List[str]] = footer['vocabularies']
+        self._sections = footer['sections']
+        self._arrays: Dict = {}
+
+        self.deleted: Set[int] = set()
+        self.deleted_length = 0
+
+    @classmethod
+    def open(cls, path: str) -> 'Segment':
+        """Memory-map a segment file"""
+
+        return cls(os.path.basename(path), map_file(path), path)
+
+    @property
+    def live_documents(self) -> int:
+        return self.documents - len(self.deleted)
+
+    @property
+    def live_length(self) -> int:
+        return self.total_length - self.deleted_length
+
+    def delete(self, docno: int):
+        """Tombstone a document"""
+
+        if docno not in self.deleted:
+            self.deleted.add(docno)
+            self.deleted_length += self._columns['lengths'][docno]
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of a section"""
+
+        return self._columns[name]
+
+    def array(self, name: str):
+        """Zero-copy numpy view of a section"""
+
+        cached = self._arrays.get(name)
+        if cached is None:
+            offset, count, typecode = self._sections[name]
+            cached = self._arrays[name] = np.frombuffer(
+                self._buffer, dtype=np.dtype(typecode), count=count, offset=offset
+            )
+        return cached
+
+    def _search_table(self, blob: memoryview, offsets: memoryview, count: int, key: bytes) -> Optional[int]:
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            value = blob[offsets[middle]:offsets[middle + 1]].tobytes()
+            if value < key:
+                low = middle + 1
+            elif value > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _term_index(self, term: str) -> Optional[int]:
+        return self._search_table(
+            self._columns['term_blob'], self._columns['term_offsets'], self.terms, term.encode('utf-8')
+        )
+
+    def document_frequency(self, term: str) -> int:
+        index = self._term_index(term)
+        return 0 if index is None else self._columns['term_df'][index]
+
+    def postings(self, term: str) -> Optional[Tuple[memoryview, memoryview]]:
+        """(document numbers, term frequencies) of a term, as uint32 views"""
+
+        index = self._term_index(term)
+        if index is None:
+            return None
+        start = self._columns['term_postings'][index]
+        df = self._columns['term_df'][index]
+        postings = self._columns['postings']
+        return postings[start:start + df], postings[start + df:start + 2 * df]
+
+    def postings_arrays(self, term: str):
+        """postings() as numpy uint32 arrays"""
+
+        index = self._term_index(term)
+        if index is None:
+            return None
+        start = self._columns['term_postings'][index]
+        df = self._columns['term_df'][index]
+        postings = self.array('postings')
+        return postings[start:start + df], postings[start + df:start + 2 * df]
+
+    def term_vector(self, docno: int) -> Tuple[memoryview, memoryview]:
+        """(term numbers, term frequencies) of one document"""
+
+        offsets = self._columns['vector_offsets']
+        start, end = offsets[docno], offsets[docno + 1]
+        return self._columns['vector_terms'][start:end], self._columns['vector_tfs'][start:end]
+
+    def distinct_terms(self, docno: int) -> int:
+        offsets = self._columns['vector_offsets']
+        return offsets[docno + 1] - offsets[docno]
+
+    def sorted_terms(self):
+        """Term dictionary as a sorted numpy bytes array (built once)"""
+
+        cached = self._arrays.get('sorted_terms')
+        if cached is None:
+            cached = self._arrays['sorted_terms'] = np.array(
+                [term.encode('utf-8') for term in self.iter_terms()], dtype=bytes
+            )
+        return cached
+
+    def term_number(self, term: str) -> Optional[int]:
+        """Position of a term in the sorted term dictionary"""
+
+        return self._term_index(term)
+
+    def locate(self, doc_ids: List[str]) -> List[Optional[int]]:
+        """Document numbers of several ids (None where absent)"""
+
+        if not NUMPY_AVAILABLE:
+            return [self.find(doc_id) for doc_id in doc_ids]
+
+        sorted_ids = self._arrays.get('sorted_ids')
+        if sorted_ids is None:
+            blob = self._columns['id_blob']
+            offsets = self._columns['id_offsets']
+            sorted_ids = self._arrays['sorted_ids'] = np.array(
+                [blob[offsets[i]:offsets[i + 1]].tobytes() for i in range(self.documents)], dtype=bytes
+            )
+        if not len(sorted_ids):
+            return [None] * len(doc_ids)
+
+        wanted = np.array([doc_id.encode('utf-8') for doc_id in doc_ids], dtype=bytes)
+        positions = np.minimum(np.searchsorted(sorted_ids, wanted), len(sorted_ids) - 1)
+        found = sorted_ids[positions] == wanted
+        docnos = self.array('id_docnos')[positions]
+        return [int(d) if f else None for d, f in zip(docnos, found)]
+
+    def term_at(self, number: int) -> str:
+        """Term at a position of the sorted term dictionary"""
+
+        offsets = self._columns['term_offsets']
+        return self._columns['term_blob'][offsets[number]:offsets[number + 1]].tobytes().decode('utf-8')
+
+    def iter_terms(self) -> Iterator[str]:
+        """Terms in sorted order"""
+
+        blob = self._columns['term_blob']
+        offsets = self._columns['term_offsets']
+        for index in range(self.terms):
+            yield blob[offsets[index]:offsets[index + 1]].tobytes().decode('utf-8')
+
+    def find(self, doc_id: str) -> Optional[int]:
+        """Document number of an id, or None"""
+
+        index = self._search_table(
+            self._columns['id_blob'], self._columns['id_offsets'], self.documents, doc_id.encode('utf-8')
+        )
+        return None if index is None else self._columns['id_docnos'][index]
+
+    def ids_by_docno(self) -> List[str]:
+        ids = [''] * self.documents
+        blob = self._columns['id_blob']
+        offsets = self._columns['id_offsets']
+        for index, docno in enumerate(self._columns['id_docnos']):
+            ids[docno] = blob[offsets[index]:offsets[index + 1]].tobytes().decode('utf-8')
+        return ids
+
+    def raw_document(self, docno: int) -> bytes:
+        offsets = self._columns['doc_offsets']
+        return self._columns['documents'][offsets[docno]:offsets[docno + 1]].tobytes()
+
+    def document(self, docno: int) -> Dict:
+        """Metadata of one document"""
+
+        return json.loads(self.raw_document(docno))
+
+    def label(self, field: str, docno: int) -> str:
+        return self.vocabularies[field][self._columns[f'{field}_codes'][docno]]
+
+    def year(self, docno: int) -> Optional[int]:
+        year = self._columns['years'][docno]
+        return year if year >= 0 else None
+
+    def persist(self, path: str) -> 'Segment':
+        """Write an in-memory segment to disk and map it, keeping tombstones"""
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self._view)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        persisted = Segment.open(path)
+        for docno in self.deleted:
+            persisted.delete(docno)
+        return persisted
+
+    def close(self):
+        """Release the mapping (only once no search still holds its views)"""
+
+        self._arrays = {}
+        self._columns = {}
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+def write_segment_file(path: str, build) -> Segment:
+    """
+    Write a segment atomically and open it
+
+    Args:
+        path: Segment file path
+        build: Callable filling a SegmentWriter
+    """
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        writer = SegmentWriter(f)
+        build(writer)
+        writer.finish()
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return Segment.open(path)
+
+
+def merge_segments(writer: SegmentWriter, sources: List[Tuple[Segment, Set[int]]]) -> List[List[int]]:
+    """
+    Copy the live documents of several segments into one writer
+
+    Args:
+        writer: Target segment writer
+        sources: (segment, tombstones) pairs, in index order
+
+    Returns:
+        Per source, old document number -> new document number (-1 if dropped)
+    """
+
+    mappings = []
+    for segment, deleted in sources:
+        ids = segment.ids_by_docno()
+        lengths = segment.column('lengths')
+        mapping = []
+        for docno in range(segment.documents):
+            if docno in deleted:
+                mapping.append(-1)
+                continue
+            mapping.append(writer.add_document(
+                ids[docno],
+                segment.raw_document(docno),
+                lengths[docno],
+                segment.year(docno),
+                {field: segment.label(field, docno) for field in LABEL_FIELDS},
+                segment.distinct_terms(docno)
+            ))
+        mappings.append(mapping)
+
+    remap = [np.array(m, dtype=np.int64) for m in mappings] if NUMPY_AVAILABLE else mappings
+
+    streams = [zip(segment.iter_terms(), repeat(i)) for i, (segment, _) in enumerate(sources)]
+    for term, group in groupby(heapq.merge(*streams), key=lambda entry: entry[0]):
+        docnos_out = []
+        tfs_out = []
+        for _, i in group:
+            segment = sources[i][0]
+            if NUMPY_AVAILABLE:
+                docnos, tfs = segment.postings_arrays(term)
+                new = remap[i][docnos]
+                keep = new >= 0
+                docnos_out.append(new[keep].astype(np.uint32))
+                tfs_out.append(tfs[keep])
+            else:
+                docnos, tfs = segment.postings(term)
+                mapping = remap[i]
+                kept = [(mapping[d], tf) for d, tf in zip(docnos, tfs) if mapping[d] >= 0]
+                docnos_out.append(array('I', (d for d, _ in kept)))
+                tfs_out.append(array('I', (tf for _, tf in kept)))
+
+        if NUMPY_AVAILABLE:
+            docnos_all = np.concatenate(docnos_out)
+            tfs_all = np.ascontiguousarray(np.concatenate(tfs_out))
+        else:
+            docnos_all, tfs_all = array('I'), array('I')
+            for docnos, tfs in zip(docnos_out, tfs_out):
+                docnos_all.extend(docnos)
+                tfs_all.extend(tfs)
+        if len(docnos_all):
+            writer.add_postings(term, docnos_all, tfs_all)
+
+    return mappings
+
+
+class MergePolicy:
+    """
+    Tiered merge policy
+
+    Segments are grouped into size tiers (powers of `merge_factor` above
+    `min_segment_documents`); once a tier holds `merge_factor` segments
+    they are merged into one. A segment whose tombstones exceed
+    `max_deleted_ratio` is rewritten on its own.
+    """
+
+    def __init__(self, merge_factor: int = 8, min_segment_documents: int = 1000, max_deleted_ratio: float = 0.5):
+        if merge_factor < 2:
+            raise ValueError("merge_factor must be at least 2")
+        self.merge_factor = merge_factor
+        self.min_segment_documents = min_segment_documents
+        self.max_deleted_ratio = max_deleted_ratio
+
+    def _tier(self, segment: Segment) -> int:
+        size = max(segment.live_documents, 1)
+        if size <= self.min_segment_documents:
+            return 0
+        return 1 + int(math.log(size / self.min_segment_documents, self.merge_factor))
+
+    def select(self, segments: Iterable[Segment]) -> Optional[List[Segment]]:
+        """Segments to merge next, or None"""
+
+        segments = list(segments)
+        tiers: Dict[int, List[Segment]] = {}
+        for segment in segments:
+            tiers.setdefault(self._tier(segment), []).append(segment)
+
+        for tier in sorted(tiers):
+            members = tiers[tier]
+            if len(members) >= self.merge_factor:
+                smallest = sorted(members, key=lambda s: s.live_documents)[:self.merge_factor]
+                # Keep index order so merged document order stays stable
+                return [s for s in segments if any(s is m for m in smallest)]
+
+        for segment in segments:
+            if segment.documents and len(segment.deleted) / segment.documents > self.max_deleted_ratio:
+                return [segment]
+        return None
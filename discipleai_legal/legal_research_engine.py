@@ -3,9 +3,64 @@ Legal Research Engine
 AI-powered case law and statute research
 """
 
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import json
+import os
+import threading
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query"""
+
+    return ' '.join(query.lower().split())
+
+
+class QueryCache:
+    """
+    LRU cache of raw search results
+    Keyed on the normalized query, filters and index version, so
+    reindexing retires stale entries without explicit invalidation
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, List[Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[List[Dict]]:
+        """Copies of the cached results, or None"""
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return [dict(result) for result in cached]
+
+    def put(self, key: Tuple, results: List[Dict]):
+        with self._lock:
+            self._entries[key] = [dict(result) for result in results]
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
 
 
 class LegalResearchEngine:
@@ -14,10 +69,48 @@ class LegalResearchEngine:
     Case law, statutes, regulations
     """
     
-    def __init__(self):
+    def __init__(self, index_dir: Optional[str] = None, cache_size: int = 512):
+        """
+        Args:
+            index_dir: Local research index directory (default:
+                RESEARCH_INDEX_DIR env var). Without a populated index,
+                research falls back to simulated results.
+            cache_size: Query results kept in the LRU cache
+        """
+        
         self.version = "1.0.0"
         self.searches_performed = 0
         
+        # Local full-text index of opinions and statutes
+        index_dir = index_dir or os.getenv('RESEARCH_INDEX_DIR')
+        self.index_dir = index_dir
+        self.index = None
+        if index_dir:
+            from .research_index import ResearchIndex
+            self.index = ResearchIndex(index_dir)
+        
+        # Raw results per (query, filters, index version)
+        self.cache = QueryCache(cache_size)
+        
+        # Precedent search: issue queries run concurrently and are merged
+        # by reciprocal rank fusion
+        self.max_issues = 3
+        self.rrf_k = 60
+        
+        # Citation graph built next to the index; PageRank authority
+        # boosts precedent ranking by up to this factor
+        self.authority_weight = 0.5
+        self._citations = None
+        self._citations_stamp = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Results per research depth
+        self.depth_limits = {
+            'quick': 10,
+            'standard': 25,
+            'comprehensive': 100
+        }
+        
         # Research databases (in production, connect to actual APIs)
         self.databases = {
             'case_law': {
@@ -58,13 +151,18 @@ class LegalResearchEngine:
         
         print(f"✅ Legal Research Engine v{self.version} initialized")
         print(f"   Databases: {len(self.databases)}")
+        if self.index is not None:
+            print(f"   Local index: {len(self.index)} documents")
     
     def research(
         self,
         query: str,
         jurisdiction: str = "federal",
         research_type: str = "case_law",
-        depth: str = "standard"
+        depth: str = "standard",
+        court: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None
     ) -> Dict:
         """
         Perform legal research
@@ -74,6 +172,9 @@ class LegalResearchEngine:
             jurisdiction: Legal jurisdiction
             research_type: Type (case_law, statutes, regulations)
             depth: Research depth (quick, standard, comprehensive)
+            court: Court name filter (local index only)
+            year_from: Earliest year (local index only)
+            year_to: Latest year (local index only)
             
         Returns:
             Research results
@@ -81,8 +182,9 @@ class LegalResearchEngine:
         
         self.searches_performed += 1
         
-        # Simulate research (in production, call actual APIs)
-        results = self._simulate_research(query, jurisdiction, research_type)
+        results, source = self._fetch_results(
+            query, jurisdiction, research_type, depth, court, year_from, year_to
+        )
         
         # Analyze relevance
         analyzed = self._analyze_results(results, query)
@@ -108,9 +210,105 @@ class LegalResearchEngine:
             'citations': citations,
             'summary': summary,
             'databases_searched': [self.databases[research_type]],
+            'source': source,
             'timestamp': datetime.now().isoformat()
         }
     
+    def _fetch_results(
+        self,
+        query: str,
+        jurisdiction: str,
+        research_type: str,
+        depth: str = "standard",
+        court: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None
+    ) -> Tuple[List[Dict], str]:
+        """
+        Raw results for a query, through the query cache
+        
+        Returns:
+            (results, source), source being 'local_index' or 'simulated'
+        """
+        
+        indexed = self._index_ready()
+        key = (
+            normalize_query(query), (jurisdiction or '').lower(), research_type, depth,
+            court, year_from, year_to, self.index.version if indexed else None
+        )
+        source = 'local_index' if indexed else 'simulated'
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, source
+        
+        if indexed:
+            results = self._search_index(
+                query, jurisdiction, research_type, depth, court, year_from, year_to
+            )
+        else:
+            # Simulate research (in production, call actual APIs)
+            results = self._simulate_research(query, jurisdiction, research_type)
+        
+        self.cache.put(key, results)
+        return results, source
+    
+    def _index_ready(self) -> bool:
+        if self.index is None:
+            return False
+        # Pick up segments committed by the indexer since the last query
+        self.index.reopen()
+        return len(self.index) > 0
+    
+    def _citation_graph(self):
+        """Citation graph of the local index, reopened when rebuilt"""
+        
+        if not self.index_dir:
+            return None
+        from .citation_graph import CitationGraph, graph_path
+        path = graph_path(self.index_dir)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp != self._citations_stamp:
+            self._citations = CitationGraph.open(path)
+            self._citations_stamp = stamp
+        return self._citations
+    
+    def _search_index(
+        self,
+        query: str,
+        jurisdiction: str,
+        research_type: str,
+        depth: str,
+        court: Optional[str],
+        year_from: Optional[int],
+        year_to: Optional[int]
+    ) -> List[Dict]:
+        """BM25 search of the local index"""
+        
+        hits = self.index.search(
+            query,
+            limit=self.depth_limits.get(depth, self.depth_limits['standard']),
+            jurisdiction=jurisdiction,
+            court=court,
+            document_type=research_type,
+            year_from=year_from,
+            year_to=year_to
+        )
+        
+        if not hits:
+            return []
+        
+        # Relevance on the familiar 0-100 scale, relative to the best hit
+        top = hits[0]['score'] or 1.0
+        for hit in hits:
+            hit['relevance'] = round(hit['score'] / top * 100, 1)
+        
+        return hits
+    
     def find_precedents(
         self,
         case_facts: str,
@@ -132,15 +330,10 @@ class LegalResearchEngine:
         # Extract key legal issues
         issues = self._extract_legal_issues(case_facts)
         
-        # Search for each issue
-        precedents = []
-        for issue in issues[:3]:  # Top 3 issues
-            results = self.research(
-                query=issue,
-                jurisdiction=jurisdiction,
-                research_type='case_law'
-            )
-            precedents.extend(results['results'][:limit])
+        # Search the top issues concurrently, then fuse the rankings
+        searched = issues[:self.max_issues]
+        runs = self._search_issues(searched, jurisdiction)
+        precedents = self._fuse_results(searched, runs)
         
         # Rank by relevance
         ranked = self._rank_by_relevance(precedents, case_facts)
@@ -155,6 +348,54 @@ class LegalResearchEngine:
             'timestamp': datetime.now().isoformat()
         }
     
+    def _search_issues(self, issues: List[str], jurisdiction: str) -> List[List[Dict]]:
+        """Case-law results per issue, queried concurrently"""
+        
+        self.searches_performed += len(issues)
+        
+        def search(issue: str) -> List[Dict]:
+            results, _ = self._fetch_results(issue, jurisdiction, 'case_law')
+            return self._analyze_results(results, issue)
+        
+        if len(issues) <= 1:
+            return [search(issue) for issue in issues]
+        
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_issues, thread_name_prefix='precedent-search'
+            )
+        return list(self._executor.map(search, issues))
+    
+    def _citation_key(self, result: Dict) -> str:
+        reference = result.get('citation') or result.get('id') or result.get('title', '')
+        return ' '.join(str(reference).lower().split())
+    
+    def _fuse_results(self, issues: List[str], runs: List[List[Dict]]) -> List[Dict]:
+        """
+        Reciprocal rank fusion of per-issue rankings
+        
+        Each result scores sum(1 / (rrf_k + rank)) over the issues that
+        returned it; results sharing a citation are merged into one.
+        """
+        
+        fused: Dict[str, Dict] = {}
+        for issue, results in zip(issues, runs):
+            for rank, result in enumerate(results, 1):
+                key = self._citation_key(result)
+                entry = fused.get(key)
+                if entry is None:
+                    entry = fused[key] = dict(result, fusion_score=0.0, matched_issues=[])
+                elif result.get('relevance', 0) > entry.get('relevance', 0):
+                    entry['relevance'] = result['relevance']
+                entry['fusion_score'] += 1 / (self.rrf_k + rank)
+                entry['matched_issues'].append(issue)
+        
+        precedents = list(fused.values())
+        for entry in precedents:
+            entry['fusion_score'] = round(entry['fusion_score'], 6)
+        precedents.sort(key=lambda x: x['fusion_score'], reverse=True)
+        return precedents
+    
     def _simulate_research(
         self,
         query: str,
@@ -285,13 +526,86 @@ class LegalResearchEngine:
         precedents: List[Dict],
         case_facts: str
     ) -> List[Dict]:
-        """Rank precedents by relevance"""
+        """
+        Rank precedents by TF-IDF cosine similarity to the case facts,
+        boosted by citation-graph authority where the graph is available
+        """
         
-        # Sort by relevance score
-        precedents.sort(key=lambda x: x.get('relevance', 0), reverse=True)
+        if precedents:
+            scores = self._similarity_scores(precedents, case_facts)
+            graph = self._citation_graph()
+            for precedent, score in zip(precedents, scores):
+                precedent['similarity'] = round(score, 4)
+                authority = graph.authority(precedent.get('citation')) if graph is not None else 0.0
+                precedent['authority'] = round(authority, 4)
+                precedent['rank_score'] = round(score * (1 + self.authority_weight * authority), 4)
+        
+        # Fused score and per-issue relevance break ties
+        precedents.sort(
+            key=lambda x: (x.get('rank_score', 0), x.get('fusion_score', 0), x.get('relevance', 0)),
+            reverse=True
+        )
         
         return precedents
     
+    def _similarity_scores(self, precedents: List[Dict], case_facts: str) -> List[float]:
+        # Indexed precedents use their stored term vectors and corpus statistics
+        if self._index_ready() and all(p.get('id') for p in precedents):
+            return self.index.similarity(case_facts, [p['id'] for p in precedents])
+        
+        from .research_index import tfidf_cosine
+        return tfidf_cosine(
+            case_facts, [f"{p.get('title', '')} {p.get('summary', '')}" for p in precedents]
+        )
+    
+    def citing_cases(self, citation: str, limit: int = 10) -> Dict:
+        """
+        Cases in the local index citing an authority
+        
+        Args:
+            citation: Reporter citation (e.g. '123 F.3d 456')
+            limit: Max cases
+            
+        Returns:
+            Citing cases, most authoritative first
+        """
+        
+        graph = self._citation_graph()
+        if graph is None:
+            return {'success': False, 'error': 'No citation graph available'}
+        
+        node = graph.find(citation)
+        return {
+            'success': True,
+            'citation': citation,
+            'authority': graph.describe(node) if node is not None else None,
+            'citing_cases': graph.cited_by(citation, limit=limit),
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def most_cited(self, jurisdiction: Optional[str] = None, limit: int = 10) -> Dict:
+        """
+        Most-cited authorities in the local index
+        
+        Args:
+            jurisdiction: Restrict to one jurisdiction
+            limit: Max authorities
+            
+        Returns:
+            Authorities by citation count
+        """
+        
+        graph = self._citation_graph()
+        if graph is None:
+            return {'success': False, 'error': 'No citation graph available'}
+        
+        return {
+            'success': True,
+            'jurisdiction': jurisdiction,
+            'authorities': graph.most_cited(jurisdiction, limit=limit),
+            'timestamp': datetime.now().isoformat()
+        }
+    
     def search_statutes(
         self,
         topic: str,
@@ -321,6 +635,7 @@ class LegalResearchEngine:
             'searches_performed': self.searches_performed,
             'databases_available': len(self.databases),
             'topics_covered': len(self.topics),
+            'cache': self.cache.get_stats(),
             'status': 'active'
         }
 
@@ -0,0 +1,160 @@
+"""
+Keyword Lexicon
+Compiled once, single-pass keyword locator shared by the legal analyzers
+"""
+
+from typing import Dict, Iterable, List, Optional, Union
+import re
+
+from .contract_document import ContractDocument
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation factored by common prefixes (one branch per first char)"""
+
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if terminal else body
+
+    return build(trie)
+
+
+class KeywordLexicon:
+    """
+    Case-insensitive substring lexicon
+
+    All keywords are compiled into one prefix-factored, zero-width
+    alternation, so a single regex scan visits every position where some
+    keyword starts (including overlapping keywords such as 'term' /
+    'termination'). Results match `keyword in text.lower()` semantics.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        seen = set()
+        for keyword in keywords:
+            keyword = keyword.lower()
+            if keyword and keyword not in seen:
+                seen.add(keyword)
+                self.keywords.append(keyword)
+
+        # Keywords grouped by first character for the per-position check
+        self._by_first: Dict[str, List[str]] = {}
+        for keyword in sorted(self.keywords, key=len, reverse=True):
+            self._by_first.setdefault(keyword[0], []).append(keyword)
+
+        if self.keywords:
+            alternation = _trie_pattern(self.keywords)
+            # Scans the lowercased view; the IGNORECASE variant covers texts
+            # whose case folding changes offsets
+            self._pattern = re.compile(f'(?={alternation})')
+            self._pattern_ignorecase = re.compile(f'(?={alternation})', re.IGNORECASE)
+        else:
+            self._pattern = self._pattern_ignorecase = None
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _views(self, document: Union[str, ContractDocument]):
+        doc = ContractDocument.ensure(document)
+        # The lowercased view is offset-aligned unless case folding changed lengths
+        aligned = doc.lower if len(doc.lower) == len(doc.text) else None
+        return doc.text, aligned
+
+    def first_hits(
+        self,
+        document: Union[str, ContractDocument],
+        wanted: Optional[Iterable[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Offset of the first occurrence of each keyword present
+
+        Stops scanning as soon as every keyword (or every keyword in
+        `wanted`, e.g. those already known to be present) has been found.
+        """
+
+        return self._scan(document, first_only=True, wanted=set(wanted) if wanted is not None else None)
+
+    def all_hits(
+        self,
+        document: Union[str, ContractDocument],
+        limit_per_keyword: Optional[int] = None
+    ) -> Dict[str, List[int]]:
+        """Offsets of every occurrence of each keyword present"""
+
+        return self._scan(document, first_only=False, limit_per_keyword=limit_per_keyword)
+
+    def vector(self, document: Union[str, ContractDocument]) -> List[bool]:
+        """
+        Presence flag per keyword, in keyword order
+
+        Presence needs no offsets, so each keyword is a C-level substring
+        test on the lowercased view, which beats the regex scan here.
+        """
+
+        lower = ContractDocument.ensure(document).lower
+        return [keyword in lower for keyword in self.keywords]
+
+    def present(self, document: Union[str, ContractDocument]) -> set:
+        """Set of keywords occurring in the document"""
+
+        return {k for k, found in zip(self.keywords, self.vector(document)) if found}
+
+    def _scan(
+        self,
+        document,
+        first_only: bool,
+        limit_per_keyword: Optional[int] = None,
+        wanted: Optional[set] = None
+    ):
+        hits: Dict = {}
+        if self._pattern is None:
+            return hits
+
+        text, lower = self._views(document)
+        total = len(self.keywords) if wanted is None else len(wanted)
+        complete = 0
+        if total == 0:
+            return hits
+
+        pattern = self._pattern if lower is not None else self._pattern_ignorecase
+
+        for match in pattern.finditer(lower if lower is not None else text):
+            pos = match.start()
+            first = lower[pos] if lower is not None else text[pos].lower()
+
+            for keyword in self._by_first.get(first, ()):
+                if lower is not None:
+                    found = lower.startswith(keyword, pos)
+                else:
+                    found = text[pos:pos + len(keyword)].lower() == keyword
+                if not found:
+                    continue
+
+                if first_only:
+                    if keyword not in hits:
+                        hits[keyword] = pos
+                        if wanted is None or keyword in wanted:
+                            complete += 1
+                else:
+                    offsets = hits.setdefault(keyword, [])
+                    if limit_per_keyword is None or len(offsets) < limit_per_keyword:
+                        offsets.append(pos)
+                        if limit_per_keyword is not None and len(offsets) == limit_per_keyword:
+                            complete += 1
+
+            if complete >= total and (first_only or limit_per_keyword is not None):
+                break
+
+        return hits
@@ -0,0 +1,301 @@
+"""
+LLM Response Cache
+Persistent content-addressed cache for chat-completion responses
+
+Responses are keyed by a hash of everything that determines them (model,
+system prompt, user prompt, temperature, max tokens). Entries live in a
+SQLite table with a TTL and a size bound (least recently used rows are
+evicted first), fronted by an in-memory LRU for repeat lookups. Accesses
+served from memory are written back to the table in batches, so hot keys
+keep a recent last_access.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class LLMResponseCache:
+    """
+    Two-level response cache: in-memory LRU over a SQLite table
+
+    Safe to share between threads; every SQLite access uses its own
+    short-lived connection, as elsewhere in the codebase.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/llm_cache.db",
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 20000,
+        memory_entries: int = 256,
+        touch_interval: float = 30.0
+    ):
+        """
+        Args:
+            db_path: SQLite file holding the cache table
+            ttl_seconds: Lifetime of an entry (None keeps entries until evicted)
+            max_entries: Rows kept on disk; least recently used rows are evicted
+            memory_entries: Responses kept in the in-memory LRU
+            touch_interval: Seconds between write-backs of memory hits to
+                last_access (always written before an eviction)
+        """
+
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.touch_interval = touch_interval
+
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> (last access, hits) of memory hits not yet written to SQLite
+        self._touched: Dict[str, tuple] = {}
+        self._last_touch_flush = time.time()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expired = 0
+
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._init_database()
+        self._entries = self._count()
+
+    def _init_database(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER DEFAULT 0
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_responses_access ON llm_responses(last_access)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _count(self) -> int:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return int(conn.execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0])
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """SHA-256 over the request fields that determine the response"""
+
+        payload = json.dumps(
+            [model, system_prompt, user_prompt, round(float(temperature), 4), max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for a key, or None when missing or expired"""
+
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    _, hits = self._touched.get(key, (now, 0))
+                    self._touched[key] = (now, hits + 1)
+                    flush_due = now - self._last_touch_flush >= self.touch_interval
+                else:
+                    del self._memory[key]
+                    entry = None
+
+        if entry is not None:
+            if flush_due:
+                self.flush_touches()
+            return response
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                'SELECT response, expires_at FROM llm_responses WHERE cache_key = ?', (key,)
+            ).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                conn.execute('DELETE FROM llm_responses WHERE cache_key = ?', (key,))
+                conn.commit()
+                with self._lock:
+                    self.expired += 1
+                    self._entries -= 1
+                row = None
+            if row is not None:
+                conn.execute(
+                    'UPDATE llm_responses SET last_access = ?, hits = hits + 1 WHERE cache_key = ?',
+                    (now, key)
+                )
+                conn.commit()
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, row[0], row[1])
+        return row[0]
+
+    def put(self, key: str, response: str, model: Optional[str] = None) -> None:
+        """Store a response, evicting least recently used rows beyond max_entries"""
+
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('''
+                INSERT OR REPLACE INTO llm_responses
+                (cache_key, model, response, created_at, expires_at, last_access, hits)
+                VALUES (?, ?, ?, ?, ?, ?, 0)
+            ''', (key, model, response, now, expires_at, now))
+            conn.commit()
+            with self._lock:
+                self.stores += 1
+                self._entries += 1
+                over = self._entries > self.max_entries
+
+            if over:
+                # Eviction order must see the accesses served from memory
+                self._flush_touches(conn)
+                # Recount: REPLACE does not grow the table and other processes share it
+                overflow = self._count_with(conn) - self.max_entries
+                evicted = 0
+                if overflow > 0:
+                    cursor = conn.execute('''
+                        DELETE FROM llm_responses WHERE cache_key IN (
+                            SELECT cache_key FROM llm_responses ORDER BY last_access LIMIT ?
+                        )
+                    ''', (overflow,))
+                    conn.commit()
+                    evicted = cursor.rowcount
+                count = self._count_with(conn)
+                with self._lock:
+                    self.evictions += evicted
+                    self._entries = count
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._remember(key, response, expires_at)
+
+    def flush_touches(self) -> int:
+        """Write memory hits to last_access and hits; returns the rows touched"""
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return self._flush_touches(conn)
+        finally:
+            conn.close()
+
+    def _flush_touches(self, conn) -> int:
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._last_touch_flush = time.time()
+        if not touched:
+            return 0
+
+        conn.executemany(
+            'UPDATE llm_responses SET last_access = MAX(last_access, ?), hits = hits + ? WHERE cache_key = ?',
+            [(accessed, hits, key) for key, (accessed, hits) in touched.items()]
+        )
+        conn.commit()
+        return len(touched)
+
+    @staticmethod
+    def _count_with(conn) -> int:
+        return int(conn.execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0])
+
+    def _remember(self, key: str, response: str, expires_at: Optional[float]) -> None:
+        """Insert into the in-memory LRU (caller holds the lock)"""
+
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; returns how many were removed"""
+
+        now = time.time()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(
+                'DELETE FROM llm_responses WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,)
+            )
+            conn.commit()
+            removed = cursor.rowcount
+            count = self._count_with(conn)
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.expired += removed
+            self._entries = count
+            for key in [k for k, (_, expires_at) in self._memory.items() if expires_at is not None and expires_at <= now]:
+                del self._memory[key]
+        return removed
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute('DELETE FROM llm_responses')
+            conn.commit()
+        finally:
+            conn.close()
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._entries = 0
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            'entries': self._entries,
+            'memory_entries': len(self._memory),
+            'hits': hits,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'expired': self.expired
+        }
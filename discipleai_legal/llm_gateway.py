@@ -0,0 +1,511 @@
+"""
+LLM Gateway
+Shared, concurrency-limited access to the chat-completions API
+
+Every model call runs on one asyncio event loop owned by the gateway. A
+global semaphore bounds the calls in flight and a per-tenant semaphore
+keeps one tenant from taking every slot. Each call has a deadline that
+covers queueing, attempts and backoff, and one attempt may use only part
+of it; timeouts, connection errors, 429s and 5xx responses are retried
+with jittered exponential backoff, and a
+circuit breaker fails calls fast while the upstream is down so callers
+can fall back to rule-based analysis.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+import asyncio
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+try:
+    import openai
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+# Status codes worth retrying besides 5xx
+RETRYABLE_STATUS = {408, 409, 429}
+
+# Samples kept for the queue-wait and latency percentiles
+METRIC_WINDOW = 1024
+
+
+class LLMUnavailable(RuntimeError):
+    """The model did not answer: circuit open, deadline passed or retries exhausted"""
+
+
+class LLMHTTPError(RuntimeError):
+    """Non-2xx response from a chat-completions endpoint"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status_code}: {message}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# Errors meaning the model did not answer; callers fall back on these and
+# let anything else (programming errors) propagate
+LLM_ERRORS = (LLMUnavailable, LLMHTTPError) + ((openai.APIError,) if OPENAI_AVAILABLE else ())
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection failures, rate limiting and server errors"""
+
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError, urllib.error.URLError)):
+        return True
+    return OPENAI_AVAILABLE and isinstance(error, openai.APIConnectionError)
+
+
+class HTTPChatClient:
+    """
+    Minimal chat-completions client over urllib
+
+    Used when the openai package is not installed. It speaks the same
+    request and response JSON, so it works against OpenAI-compatible
+    servers and local stubs alike.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = DEFAULT_BASE_URL, timeout: float = 60.0):
+        self.api_key = api_key
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.timeout = timeout
+        # Same attribute path as the OpenAI client: client.chat.completions.create
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, timeout: Optional[float] = None, **request):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        http_request = urllib.request.Request(
+            self.url, data=json.dumps(request).encode("utf-8"), headers=headers, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(http_request, timeout=timeout or self.timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("Retry-After") if e.headers else None
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise LLMHTTPError(e.code, e.read().decode("utf-8", "replace")[:200], retry_after) from None
+        return json.loads(body, object_hook=lambda fields: SimpleNamespace(**fields))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    closed -> open after failure_threshold failed calls in a row;
+    open -> half_open once reset_timeout has passed, letting a single
+    probe call through; the probe's outcome closes or re-opens it.
+    allow() hands out permits; only the probe's permit frees the probe
+    slot on release().
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Permit for calls admitted while closed
+    PASS = object()
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probe: Optional[object] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[object]:
+        """Permit for a call to the upstream now, or None when it must fail fast"""
+
+        with self._lock:
+            if self.state == self.CLOSED:
+                return self.PASS
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return None
+                self.state = self.HALF_OPEN
+                self._probe = None
+            if self._probe is not None:
+                return None
+            self._probe = object()
+            return self._probe
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe = None
+
+    def release(self, permit: object) -> None:
+        """A call ended; if it was the probe and left no verdict, allow another probe"""
+
+        with self._lock:
+            if permit is not None and permit is self._probe:
+                self._probe = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips
+        }
+
+
+class LLMGateway:
+    """
+    Concurrency-limited chat-completions client
+
+    complete() blocks the calling thread; acomplete() is awaitable from
+    any event loop. Both share the gateway's limits, deadlines, retry
+    policy and circuit breaker.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_concurrency: int = 16,
+        tenant_concurrency: int = 8,
+        timeout: float = 120.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        attempt_fraction: float = 0.5
+    ):
+        """
+        Args:
+            client: Chat-completions client to use (sync or async create);
+                built from api_key / base_url when omitted
+            api_key: API key (defaults to OPENAI_API_KEY)
+            base_url: API base URL (defaults to OPENAI_BASE_URL, then OpenAI)
+            max_concurrency: Calls in flight across all tenants
+            tenant_concurrency: Calls in flight per tenant
+            timeout: Default deadline per call in seconds, queueing included
+            max_retries: Retries after the first attempt
+            backoff_base: First backoff ceiling in seconds (doubles per retry)
+            backoff_max: Backoff ceiling in seconds
+            failure_threshold: Failed calls in a row that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            attempt_fraction: Share of the call's deadline one attempt may
+                use, so a stalled attempt leaves time for a retry (the last
+                attempt gets whatever remains)
+        """
+
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
+        self.max_concurrency = max_concurrency
+        self.tenant_concurrency = tenant_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.attempt_fraction = attempt_fraction
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        # Clients the gateway builds get a per-attempt timeout and no retries of their own
+        self._owns_client = client is None
+        if client is not None:
+            self.client = client
+        elif self.api_key or self.base_url:
+            if OPENAI_AVAILABLE:
+                self.client = AsyncOpenAI(
+                    api_key=self.api_key or "local", base_url=self.base_url, max_retries=0, timeout=timeout
+                )
+            else:
+                self.client = HTTPChatClient(self.api_key, self.base_url or DEFAULT_BASE_URL, timeout)
+        else:
+            self.client = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._start_lock = threading.Lock()
+        self._global: Optional[asyncio.Semaphore] = None
+        self._tenants: Dict[str, asyncio.Semaphore] = {}
+
+        # Metrics (updated on the gateway loop only)
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+        self._queue_waits = deque(maxlen=METRIC_WINDOW)
+        self._latencies = deque(maxlen=METRIC_WINDOW)
+
+    @property
+    def available(self) -> bool:
+        """True when a client is configured"""
+        return self.client is not None
+
+    # --- Entry points ---
+
+    def complete(self, messages: List[Dict], tenant: str = "", timeout: Optional[float] = None, **params) -> str:
+        """
+        Chat completion from a worker thread; returns the message content
+
+        Raises:
+            LLMUnavailable: circuit open, deadline passed or retries exhausted
+        """
+
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("complete() would block the gateway loop; await acomplete() instead")
+        future = asyncio.run_coroutine_threadsafe(self._call(messages, tenant, timeout, params), loop)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def acomplete(self, messages: List[Dict], tenant: str = "", timeout: Optional[float] = None, **params) -> str:
+        """Awaitable form of complete() for any event loop"""
+
+        loop = self._ensure_loop()
+        call = self._call(messages, tenant, timeout, params)
+        if asyncio.get_running_loop() is loop:
+            return await call
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(call, loop))
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=self._run_loop, args=(loop,), name="llm-gateway", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    # --- Calls (gateway loop) ---
+
+    async def _call(self, messages: List[Dict], tenant: str, timeout: Optional[float], params: Dict) -> str:
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = loop.time() + timeout
+        self.calls += 1
+
+        if self.client is None:
+            raise LLMUnavailable("no LLM client configured")
+        permit = self.breaker.allow()
+        if permit is None:
+            self.rejected += 1
+            raise LLMUnavailable("circuit open")
+
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_concurrency)
+        # Requests without a tenant are bounded by the global limit only
+        semaphores = [self._global]
+        if tenant:
+            if tenant not in self._tenants:
+                self._tenants[tenant] = asyncio.Semaphore(self.tenant_concurrency)
+            semaphores.insert(0, self._tenants[tenant])
+
+        acquired = []
+        queued_at = loop.time()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            try:
+                # Tenant slot first, so a tenant's backlog never holds global slots
+                for semaphore in semaphores:
+                    await asyncio.wait_for(semaphore.acquire(), max(deadline - loop.time(), 0))
+                    acquired.append(semaphore)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise LLMUnavailable(f"queued past the {timeout:g}s deadline") from None
+            finally:
+                self.queued -= 1
+
+            self._queue_waits.append(loop.time() - queued_at)
+            self.in_flight += 1
+            try:
+                return await self._attempts(messages, params, deadline, timeout * self.attempt_fraction)
+            finally:
+                self.in_flight -= 1
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            self.breaker.release(permit)
+
+    async def _attempts(self, messages: List[Dict], params: Dict, deadline: float, attempt_timeout: float) -> str:
+        """Attempts with jittered exponential backoff until success or the deadline"""
+
+        loop = asyncio.get_running_loop()
+        last_error: Optional[BaseException] = None
+        attempts = 0
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            if attempt < self.max_retries:
+                remaining = min(remaining, attempt_timeout)
+            attempts += 1
+            started = loop.time()
+            try:
+                response = await asyncio.wait_for(self._send(messages, params, remaining), remaining)
+            except asyncio.TimeoutError as e:
+                self.timeouts += 1
+                last_error = e
+            except Exception as e:
+                if not is_retryable(e):
+                    # The upstream answered; the request itself was rejected
+                    self.failures += 1
+                    self.breaker.record_success()
+                    raise
+                last_error = e
+            else:
+                self._latencies.append(loop.time() - started)
+                self.successes += 1
+                self.breaker.record_success()
+                return response.choices[0].message.content
+
+            if attempt == self.max_retries:
+                break
+            # Full jitter, but never sooner than the server asked
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            delay = max(delay, getattr(last_error, "retry_after", None) or 0)
+            if loop.time() + delay >= deadline:
+                break
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+        self.failures += 1
+        self.breaker.record_failure()
+        raise LLMUnavailable(f"no response after {attempts} attempt(s): {last_error!r}") from last_error
+
+    async def _send(self, messages: List[Dict], params: Dict, remaining: float):
+        create = self.client.chat.completions.create
+        request = dict(params, messages=messages)
+        if self._owns_client:
+            request["timeout"] = remaining
+        if inspect.iscoroutinefunction(create):
+            return await create(**request)
+
+        # Synchronous clients run on the gateway's own pool, sized to the global limit
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm-call")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(create, **request))
+
+    def close(self) -> None:
+        """Stop the gateway loop and its worker pool"""
+
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+            executor, self._executor = self._executor, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            loop.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self._global = None
+        self._tenants = {}
+
+    # --- Metrics ---
+
+    def get_stats(self) -> Dict:
+        """Call outcomes, queueing and latency (ms percentiles over recent calls)"""
+
+        waits = sorted(self._queue_waits)
+        latencies = sorted(self._latencies)
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "max_concurrency": self.max_concurrency,
+            "tenant_concurrency": self.tenant_concurrency,
+            "queue_wait_ms": {
+                "avg": round(1000 * sum(waits) / len(waits), 2) if waits else 0.0,
+                "p95": _percentile_ms(waits, 0.95)
+            },
+            "latency_ms": {
+                "p50": _percentile_ms(latencies, 0.50),
+                "p95": _percentile_ms(latencies, 0.95),
+                "p99": _percentile_ms(latencies, 0.99)
+            },
+            "circuit": self.breaker.get_stats()
+        }
+
+
+def _percentile_ms(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return round(1000 * values[min(len(values) - 1, int(q * len(values)))], 2)
+
+
+_gateways: Dict[tuple, LLMGateway] = {}
+_gateways_lock = threading.Lock()
+
+
+def get_llm_gateway(api_key: Optional[str] = None, base_url: Optional[str] = None) -> LLMGateway:
+    """
+    Process-wide gateway per API key and base URL, so every caller shares
+    its limits; LLM_MAX_CONCURRENCY, LLM_TENANT_CONCURRENCY and
+    LLM_TIMEOUT override the defaults
+    """
+
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    base_url = base_url or os.getenv("OPENAI_BASE_URL")
+    with _gateways_lock:
+        gateway = _gateways.get((api_key, base_url))
+        if gateway is None:
+            gateway = _gateways[(api_key, base_url)] = LLMGateway(
+                api_key=api_key,
+                base_url=base_url,
+                max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "16")),
+                tenant_concurrency=int(os.getenv("LLM_TENANT_CONCURRENCY", "8")),
+                timeout=float(os.getenv("LLM_TIMEOUT", "120"))
+            )
+    return gateway
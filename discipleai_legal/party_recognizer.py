@@ -0,0 +1,316 @@
+"""
+Party Recognizer
+Linear-time contract party extraction shared by the legal analyzers
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+import re
+import time
+
+from .contract_document import ContractDocument
+
+
+# One token per word, whitespace run or single other character. Each
+# alternative is a plain character class, so tokenizing never backtracks.
+TOKEN_PATTERN = re.compile(r'[A-Za-z]+|\s+|.', re.DOTALL)
+
+LEGAL_SUFFIXES = frozenset({
+    'Inc', 'LLC', 'LLP', 'Ltd', 'Limited', 'Corp', 'Corporation',
+    'Incorporated', 'Company', 'PLC', 'GmbH'
+})
+
+# Lowercase words allowed inside a company name ("Bank of America Corp")
+NAME_CONNECTORS = frozenset({'of', 'and', 'the', 'for'})
+
+# Capitalized words that start a sentence rather than a name
+LEADING_STOPWORDS = frozenset({
+    'Between', 'By', 'And', 'The', 'This', 'That', 'With', 'Whereas', 'Agreement'
+})
+
+NON_LEADING = LEADING_STOPWORDS | NAME_CONNECTORS
+
+# Characters allowed in a party name after its capitalized first word
+NAME_PUNCTUATION = frozenset('&,.')
+
+Token = Tuple[str, str, int]  # kind ('word' | 'space' | 'char'), text, offset
+
+# Share of the time budget spent tokenizing; the scan of whatever was
+# tokenized keeps the rest (it runs at roughly half the tokenizer's cost)
+TOKENIZE_SHARE = 0.65
+
+
+class PartyRecognizer:
+    """
+    Token-level state machine over capitalized runs
+
+    Recognizes parties introduced by 'between X ("', 'party: X',
+    '"X" (hereinafter' and names ending in a legal suffix (Inc, LLC, ...).
+    Every trigger looks ahead at most `max_name_tokens` tokens, so a
+    document costs O(length) regardless of its formatting. Documents are
+    cut at `max_chars`; the time budget grows with the document length,
+    and when it runs out the parties found in the text covered so far are
+    still returned.
+    """
+
+    def __init__(
+        self,
+        legal_entities: bool = True,
+        max_parties: int = 10,
+        max_chars: int = 2_000_000,
+        time_budget_ms: float = 250.0,
+        time_budget_ms_per_mb: float = 1000.0,
+        max_name_tokens: int = 40,
+        max_entity_words: int = 8
+    ):
+        """
+        Args:
+            legal_entities: Also recognize names ending in a legal suffix
+            max_parties: Parties returned per document
+            max_chars: Characters scanned per document (size budget)
+            time_budget_ms: Scan time per document (time budget)
+            time_budget_ms_per_mb: Scan time added per million characters, so
+                a document up to max_chars can be read in full (~0.5 ms per
+                thousand characters on current hardware)
+            max_name_tokens: Lookahead window per trigger
+            max_entity_words: Words kept before a legal suffix
+        """
+
+        self.legal_entities = legal_entities
+        self.max_parties = max_parties
+        self.max_chars = max_chars
+        self.time_budget_ms = time_budget_ms
+        self.time_budget_ms_per_mb = time_budget_ms_per_mb
+        self.max_name_tokens = max_name_tokens
+        self.max_entity_words = max_entity_words
+
+        self.documents_scanned = 0
+        self.truncated_by_size = 0
+        self.truncated_by_time = 0
+
+    def extract(self, text: Union[str, ContractDocument]) -> List[str]:
+        """Party names, deduplicated in order of appearance"""
+
+        return self.recognize(text)['parties']
+
+    def recognize(self, text: Union[str, ContractDocument]) -> Dict:
+        """
+        Recognize parties within the document budgets
+
+        Returns:
+            parties (from the text read before a budget ran out), whether
+            the size or time budget cut the scan short, and elapsed time
+        """
+
+        text = ContractDocument.ensure(text).text
+        started = time.perf_counter()
+
+        self.documents_scanned += 1
+        size_truncated = len(text) > self.max_chars
+        if size_truncated:
+            self.truncated_by_size += 1
+            text = text[:self.max_chars]
+
+        budget = self.time_budget(len(text)) / 1000
+        tokens, time_truncated = self._tokenize(text, started + budget * TOKENIZE_SHARE)
+        candidates, scan_truncated = self._scan(tokens, started + budget)
+        time_truncated = time_truncated or scan_truncated
+        if time_truncated:
+            self.truncated_by_time += 1
+
+        parties = {}
+        for name in candidates:
+            name = name.strip()
+            if len(name) > 3:
+                parties.setdefault(name, None)
+
+        return {
+            'parties': list(parties)[:self.max_parties],
+            'truncated': size_truncated or time_truncated,
+            'size_truncated': size_truncated,
+            'time_truncated': time_truncated,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    def time_budget(self, length: int) -> float:
+        """Time budget in milliseconds for a document of `length` characters"""
+
+        return self.time_budget_ms + self.time_budget_ms_per_mb * length / 1_000_000
+
+    def _tokenize(self, text: str, deadline: float) -> Tuple[List[Token], bool]:
+        tokens: List[Token] = []
+        for count, match in enumerate(TOKEN_PATTERN.finditer(text)):
+            if count & 0xFFF == 0 and time.perf_counter() > deadline:
+                return tokens, True
+
+            value = match.group()
+            if value[0].isalpha() and value[0].isascii():
+                kind = 'word'
+            elif value[0].isspace():
+                kind = 'space'
+            else:
+                kind = 'char'
+            tokens.append((kind, value, match.start()))
+        return tokens, False
+
+    def _scan(self, tokens: List[Token], deadline: float) -> Tuple[List[str], bool]:
+        """Single pass over tokens; names found and whether the time budget ran out"""
+
+        found: List[str] = []
+        run: List[int] = []  # token indices of the current capitalized run
+
+        for i, (kind, value, _) in enumerate(tokens):
+            # Checked after each block, so a late start still scans one block
+            if i & 0xFFF == 0xFFF and time.perf_counter() > deadline:
+                return found, True
+
+            if kind == 'word':
+                lowered = value.lower()
+                if lowered == 'between':
+                    name = self._name_before_quote_paren(tokens, i + 1)
+                    if name:
+                        found.append(name)
+                elif value == 'party':
+                    name = self._name_after_party(tokens, i + 1)
+                    if name:
+                        found.append(name)
+
+                if self.legal_entities:
+                    run = self._advance_run(tokens, run, i, found)
+            elif kind == 'char':
+                if value == '"':
+                    name = self._quoted_hereinafter(tokens, i + 1)
+                    if name:
+                        found.append(name)
+                if value not in ('&', ',') and run:
+                    run = []
+            elif '\n' in value and run:
+                run = []
+
+        return found, False
+
+    def _text(self, tokens: List[Token], start: int, end: int) -> str:
+        return ''.join(value for _, value, _ in tokens[start:end])
+
+    def _is_name_token(self, token: Token) -> bool:
+        kind, value, _ = token
+        if kind == 'word':
+            return True
+        if kind == 'space':
+            return '\n\n' not in value
+        return value in NAME_PUNCTUATION
+
+    def _name_span(self, tokens: List[Token], start: int) -> Tuple[int, int]:
+        """Name tokens from `start` (skipping leading spaces): [first, end)"""
+
+        first = start
+        while first < len(tokens) and tokens[first][0] == 'space':
+            first += 1
+        if first >= len(tokens) or tokens[first][0] != 'word' or not tokens[first][1][0].isupper():
+            return first, first
+
+        end = first
+        limit = min(len(tokens), first + self.max_name_tokens)
+        while end < limit and self._is_name_token(tokens[end]):
+            end += 1
+        return first, end
+
+    def _name_before_quote_paren(self, tokens: List[Token], start: int) -> Optional[str]:
+        """'between Name ("' """
+
+        first, end = self._name_span(tokens, start)
+        if first == end or end + 1 >= len(tokens):
+            return None
+        if tokens[end][1] == '(' and tokens[end + 1][1] == '"' and tokens[end - 1][0] == 'space':
+            return self._text(tokens, first, end - 1)
+        return None
+
+    def _name_after_party(self, tokens: List[Token], start: int) -> Optional[str]:
+        """'party: Name' / 'party Name'"""
+
+        if start >= len(tokens):
+            return None
+        if tokens[start][1] == ':':
+            start += 1
+        elif tokens[start][0] != 'space':
+            return None
+
+        first, end = self._name_span(tokens, start)
+
+        # The name ends at the first lowercase word that is not a connector
+        last = first
+        for index in range(first, end):
+            kind, value, _ = tokens[index]
+            if kind == 'word':
+                if value[0].isupper():
+                    last = index + 1
+                elif value not in NAME_CONNECTORS:
+                    break
+            elif kind == 'char':
+                last = index + 1
+
+        return self._text(tokens, first, last) if last > first else None
+
+    def _quoted_hereinafter(self, tokens: List[Token], start: int) -> Optional[str]:
+        """'"Name" (hereinafter'"""
+
+        if start >= len(tokens) or tokens[start][0] != 'word':
+            return None
+
+        first, end = self._name_span(tokens, start)
+        if first != start or end >= len(tokens) or tokens[end][1] != '"':
+            return None
+
+        cursor = end + 1
+        if cursor < len(tokens) and tokens[cursor][0] == 'space':
+            cursor += 1
+        else:
+            return None
+        if cursor + 1 < len(tokens) and tokens[cursor][1] == '(' and tokens[cursor + 1][1].lower() == 'hereinafter':
+            return self._text(tokens, first, end)
+        return None
+
+    def _advance_run(self, tokens: List[Token], run: List[int], i: int, found: List[str]) -> List[int]:
+        """Extend the capitalized run with word i; emit it on a legal suffix"""
+
+        value = tokens[i][1]
+
+        if value in LEGAL_SUFFIXES and run:
+            words = run[-self.max_entity_words:]
+            while words and tokens[words[0]][1] in NON_LEADING:
+                words = words[1:]
+            if words:
+                found.append(self._text(tokens, words[0], i + 1))
+            return []
+
+        if value[0].isupper():
+            if run and not self._joined(tokens, run[-1], i):
+                run = []
+            return run + [i] if len(run) < self.max_entity_words else run[1:] + [i]
+
+        if value in NAME_CONNECTORS and run and self._joined(tokens, run[-1], i):
+            return run + [i] if len(run) < self.max_entity_words else run[1:] + [i]
+
+        return []
+
+    def _joined(self, tokens: List[Token], previous: int, current: int) -> bool:
+        """Whether two words are separated only by spaces, '&' and ','"""
+
+        for kind, value, _ in tokens[previous + 1:current]:
+            if kind == 'space':
+                if '\n' in value:
+                    return False
+            elif value not in ('&', ','):
+                return False
+        return True
+
+    def get_stats(self) -> Dict:
+        """Get recognizer statistics"""
+
+        return {
+            'documents_scanned': self.documents_scanned,
+            'truncated_by_size': self.truncated_by_size,
+            'truncated_by_time': self.truncated_by_time,
+            'max_chars': self.max_chars,
+            'time_budget_ms': self.time_budget_ms,
+            'time_budget_ms_per_mb': self.time_budget_ms_per_mb
+        }
@@ -0,0 +1,370 @@
+"""
+Portfolio Runner
+Batch risk, compliance and clause analysis of contract portfolios over a
+process pool, with NDJSON output and resumable checkpoints
+
+Usage:
+    python -m discipleai_legal.portfolio_runner CONTRACTS_DIR_OR_MANIFEST -o results.ndjson
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+from .contract_document import ContractDocument
+
+
+ANALYZERS = ('risk', 'compliance', 'clauses')
+
+# Per-job options read from manifests (and accepted as run defaults)
+JOB_OPTIONS = ('contract_type', 'jurisdiction', 'industry', 'contract_value')
+
+DEFAULT_PATTERNS = ('.txt', '.md')
+
+
+def load_jobs(source: str, extensions: Sequence[str] = DEFAULT_PATTERNS) -> List[Dict]:
+    """
+    Jobs from a directory of contracts or a manifest
+
+    Manifests are .jsonl/.ndjson (one object per line) or .csv with a
+    `path` column and optional `id` and JOB_OPTIONS columns. Relative
+    paths resolve against the manifest's directory. Directory jobs use
+    the path relative to the directory as id.
+    """
+
+    if os.path.isdir(source):
+        jobs = []
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith(tuple(extensions)):
+                    path = os.path.join(root, name)
+                    jobs.append({'id': os.path.relpath(path, source), 'path': path})
+        jobs.sort(key=lambda job: job['id'])
+        return jobs
+
+    base = os.path.dirname(os.path.abspath(source))
+    if source.lower().endswith('.csv'):
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    jobs = []
+    for row in rows:
+        path = row['path']
+        job = {
+            'id': str(row.get('id') or path),
+            'path': path if os.path.isabs(path) else os.path.join(base, path)
+        }
+        for option in JOB_OPTIONS:
+            if row.get(option) not in (None, ''):
+                job[option] = row[option]
+        jobs.append(job)
+    return jobs
+
+
+# --- Worker process side ---
+
+_worker_analyzers: Dict = {}
+
+
+def _init_worker(analyzers: Sequence[str]):
+    """Build the analyzers once per worker process"""
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        if 'risk' in analyzers:
+            from .risk_assessor import RiskAssessor
+            _worker_analyzers['risk'] = RiskAssessor()
+        if 'compliance' in analyzers:
+            from .compliance_checker import ComplianceChecker
+            _worker_analyzers['compliance'] = ComplianceChecker()
+        if 'clauses' in analyzers:
+            from .clause_extractor import ClauseExtractor
+            _worker_analyzers['clauses'] = ClauseExtractor()
+
+
+def _analyze_job(job: Dict, defaults: Dict, clause_full_text: bool) -> Dict:
+    options = {**defaults, **{k: job[k] for k in JOB_OPTIONS if k in job}}
+    started = time.perf_counter()
+    record = {'id': job['id'], 'path': job['path']}
+
+    try:
+        with open(job['path'], 'r', encoding='utf-8', errors='replace') as f:
+            doc = ContractDocument(f.read())
+
+        contract_value = options.get('contract_value')
+        contract_type = options.get('contract_type') or 'general'
+
+        if 'risk' in _worker_analyzers:
+            record['risk'] = _worker_analyzers['risk'].assess_risk(
+                doc,
+                contract_value=float(contract_value) if contract_value not in (None, '') else None,
+                contract_type=contract_type
+            )
+        if 'compliance' in _worker_analyzers:
+            record['compliance'] = _worker_analyzers['compliance'].check_compliance(
+                doc,
+                contract_type=contract_type,
+                jurisdiction=options.get('jurisdiction') or 'US',
+                industry=options.get('industry')
+            )
+        if 'clauses' in _worker_analyzers:
+            record['clauses'] = _worker_analyzers['clauses'].extract_clauses(
+                doc,
+                extract_full_text=clause_full_text
+            )
+
+        record['success'] = True
+    except Exception as e:
+        record['success'] = False
+        record['error'] = f"{type(e).__name__}: {e}"
+
+    record['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return record
+
+
+def _analyze_chunk(jobs: List[Dict], defaults: Dict, clause_full_text: bool) -> List[Dict]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [_analyze_job(job, defaults, clause_full_text) for job in jobs]
+
+
+# --- Coordinator side ---
+
+class PortfolioRunner:
+    """
+    Portfolio analysis over a process pool
+    Jobs are dispatched in chunks; each worker builds its analyzers once.
+    Every finished record is appended to the NDJSON output before its id is
+    appended to the checkpoint, so a resumed run never loses results. Only
+    successful records are checkpointed: a resumed run retries failed
+    contracts, and the output then holds one record per attempt (the last
+    one for an id is current).
+    """
+
+    def __init__(
+        self,
+        analyzers: Sequence[str] = ANALYZERS,
+        workers: Optional[int] = None,
+        chunk_size: int = 16,
+        defaults: Optional[Dict] = None,
+        clause_full_text: bool = False,
+        progress_interval: float = 5.0,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ):
+        """
+        Args:
+            analyzers: Subset of ANALYZERS to run
+            workers: Worker processes (default: CPU count)
+            chunk_size: Contracts per dispatched task
+            defaults: Default JOB_OPTIONS for jobs that do not set them
+            clause_full_text: Include full clause text in clause results
+            progress_interval: Seconds between progress reports
+            on_progress: Progress callback (default: print to stderr)
+        """
+
+        unknown = set(analyzers) - set(ANALYZERS)
+        if unknown:
+            raise ValueError(f"Unknown analyzers: {', '.join(sorted(unknown))}")
+
+        self.analyzers = tuple(analyzers)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.defaults = dict(defaults or {})
+        self.clause_full_text = clause_full_text
+        self.progress_interval = progress_interval
+        self.on_progress = on_progress or self._print_progress
+
+    @staticmethod
+    def checkpoint_path_for(output_path: str) -> str:
+        return f"{output_path}.checkpoint"
+
+    def _load_checkpoint(self, path: str) -> Set[str]:
+        if not os.path.exists(path):
+            return set()
+        with open(path, 'r', encoding='utf-8') as f:
+            return {line.rstrip('\n') for line in f if line.strip()}
+
+    def run(
+        self,
+        source: str,
+        output_path: str,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = True
+    ) -> Dict:
+        """
+        Analyze a portfolio
+
+        Args:
+            source: Directory of contracts or manifest file
+            output_path: NDJSON file receiving one record per contract
+            checkpoint_path: Succeeded-id file (default: <output>.checkpoint)
+            resume: Skip contracts recorded in the checkpoint (failed ones are retried)
+
+        Returns:
+            Run summary
+        """
+
+        return self.run_jobs(load_jobs(source), output_path, checkpoint_path, resume)
+
+    def run_jobs(
+        self,
+        jobs: Iterable[Dict],
+        output_path: str,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = True
+    ) -> Dict:
+        """Analyze explicit jobs ({'id', 'path', ...options})"""
+
+        checkpoint_path = checkpoint_path or self.checkpoint_path_for(output_path)
+        jobs = list(jobs)
+
+        if not resume:
+            for path in (output_path, checkpoint_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        done = self._load_checkpoint(checkpoint_path)
+        pending = [job for job in jobs if job['id'] not in done]
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+
+        parent = os.path.dirname(output_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        progress = {
+            'total': len(jobs),
+            'skipped': len(jobs) - len(pending),
+            'completed': 0,
+            'failed': 0,
+            'remaining': len(pending)
+        }
+        started = time.perf_counter()
+        last_report = started
+
+        with open(output_path, 'a', encoding='utf-8') as output, \
+                open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+                ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.analyzers,)
+                ) as pool:
+
+            # Bounded in-flight window keeps memory flat on large portfolios
+            queued = iter(chunks)
+            in_flight = set()
+
+            def submit_next() -> bool:
+                chunk = next(queued, None)
+                if chunk is None:
+                    return False
+                in_flight.add(pool.submit(_analyze_chunk, chunk, self.defaults, self.clause_full_text))
+                return True
+
+            for _ in range(self.workers * 2):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    in_flight.discard(future)
+                    records = future.result()
+
+                    for record in records:
+                        output.write(json.dumps(record, default=str) + '\n')
+                    output.flush()
+
+                    for record in records:
+                        if record['success']:
+                            checkpoint.write(record['id'] + '\n')
+                    checkpoint.flush()
+
+                    progress['completed'] += len(records)
+                    progress['failed'] += sum(1 for r in records if not r['success'])
+                    progress['remaining'] -= len(records)
+                    submit_next()
+
+                now = time.perf_counter()
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    self.on_progress(self._progress_snapshot(progress, now - started))
+
+        elapsed = time.perf_counter() - started
+        summary = self._progress_snapshot(progress, elapsed)
+        summary.update({
+            'output_path': output_path,
+            'checkpoint_path': checkpoint_path,
+            'analyzers': list(self.analyzers),
+            'workers': self.workers,
+            'finished_at': datetime.now().isoformat()
+        })
+        self.on_progress(summary)
+        return summary
+
+    def _progress_snapshot(self, progress: Dict, elapsed: float) -> Dict:
+        throughput = progress['completed'] / elapsed if elapsed > 0 else 0.0
+        eta = progress['remaining'] / throughput if throughput > 0 else None
+        return {
+            **progress,
+            'elapsed_seconds': round(elapsed, 2),
+            'throughput_per_second': round(throughput, 2),
+            'eta_seconds': round(eta, 1) if eta is not None else None
+        }
+
+    def _print_progress(self, snapshot: Dict):
+        eta = snapshot['eta_seconds']
+        print(
+            f"[portfolio] {snapshot['completed'] + snapshot['skipped']}/{snapshot['total']} done "
+            f"({snapshot['failed']} failed, {snapshot['skipped']} resumed) | "
+            f"{snapshot['throughput_per_second']:.1f} docs/s | "
+            f"ETA {f'{eta:.0f}s' if eta is not None else '-'}",
+            file=sys.stderr
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Analyze a contract portfolio')
+    parser.add_argument('source', help='Directory of contracts or .jsonl/.csv manifest')
+    parser.add_argument('-o', '--output', required=True, help='NDJSON output file')
+    parser.add_argument('--checkpoint', help='Checkpoint file (default: <output>.checkpoint)')
+    parser.add_argument('--analyzers', default=','.join(ANALYZERS), help='Comma-separated subset of: ' + ', '.join(ANALYZERS))
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=16, help='Contracts per dispatched task')
+    parser.add_argument('--contract-type', default=None, help='Default contract type')
+    parser.add_argument('--jurisdiction', default=None, help='Default jurisdiction')
+    parser.add_argument('--industry', default=None, help='Default industry')
+    parser.add_argument('--full-text', action='store_true', help='Include full clause text')
+    parser.add_argument('--no-resume', action='store_true', help='Start over, discarding output and checkpoint')
+    parser.add_argument('--progress-interval', type=float, default=5.0, help='Seconds between progress reports')
+    args = parser.parse_args(argv)
+
+    defaults = {
+        'contract_type': args.contract_type,
+        'jurisdiction': args.jurisdiction,
+        'industry': args.industry
+    }
+
+    runner = PortfolioRunner(
+        analyzers=[a.strip() for a in args.analyzers.split(',') if a.strip()],
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        defaults={k: v for k, v in defaults.items() if v},
+        clause_full_text=args.full_text,
+        progress_interval=args.progress_interval
+    )
+
+    summary = runner.run(args.source, args.output, checkpoint_path=args.checkpoint, resume=not args.no_resume)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
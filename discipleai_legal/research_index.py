@@ -0,0 +1,980 @@
+"""
+Research Index
+Offline full-text index of opinions and statutes for LegalResearchEngine
+
+Usage:
+    python -m discipleai_legal.research_index CORPUS_DIR INDEX_DIR
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import heapq
+import io
+import json
+import math
+import os
+import re
+import threading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .citation_graph import CitationGraph, extract_citations, graph_path, normalize_citation
+from .index_segments import SEGMENT_SUFFIX, MergePolicy, Segment, SegmentWriter, merge_segments, write_segment_file
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'he',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'were',
+    'which', 'with', 'this', 'not', 'but', 'have', 'had', 'his', 'her', 'they'
+})
+
+# Metadata kept per document (the full text is only tokenized)
+METADATA_FIELDS = ('id', 'title', 'citation', 'court', 'jurisdiction', 'year', 'type', 'summary')
+
+DOCUMENT_TYPES = ('case_law', 'statutes', 'regulations')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without stopwords"""
+
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _year(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def tfidf_cosine(text: str, documents: List[str]) -> List[float]:
+    """
+    TF-IDF cosine similarity of a text to each of a few documents
+
+    For candidates that are not in an index: idf comes from the
+    documents themselves. Weights are sublinear tf times smoothed idf.
+    """
+
+    vectors = []
+    df: Dict[str, int] = {}
+    for document in documents:
+        counts: Dict[str, int] = {}
+        for token in tokenize(document):
+            counts[token] = counts.get(token, 0) + 1
+        vectors.append(counts)
+        for term in counts:
+            df[term] = df.get(term, 0) + 1
+
+    n = len(documents)
+
+    def weigh(counts: Dict[str, int]) -> Dict[str, float]:
+        return {
+            term: (1 + math.log(tf)) * (math.log((1 + n) / (1 + df.get(term, 0))) + 1)
+            for term, tf in counts.items()
+        }
+
+    query_counts: Dict[str, int] = {}
+    for token in tokenize(text):
+        query_counts[token] = query_counts.get(token, 0) + 1
+    query = weigh(query_counts)
+    query_norm = math.sqrt(sum(w * w for w in query.values()))
+
+    scores = []
+    for counts in vectors:
+        weights = weigh(counts)
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        dot = sum(w * query.get(term, 0.0) for term, w in weights.items())
+        scores.append(dot / (norm * query_norm) if norm and query_norm else 0.0)
+    return scores
+
+
+def iter_corpus_files(corpus_dir: str) -> Iterator[str]:
+    """.jsonl files of a corpus directory, in stable order"""
+
+    for root, dirs, files in os.walk(corpus_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.jsonl'):
+                yield os.path.join(root, name)
+
+
+def iter_documents(path: str) -> Iterator[Dict]:
+    """
+    Documents of one corpus file
+
+    One JSON document per line with METADATA_FIELDS plus 'text'.
+    """
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ResearchIndex:
+    """
+    Segmented inverted index with BM25 ranking
+    New documents are buffered in memory and sealed into immutable segments
+    (see index_segments), which are memory-mapped when read back from disk.
+    Search scores each segment against corpus-wide statistics and merges
+    the per-segment top-k; a merge policy keeps the segment count down in a
+    background thread. Re-adding a document id tombstones the earlier version.
+    One process writes an index directory; any number may read it.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(
+        self,
+        index_dir: Optional[str] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_buffered_documents: int = 10000,
+        merge_policy: Optional[MergePolicy] = None,
+        background_merges: bool = True
+    ):
+        """
+        Args:
+            index_dir: Directory the index is loaded from and saved to
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            max_buffered_documents: Buffered documents before a segment is sealed
+            merge_policy: Segment merge policy (default: MergePolicy())
+            background_merges: Merge segments in a background thread
+        """
+
+        self.index_dir = index_dir
+        self.k1 = k1
+        self.b = b
+        self.max_buffered_documents = max_buffered_documents
+        self.merge_policy = merge_policy or MergePolicy()
+        self.background_merges = background_merges
+
+        self.segments: List[Segment] = []
+        self._next_segment = 1
+
+        # Documents not yet sealed into a segment
+        self._pending: List[Dict] = []
+        self._pending_lengths = array('I')
+        self._pending_distinct = array('I')
+        self._pending_postings: Dict[str, Tuple[array, array]] = {}
+        self._pending_ids: Dict[str, int] = {}
+
+        # Corpus-wide TF-IDF statistics per segment (numpy backend)
+        self._tfidf_cache: Dict[str, Dict] = {}
+
+        self._lock = threading.RLock()
+        self._merge_thread: Optional[threading.Thread] = None
+        self.merges = 0
+        self.merge_error: Optional[BaseException] = None
+        self._manifest_stamp = None
+
+        # Bumped on every change; callers key caches on it
+        self.version = 0
+
+        if index_dir and os.path.exists(os.path.join(index_dir, self.MANIFEST)):
+            self.load(index_dir)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(s.live_documents for s in self.segments) + len(self._pending)
+
+    # --- Indexing ---
+
+    def add(self, document: Dict) -> str:
+        """
+        Index one document
+
+        Args:
+            document: METADATA_FIELDS plus 'text'
+
+        Returns:
+            Document id
+        """
+
+        doc_id = str(document.get('id') or document.get('citation') or f"doc-{self.version}")
+        metadata = {field: document.get(field) for field in METADATA_FIELDS}
+        metadata['id'] = doc_id
+        metadata['type'] = metadata['type'] or 'case_law'
+        own_citation = normalize_citation(metadata['citation'])
+        metadata['cites'] = [c for c in extract_citations(document.get('text') or '') if c != own_citation]
+
+        text = ' '.join(str(document.get(f) or '') for f in ('title', 'summary', 'text'))
+        tokens = tokenize(text)
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        with self._lock:
+            if doc_id in self._pending_ids:
+                self._seal()
+            for segment in self.segments:
+                docno = segment.find(doc_id)
+                if docno is not None:
+                    segment.delete(docno)
+
+            position = len(self._pending)
+            self._pending.append(metadata)
+            self._pending_ids[doc_id] = position
+            self._pending_lengths.append(len(tokens))
+            self._pending_distinct.append(len(counts))
+            for term, tf in counts.items():
+                postings = self._pending_postings.get(term)
+                if postings is None:
+                    postings = self._pending_postings[term] = (array('I'), array('I'))
+                postings[0].append(position)
+                postings[1].append(tf)
+            self.version += 1
+
+            full = len(self._pending) >= self.max_buffered_documents
+
+        if full:
+            if self.index_dir:
+                self.flush()
+            else:
+                with self._lock:
+                    self._seal()
+                self._maybe_merge()
+        return doc_id
+
+    def delete(self, doc_id: str) -> bool:
+        """Tombstone a document; returns whether it was indexed"""
+
+        with self._lock:
+            if doc_id in self._pending_ids:
+                self._seal()
+            found = False
+            for segment in self.segments:
+                docno = segment.find(doc_id)
+                if docno is not None and docno not in segment.deleted:
+                    segment.delete(docno)
+                    found = True
+            if found:
+                self.version += 1
+            return found
+
+    def add_many(self, documents: Iterable[Dict]) -> int:
+        """Index documents; returns how many were added"""
+
+        count = 0
+        for document in documents:
+            self.add(document)
+            count += 1
+        return count
+
+    def _write_pending(self, writer: SegmentWriter):
+        for position, metadata in enumerate(self._pending):
+            writer.add_document(
+                metadata['id'],
+                json.dumps(metadata).encode('utf-8'),
+                self._pending_lengths[position],
+                _year(metadata['year']),
+                metadata,
+                self._pending_distinct[position]
+            )
+        for term in sorted(self._pending_postings):
+            docnos, tfs = self._pending_postings[term]
+            writer.add_postings(term, docnos, tfs)
+
+    def _segment_name(self) -> str:
+        name = f"seg_{self._next_segment:06d}{SEGMENT_SUFFIX}"
+        self._next_segment += 1
+        return name
+
+    def _seal(self, to_disk: bool = False):
+        """Turn the buffered documents into a segment (lock held)"""
+
+        if not self._pending:
+            return
+
+        name = self._segment_name()
+        if to_disk:
+            segment = write_segment_file(os.path.join(self.index_dir, name), self._write_pending)
+        else:
+            buffer = io.BytesIO()
+            writer = SegmentWriter(buffer)
+            self._write_pending(writer)
+            writer.finish()
+            segment = Segment(name, buffer.getvalue())
+
+        self.segments = self.segments + [segment]
+        self._pending = []
+        self._pending_lengths = array('I')
+        self._pending_distinct = array('I')
+        self._pending_postings = {}
+        self._pending_ids = {}
+
+    def iter_documents(self) -> Iterator[Dict]:
+        """Metadata of every live document"""
+
+        with self._lock:
+            self._seal()
+            snapshot = [(segment, frozenset(segment.deleted)) for segment in self.segments]
+        for segment, deleted in snapshot:
+            for docno in range(segment.documents):
+                if docno not in deleted:
+                    yield segment.document(docno)
+
+    # --- Search ---
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        jurisdiction: Optional[str] = None,
+        court: Optional[str] = None,
+        document_type: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        BM25 top-k search
+
+        Args:
+            query: Free-text query
+            limit: Results to return
+            jurisdiction: Exact jurisdiction (case-insensitive)
+            court: Substring of the court name (case-insensitive)
+            document_type: case_law, statutes or regulations
+            year_from: Earliest decision year
+            year_to: Latest decision year
+
+        Returns:
+            Document metadata with 'score', best first
+        """
+
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        with self._lock:
+            self._seal()
+            snapshot = [(segment, frozenset(segment.deleted)) for segment in self.segments]
+            total_length = sum(segment.live_length for segment in self.segments)
+        live = sum(segment.documents - len(deleted) for segment, deleted in snapshot)
+        if not live:
+            return []
+
+        # Corpus-wide statistics, so segmenting does not change scores
+        weights = []
+        for term in terms:
+            df = sum(segment.document_frequency(term) for segment, _ in snapshot)
+            if df:
+                weights.append((term, self._idf(df, live)))
+        if not weights:
+            return []
+
+        average = total_length / live
+        filters = (jurisdiction, court, document_type, year_from, year_to)
+        score_segment = self._score_segment_numpy if NUMPY_AVAILABLE else self._score_segment_python
+
+        ranked = []
+        for position, (segment, deleted) in enumerate(snapshot):
+            for docno, score in score_segment(segment, deleted, weights, limit, filters, average):
+                ranked.append((score, -position, -docno))
+
+        return [
+            dict(snapshot[-position][0].document(-docno), score=round(score, 4))
+            for score, position, docno in heapq.nlargest(limit, ranked)
+        ]
+
+    def _idf(self, df: int, n: int) -> float:
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _matches(self, segment: Segment, docno: int, filters: Tuple) -> bool:
+        jurisdiction, court, document_type, year_from, year_to = filters
+        if jurisdiction and segment.label('jurisdiction', docno).lower() != jurisdiction.lower():
+            return False
+        if court and court.lower() not in segment.label('court', docno).lower():
+            return False
+        if document_type and segment.label('type', docno).lower() != document_type.lower():
+            return False
+        year = segment.year(docno)
+        if year_from is not None and (year is None or year < year_from):
+            return False
+        if year_to is not None and (year is None or year > year_to):
+            return False
+        return True
+
+    def _score_segment_python(
+        self, segment: Segment, deleted: frozenset, weights: List[Tuple[str, float]],
+        limit: int, filters: Tuple, average: float
+    ) -> List[Tuple[int, float]]:
+        scores: Dict[int, float] = {}
+        lengths = segment.column('lengths')
+
+        for term, idf in weights:
+            postings = segment.postings(term)
+            if postings is None:
+                continue
+            for docno, tf in zip(*postings):
+                norm = self.k1 * (1 - self.b + self.b * lengths[docno] / average)
+                scores[docno] = scores.get(docno, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        candidates = (
+            (score, -docno) for docno, score in scores.items()
+            if docno not in deleted and self._matches(segment, docno, filters)
+        )
+        return [(-negative, score) for score, negative in heapq.nlargest(limit, candidates)]
+
+    def _filter_numpy(self, segment: Segment, candidates, filters: Tuple):
+        jurisdiction, court, document_type, year_from, year_to = filters
+        keep = np.ones(len(candidates), dtype=bool)
+
+        for field, value, exact in (('jurisdiction', jurisdiction, True), ('court', court, False), ('type', document_type, True)):
+            if not value:
+                continue
+            value = value.lower()
+            wanted = [
+                code for code, label in enumerate(segment.vocabularies[field])
+                if (label.lower() == value if exact else value in label.lower())
+            ]
+            keep &= np.isin(segment.array(f'{field}_codes')[candidates], wanted)
+
+        if year_from is not None or year_to is not None:
+            years = segment.array('years')[candidates]
+            if year_from is not None:
+                keep &= years >= year_from
+            if year_to is not None:
+                keep &= (years <= year_to) & (years >= 0)
+        return candidates[keep]
+
+    def _score_segment_numpy(
+        self, segment: Segment, deleted: frozenset, weights: List[Tuple[str, float]],
+        limit: int, filters: Tuple, average: float
+    ) -> List[Tuple[int, float]]:
+        lengths = segment.array('lengths')
+        scores = np.zeros(segment.documents, dtype=np.float64)
+
+        for term, idf in weights:
+            postings = segment.postings_arrays(term)
+            if postings is None:
+                continue
+            docnos, tfs = postings
+            tfs = tfs.astype(np.float64)
+            norms = self.k1 * (1 - self.b + self.b * lengths[docnos] / average)
+            # Each document appears once per term, so fancy-index += is safe
+            scores[docnos] += idf * tfs * (self.k1 + 1) / (tfs + norms)
+
+        if deleted:
+            scores[np.fromiter(deleted, dtype=np.int64, count=len(deleted))] = 0.0
+
+        candidates = np.flatnonzero(scores)
+        if any(f is not None and f != '' for f in filters):
+            candidates = self._filter_numpy(segment, candidates, filters)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+
+        return [(int(d), float(scores[d])) for d in candidates]
+
+    # --- Similarity ---
+
+    def similarity(self, text: str, doc_ids: List[str]) -> List[float]:
+        """
+        TF-IDF cosine similarity between a text and indexed documents
+
+        Document vectors come from the segments' stored term vectors, so
+        no document text is re-tokenized. Weights are sublinear tf times
+        smoothed idf over the whole corpus.
+
+        Args:
+            text: Free text (e.g. case facts)
+            doc_ids: Indexed document ids
+
+        Returns:
+            Similarity in [0, 1] per id (0.0 for unknown or deleted ids)
+        """
+
+        counts: Dict[str, int] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+
+        with self._lock:
+            self._seal()
+            snapshot = [(segment, frozenset(segment.deleted)) for segment in self.segments]
+        live = sum(segment.documents - len(deleted) for segment, deleted in snapshot)
+        scores = [0.0] * len(doc_ids)
+        if not counts or not live or not doc_ids:
+            return scores
+
+        query = {}
+        for term, tf in counts.items():
+            df = sum(segment.document_frequency(term) for segment, _ in snapshot)
+            if df:
+                query[term] = (1 + math.log(tf)) * self._tfidf_idf(df, live)
+        query_norm = math.sqrt(sum(w * w for w in query.values()))
+        if not query_norm:
+            return scores
+
+        score_segment = self._cosine_numpy if NUMPY_AVAILABLE else self._cosine_python
+        pending = dict(enumerate(doc_ids))
+        for segment, deleted in snapshot:
+            if not pending:
+                break
+            positions = list(pending)
+            docnos = segment.locate([pending[p] for p in positions])
+            found = [(p, d) for p, d in zip(positions, docnos) if d is not None and d not in deleted]
+            if not found:
+                continue
+            similarities = score_segment(segment, snapshot, live, query, [d for _, d in found])
+            for (position, _), value in zip(found, similarities):
+                scores[position] = value / query_norm
+                del pending[position]
+        return scores
+
+    def _tfidf_idf(self, df: int, n: int) -> float:
+        return math.log((1 + n) / (1 + df)) + 1
+
+    def _tfidf_stats(self, segment: Segment, snapshot, live: int) -> Dict:
+        """
+        Corpus-wide idf per term of a segment, plus memoized vector norms
+
+        Recomputed when the segment set or live document count changes;
+        norms are filled in lazily as documents are scored (NaN = unknown).
+        """
+
+        key = (tuple(s.name for s, _ in snapshot), live)
+        cached = self._tfidf_cache.get(segment.name)
+        if cached is not None and cached['key'] == key:
+            return cached
+
+        df = segment.array('term_df').astype(np.int64)
+        terms = segment.sorted_terms()
+        for other, _ in snapshot:
+            if other is segment or not other.terms or not len(terms):
+                continue
+            other_terms = other.sorted_terms()
+            positions = np.minimum(np.searchsorted(other_terms, terms), len(other_terms) - 1)
+            shared = other_terms[positions] == terms
+            df[shared] += other.array('term_df')[positions[shared]]
+
+        for name in [name for name in self._tfidf_cache if name not in key[0]]:
+            del self._tfidf_cache[name]
+        cached = self._tfidf_cache[segment.name] = {
+            'key': key,
+            'idf': np.log((1 + live) / (1 + df)) + 1,
+            'norms': np.full(segment.documents, np.nan)
+        }
+        return cached
+
+    def _vector_slots(self, segment: Segment, docnos):
+        """Positions of the documents' term vector entries, and the row each belongs to"""
+
+        offsets = segment.array('vector_offsets')
+        starts = offsets[docnos].astype(np.int64)
+        sizes = offsets[docnos + 1].astype(np.int64) - starts
+        bounds = np.concatenate(([0], np.cumsum(sizes)))
+        slots = np.repeat(starts - bounds[:-1], sizes) + np.arange(bounds[-1])
+        rows = np.repeat(np.arange(len(docnos)), sizes)
+        return slots, rows
+
+    def _cosine_numpy(self, segment: Segment, snapshot, live: int, query: Dict[str, float], docnos: List[int]) -> List[float]:
+        """Dot products over vector norms for documents of one segment, batched"""
+
+        stats = self._tfidf_stats(segment, snapshot, live)
+        idf, norms = stats['idf'], stats['norms']
+        vector_terms = segment.array('vector_terms')
+        vector_tfs = segment.array('vector_tfs')
+        docnos = np.asarray(docnos, dtype=np.int64)
+
+        missing = docnos[np.isnan(norms[docnos])]
+        if len(missing):
+            slots, rows = self._vector_slots(segment, missing)
+            weights = (1 + np.log(vector_tfs[slots].astype(np.float64))) * idf[vector_terms[slots]]
+            norms[missing] = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(missing)))
+
+        # Query weights over this segment's term numbers
+        lookup = np.zeros(segment.terms)
+        for term, weight in query.items():
+            number = segment.term_number(term)
+            if number is not None:
+                lookup[number] = weight
+
+        slots, rows = self._vector_slots(segment, docnos)
+        terms = vector_terms[slots]
+        query_weights = lookup[terms]
+        hits = np.flatnonzero(query_weights)
+        weights = (1 + np.log(vector_tfs[slots[hits]].astype(np.float64))) * idf[terms[hits]]
+        dots = np.bincount(rows[hits], weights=weights * query_weights[hits], minlength=len(docnos))
+
+        candidate_norms = norms[docnos]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cosine = np.where(candidate_norms > 0, dots / candidate_norms, 0.0)
+        return cosine.tolist()
+
+    def _cosine_python(self, segment: Segment, snapshot, live: int, query: Dict[str, float], docnos: List[int]) -> List[float]:
+        df_cache: Dict[int, int] = {}
+
+        def df(number: int) -> int:
+            if number not in df_cache:
+                term = segment.term_at(number)
+                df_cache[number] = sum(s.document_frequency(term) for s, _ in snapshot)
+            return df_cache[number]
+
+        query_weights = {}
+        for term, weight in query.items():
+            number = segment.term_number(term)
+            if number is not None:
+                query_weights[number] = weight
+
+        result = []
+        for docno in docnos:
+            numbers, tfs = segment.term_vector(docno)
+            norm = 0.0
+            dot = 0.0
+            for number, tf in zip(numbers, tfs):
+                weight = (1 + math.log(tf)) * self._tfidf_idf(df(number), live)
+                norm += weight * weight
+                if number in query_weights:
+                    dot += weight * query_weights[number]
+            result.append(dot / math.sqrt(norm) if norm else 0.0)
+        return result
+
+    # --- Persistence ---
+
+    def flush(self):
+        """Write buffered documents and in-memory segments, then commit the manifest"""
+
+        if not self.index_dir:
+            raise ValueError("No index directory configured")
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        with self._lock:
+            self._seal(to_disk=True)
+            segments = []
+            for segment in self.segments:
+                if segment.path is None:
+                    segment = segment.persist(os.path.join(self.index_dir, segment.name))
+                segments.append(segment)
+            self.segments = segments
+            self._write_manifest()
+            if self._merge_thread is None:
+                self._remove_orphans()
+
+        self._maybe_merge()
+
+    def save(self, index_dir: Optional[str] = None):
+        """Flush the index (to `index_dir` if it has none yet)"""
+
+        if index_dir and not self.index_dir:
+            self.index_dir = index_dir
+        self.flush()
+
+    def _manifest_path(self, index_dir: Optional[str] = None) -> str:
+        return os.path.join(index_dir or self.index_dir, self.MANIFEST)
+
+    def _stamp(self, path: str):
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _write_manifest(self):
+        manifest = {
+            'format': 1,
+            'version': self.version,
+            'next_segment': self._next_segment,
+            'segments': [
+                {'name': s.name, 'documents': s.documents, 'deleted': sorted(s.deleted)}
+                for s in self.segments if s.path is not None
+            ]
+        }
+        path = self._manifest_path()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+        self._manifest_stamp = self._stamp(path)
+
+    def _remove_orphans(self):
+        """Delete segment files no longer in the manifest (writer only, lock held)"""
+
+        live = {s.name for s in self.segments}
+        for name in os.listdir(self.index_dir):
+            if name.endswith('.tmp') or (name.endswith(SEGMENT_SUFFIX) and name not in live):
+                os.remove(os.path.join(self.index_dir, name))
+
+    def load(self, index_dir: str):
+        """Open the segments listed in an index manifest"""
+
+        for attempt in range(3):
+            path = self._manifest_path(index_dir)
+            stamp = self._stamp(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            try:
+                self._open_segments(index_dir, manifest)
+            except FileNotFoundError:
+                # A concurrent merge replaced the manifest under us
+                if attempt == 2:
+                    raise
+                continue
+            self._manifest_stamp = stamp
+            return
+
+    def _open_segments(self, index_dir: str, manifest: Dict):
+        with self._lock:
+            already_open = {s.name: s for s in self.segments if s.path is not None}
+            segments = []
+            for entry in manifest['segments']:
+                segment = already_open.get(entry['name'])
+                if segment is None:
+                    segment = Segment.open(os.path.join(index_dir, entry['name']))
+                segment.deleted = set()
+                segment.deleted_length = 0
+                for docno in entry['deleted']:
+                    segment.delete(docno)
+                segments.append(segment)
+
+            self.segments = segments
+            self._next_segment = manifest['next_segment']
+            self.version = manifest['version']
+
+    def reopen(self) -> bool:
+        """
+        Pick up segments committed by the writing process
+
+        Cheap when nothing changed (one stat call). Indexes with unflushed
+        local changes are left alone.
+
+        Returns:
+            Whether the index changed
+        """
+
+        if not self.index_dir:
+            return False
+        try:
+            stamp = self._stamp(self._manifest_path())
+        except FileNotFoundError:
+            return False
+        if stamp == self._manifest_stamp:
+            return False
+
+        with self._lock:
+            if self._pending or any(s.path is None for s in self.segments):
+                return False
+            self.load(self.index_dir)
+        return True
+
+    # --- Merging ---
+
+    def _maybe_merge(self):
+        if not self.background_merges:
+            self._run_merges()
+            return
+        with self._lock:
+            if self._merge_thread is not None:
+                return
+            self._merge_thread = threading.Thread(
+                target=self._run_merges, name='research-index-merge', daemon=True
+            )
+            self._merge_thread.start()
+
+    def _run_merges(self):
+        try:
+            while True:
+                with self._lock:
+                    on_disk = self.index_dir is not None
+                    candidates = [s for s in self.segments if (s.path is not None) == on_disk]
+                    sources = self.merge_policy.select(candidates)
+                    if not sources:
+                        return
+                    snapshot = [(s, set(s.deleted)) for s in sources]
+                    name = self._segment_name()
+
+                merged, mappings = self._merge(name, snapshot, on_disk)
+
+                with self._lock:
+                    self._install_merge(snapshot, merged, mappings)
+        except BaseException as e:
+            self.merge_error = e
+        finally:
+            with self._lock:
+                if self._merge_thread is threading.current_thread():
+                    self._merge_thread = None
+
+    def _merge(self, name: str, snapshot, on_disk: bool):
+        mappings = []
+
+        def build(writer):
+            mappings.extend(merge_segments(writer, snapshot))
+
+        if on_disk:
+            merged = write_segment_file(os.path.join(self.index_dir, name), build)
+        else:
+            buffer = io.BytesIO()
+            writer = SegmentWriter(buffer)
+            build(writer)
+            writer.finish()
+            merged = Segment(name, buffer.getvalue())
+        return merged, mappings
+
+    def _install_merge(self, snapshot, merged: Segment, mappings: List[List[int]]):
+        """Swap merged sources for their merge result (lock held)"""
+
+        # Carry over tombstones set while the merge ran
+        for (source, before), mapping in zip(snapshot, mappings):
+            for docno in source.deleted - before:
+                if mapping[docno] >= 0:
+                    merged.delete(mapping[docno])
+
+        sources = [source for source, _ in snapshot]
+        first = next(i for i, s in enumerate(self.segments) if s is sources[0])
+        remaining = [s for s in self.segments if not any(s is source for source in sources)]
+        if merged.documents:
+            remaining.insert(first, merged)
+        self.segments = remaining
+        self.merges += 1
+        self.version += 1
+
+        if merged.path is not None:
+            self._write_manifest()
+            if not merged.documents:
+                os.remove(merged.path)
+            # Readers still mapping the old files keep them until they reopen
+            for source in sources:
+                os.remove(source.path)
+
+    def wait_for_merges(self):
+        """Block until background merging is done"""
+
+        while True:
+            with self._lock:
+                thread = self._merge_thread
+            if thread is None:
+                break
+            thread.join()
+        if self.merge_error is not None:
+            error, self.merge_error = self.merge_error, None
+            raise error
+
+    def close(self):
+        """Finish merges and release segment mappings"""
+
+        self.wait_for_merges()
+        with self._lock:
+            for segment in self.segments:
+                segment.close()
+            self.segments = []
+
+    def get_stats(self) -> Dict:
+        """Get index statistics"""
+
+        with self._lock:
+            return {
+                'documents': len(self),
+                'deleted': sum(len(s.deleted) for s in self.segments),
+                'segments': len(self.segments),
+                'buffered': len(self._pending),
+                'merges': self.merges,
+                'version': self.version,
+                'backend': 'numpy' if NUMPY_AVAILABLE else 'python'
+            }
+
+
+class ResearchIndexer:
+    """
+    Incremental corpus indexer
+    Remembers each corpus file's mtime and document ids in the index
+    directory and only (re)indexes files that are new or changed since the
+    last run. Documents a changed file no longer contains, and those of
+    removed files, are tombstoned. The citation graph is rebuilt whenever
+    the index changed.
+    """
+
+    def __init__(self, index: ResearchIndex):
+        self.index = index
+        if not index.index_dir:
+            raise ValueError("ResearchIndexer needs an index with index_dir")
+        self.state_path = os.path.join(index.index_dir, 'indexed_files.json')
+
+    def _load_state(self) -> Dict[str, Dict]:
+        """path -> {'mtime', 'ids'}; ids are unknown for files recorded by older versions"""
+
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return {
+            path: entry if isinstance(entry, dict) else {'mtime': entry, 'ids': []}
+            for path, entry in state.items()
+        }
+
+    def update(self, corpus_dir: str) -> Dict:
+        """
+        Index new or changed corpus files, tombstone the documents they
+        dropped and save the index
+
+        Returns:
+            Files and documents indexed and documents deleted in this run
+        """
+
+        state = self._load_state()
+        files_indexed = 0
+        added = 0
+        stale = set()
+        seen = set()
+
+        for path in iter_corpus_files(corpus_dir):
+            key = os.path.abspath(path)
+            seen.add(key)
+            mtime = os.path.getmtime(path)
+            previous = state.get(key)
+            if previous is not None and previous['mtime'] == mtime:
+                continue
+            ids = [self.index.add(document) for document in iter_documents(path)]
+            added += len(ids)
+            files_indexed += 1
+            if previous is not None:
+                stale.update(previous['ids'])
+            state[key] = {'mtime': mtime, 'ids': ids}
+
+        # Files removed from this corpus directory
+        root = os.path.join(os.path.abspath(corpus_dir), '')
+        removed = [k for k in state if k.startswith(root) and k not in seen]
+        for key in removed:
+            stale.update(state.pop(key)['ids'])
+
+        # An id that moved to another file stays live
+        owned = set()
+        for entry in state.values():
+            owned.update(entry['ids'])
+        deleted = sum(1 for doc_id in stale - owned if self.index.delete(doc_id))
+
+        if files_indexed or removed:
+            self.index.save()
+            # The citation graph is derived from the whole index; rebuild it
+            CitationGraph.build(self.index, graph_path(self.index.index_dir))
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+
+        return {
+            'files_indexed': files_indexed,
+            'documents_indexed': added,
+            'documents_deleted': deleted,
+            'index': self.index.get_stats()
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Build or update the legal research index')
+    parser.add_argument('corpus', help='Directory of .jsonl opinion/statute files')
+    parser.add_argument('index', help='Index directory')
+    args = parser.parse_args(argv)
+
+    index = ResearchIndex(args.index)
+    result = ResearchIndexer(index).update(args.corpus)
+    index.wait_for_merges()
+    result['index'] = index.get_stats()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
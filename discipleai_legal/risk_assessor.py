@@ -3,11 +3,24 @@ Risk Assessor
 Advanced risk analysis for contracts
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union
 from datetime import datetime
+import heapq
 import json
 import re
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .contract_document import ContractDocument
+from .lexicon import KeywordLexicon
+
+
+RISK_CATEGORIES = ('financial', 'legal', 'operational', 'reputational')
+
 
 class RiskAssessor:
     """
@@ -73,12 +86,125 @@ class RiskAssessor:
             }
         }
         
+        # Category scoring rules, evaluated in order. A rule fires when every
+        # 'any' group has a term present, no 'none' term is present and, for
+        # 'value_above', the contract value exceeds that threshold. Rules that
+        # share a 'chain' behave as if/elif/else: only the first match fires.
+        # 'raw' rules test their terms case-sensitively on the original text.
+        self.category_rules = {
+            'financial': [
+                {'chain': 'liability', 'any': [['unlimited liability', 'no cap']], 'points': 30, 'factor': 'Unlimited liability exposure'},
+                {'chain': 'liability', 'any': [['liability limited to', 'cap']], 'points': 5, 'factor': 'Liability capped'},
+                {'chain': 'liability', 'points': 15, 'factor': 'Liability terms unclear'},
+                {'any': [['non-refundable']], 'points': 15, 'factor': 'Non-refundable payments'},
+                {'any': [['penalty', 'liquidated damages']], 'points': 20, 'factor': 'Financial penalties present'},
+                {'chain': 'value', 'value_above': 'high', 'points': 20, 'factor': 'High contract value: ${value:,.0f}'},
+                {'chain': 'value', 'value_above': 'medium', 'points': 10, 'factor': 'Medium contract value: ${value:,.0f}'},
+                {'raw': True, 'any': [['EUR', '€', 'GBP', '£', 'JPY', '¥']], 'points': 10, 'factor': 'Foreign currency exposure'}
+            ],
+            'legal': [
+                {'chain': 'jurisdiction', 'none': ['governing law'], 'points': 15, 'factor': 'No governing law specified'},
+                {'chain': 'jurisdiction', 'any': [['england', 'germany', 'china', 'singapore']], 'points': 20, 'factor': 'Foreign jurisdiction'},
+                {'chain': 'dispute', 'any': [['arbitration']], 'points': 5, 'factor': 'Arbitration required'},
+                {'chain': 'dispute', 'any': [['litigation', 'court']], 'points': 10, 'factor': 'Litigation pathway'},
+                {'chain': 'dispute', 'points': 15, 'factor': 'Dispute resolution unclear'},
+                {'chain': 'indemnification', 'any': [['indemnify', 'hold harmless'], ['broad', 'unlimited']], 'points': 25, 'factor': 'Broad indemnification obligations'},
+                {'chain': 'indemnification', 'any': [['indemnify', 'hold harmless']], 'points': 10, 'factor': 'Standard indemnification'},
+                {'any': [['assign'], ['intellectual property']], 'points': 15, 'factor': 'IP assignment required'},
+                {'any': [['non-compete', 'non-competition']], 'points': 15, 'factor': 'Non-compete restrictions'}
+            ],
+            'operational': [
+                {'any': [['without cause']], 'points': 20, 'factor': 'Termination without cause allowed'},
+                {'any': [['immediate termination']], 'points': 15, 'factor': 'Immediate termination possible'},
+                {'any': [['service level', 'sla']], 'points': 10, 'factor': 'SLA commitments required'},
+                {'any': [['exclusive', 'solely']], 'points': 15, 'factor': 'Exclusivity obligations'},
+                {'any': [['change of control']], 'points': 10, 'factor': 'Change of control provisions'},
+                {'any': [['automatic renewal', 'auto-renew']], 'points': 15, 'factor': 'Automatic renewal'}
+            ],
+            'reputational': [
+                {'none': ['confidential'], 'points': 15, 'factor': 'No confidentiality protections'},
+                {'any': [['non-disparagement']], 'points': 5, 'factor': 'Non-disparagement clause present'},
+                {'chain': 'publicity', 'any': [['publicity', 'marketing'], ['without consent']], 'points': 20, 'factor': 'Publicity without consent'},
+                {'chain': 'publicity', 'any': [['publicity', 'marketing']], 'points': 5, 'factor': 'Publicity rights addressed'},
+                {'any': [['personal data', 'pii', 'gdpr', 'privacy']], 'points': 10, 'factor': 'Data privacy obligations'}
+            ]
+        }
+        
+        # Category weights for the overall score
+        self.category_weights = {
+            'financial': 0.35,
+            'legal': 0.30,
+            'operational': 0.20,
+            'reputational': 0.15
+        }
+        
+        self._compile_rules()
+        
         print(f"✅ Risk Assessor v{self.version} initialized")
         print(f"   Risk indicators: {sum(len(v) for v in self.risk_indicators.values())}")
     
+    def _compile_rules(self):
+        """Index rule terms and risk indicators as feature columns"""
+        
+        lowercase_terms = []
+        raw_terms = []
+        for category in RISK_CATEGORIES:
+            for rule in self.category_rules[category]:
+                target = raw_terms if rule.get('raw') else lowercase_terms
+                for group in rule.get('any', []):
+                    target.extend(group)
+                target.extend(rule.get('none', []))
+        for indicators in self.risk_indicators.values():
+            lowercase_terms.extend(indicators)
+        
+        # One lexicon covers every case-insensitive term
+        self.lexicon = KeywordLexicon(lowercase_terms)
+        self._raw_terms = list(dict.fromkeys(raw_terms))
+        
+        columns = {term: i for i, term in enumerate(self.lexicon.keywords)}
+        raw_columns = {term: len(columns) + i for i, term in enumerate(self._raw_terms)}
+        self._indicator_columns = columns
+        
+        self._rules = []
+        self._rule_slices = {}
+        for category in RISK_CATEGORIES:
+            start = len(self._rules)
+            for rule in self.category_rules[category]:
+                if rule.get('raw'):
+                    column = raw_columns.__getitem__
+                else:
+                    column = lambda term: columns[term.lower()]
+                self._rules.append({
+                    'category': category,
+                    'chain': (category, rule['chain']) if rule.get('chain') else None,
+                    'any': [[column(term) for term in group] for group in rule.get('any', [])],
+                    'none': [column(term) for term in rule.get('none', [])],
+                    'value_above': self.financial_thresholds['contract_value'][rule['value_above']] if rule.get('value_above') else None,
+                    'points': rule['points'],
+                    'factor': rule['factor']
+                })
+            self._rule_slices[category] = (start, len(self._rules))
+        
+        # Risk-clause locator: one scan finds the first hit of every indicator
+        self._indicator_lexicon = KeywordLexicon(
+            indicator for indicators in self.risk_indicators.values() for indicator in indicators
+        )
+        self._indicator_patterns = {
+            indicator: re.compile(re.escape(indicator), re.IGNORECASE)
+            for indicator in self._indicator_lexicon.keywords
+        }
+        
+        if NUMPY_AVAILABLE:
+            self._rule_points = np.array([rule['points'] for rule in self._rules], dtype=np.int64)
+    
+    def _features(self, doc: ContractDocument) -> List[bool]:
+        """Feature row: lexicon term presence, then raw (case-sensitive) terms"""
+        
+        return self.lexicon.vector(doc) + [term in doc.text for term in self._raw_terms]
+    
     def assess_risk(
         self,
-        contract_text: str,
+        contract_text: Union[str, ContractDocument],
         contract_value: Optional[float] = None,
         contract_type: str = "general",
         metadata: Optional[Dict] = None
@@ -87,7 +213,7 @@ class RiskAssessor:
         Comprehensive risk assessment
         
         Args:
-            contract_text: Full contract text
+            contract_text: Full contract text or a parsed ContractDocument
             contract_value: Total contract value in USD
             contract_type: Type of contract
             metadata: Additional context
@@ -96,92 +222,188 @@ class RiskAssessor:
             Complete risk assessment
         """
         
+        doc = ContractDocument.ensure(contract_text)
+        return self.assess_features(doc, self._features(doc), contract_value)
+    
+    def feature_terms(self) -> List[str]:
+        """Feature column order: lexicon keywords, then raw (case-sensitive) terms"""
+        
+        return self.lexicon.keywords + self._raw_terms
+    
+    def assess_features(
+        self,
+        doc: ContractDocument,
+        row: List[bool],
+        contract_value: Optional[float] = None,
+        indicator_hits: Optional[Dict[str, int]] = None
+    ) -> Dict:
+        """
+        Risk assessment from a precomputed feature row
+        
+        Args:
+            doc: Parsed contract
+            row: Presence flag per feature term (see feature_terms)
+            contract_value: Total contract value in USD
+            indicator_hits: First offset of each present risk indicator;
+                located with one scan of the document when omitted
+        """
+        
         self.assessments_performed += 1
         
         # Analyze different risk categories
-        financial_risk = self._assess_financial_risk(contract_text, contract_value)
-        legal_risk = self._assess_legal_risk(contract_text)
-        operational_risk = self._assess_operational_risk(contract_text)
-        reputational_risk = self._assess_reputational_risk(contract_text)
-        
-        # Identify specific risk clauses
-        risk_clauses = self._identify_risk_clauses(contract_text)
+        breakdown = {
+            category: self._assess_category(category, row, contract_value)
+            for category in RISK_CATEGORIES
+        }
         
         # Calculate overall risk score
         overall_score = self._calculate_overall_score(
-            financial_risk,
-            legal_risk,
-            operational_risk,
-            reputational_risk
+            breakdown['financial'],
+            breakdown['legal'],
+            breakdown['operational'],
+            breakdown['reputational']
         )
         
         # Determine risk level
         risk_level = self._determine_risk_level(overall_score)
         
-        # Generate mitigation strategies
-        mitigations = self._generate_mitigations(risk_clauses, risk_level)
+        return self._build_assessment(doc, row, breakdown, overall_score, risk_level, indicator_hits)
+    
+    def assess_many(
+        self,
+        contracts: Sequence[Union[str, ContractDocument]],
+        contract_values: Optional[Sequence[Optional[float]]] = None,
+        contract_type: str = "general",
+        metadata: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Risk assessment of many contracts at once
         
-        # Red flags
-        red_flags = self._identify_red_flags(risk_clauses)
+        Builds one boolean feature matrix (documents x terms), fires every
+        category rule as a column operation and scores all documents with
+        NumPy. Each result equals what assess_risk returns for that
+        document (assessment ids are assigned in input order).
         
-        return {
-            'success': True,
-            'assessment_id': f"RISK-{self.assessments_performed:06d}",
-            'overall_risk_score': round(overall_score, 1),
-            'overall_risk_level': risk_level,
-            'risk_breakdown': {
-                'financial': financial_risk,
-                'legal': legal_risk,
-                'operational': operational_risk,
-                'reputational': reputational_risk
-            },
-            'risk_clauses': risk_clauses,
-            'red_flags': red_flags,
-            'mitigations': mitigations,
-            'recommendation': self._get_recommendation(risk_level),
-            'timestamp': datetime.now().isoformat()
-        }
+        Args:
+            contracts: Contract texts or parsed ContractDocuments
+            contract_values: Contract value per document (None entries allowed)
+            contract_type: Type of contract
+            metadata: Additional context
+            
+        Returns:
+            One assessment per contract, in input order
+        """
+        
+        docs = [ContractDocument.ensure(c) for c in contracts]
+        values = list(contract_values) if contract_values is not None else [None] * len(docs)
+        if len(values) != len(docs):
+            raise ValueError("contract_values must have one entry per contract")
+        
+        if not NUMPY_AVAILABLE:
+            return [self.assess_risk(doc, value, contract_type, metadata) for doc, value in zip(docs, values)]
+        if not docs:
+            return []
+        
+        rows = [self._features(doc) for doc in docs]
+        features = np.array(rows, dtype=bool)
+        fired = self._fire_rules(features, values)
+        
+        # Category scores: fired rules times points (exact integer sums)
+        raw_scores = {}
+        for category, (start, end) in self._rule_slices.items():
+            raw_scores[category] = fired[:, start:end].astype(np.int64) @ self._rule_points[start:end]
+        capped = {category: np.minimum(score, 100) for category, score in raw_scores.items()}
+        
+        weights = self.category_weights
+        overall = (
+            capped['financial'] * weights['financial'] +
+            capped['legal'] * weights['legal'] +
+            capped['operational'] * weights['operational'] +
+            capped['reputational'] * weights['reputational']
+        )
+        
+        levels = {category: _levels(score) for category, score in raw_scores.items()}
+        overall_levels = _levels(overall)
+        
+        results = []
+        for i, doc in enumerate(docs):
+            self.assessments_performed += 1
+            breakdown = {}
+            for category, (start, end) in self._rule_slices.items():
+                breakdown[category] = {
+                    'score': int(capped[category][i]),
+                    'level': str(levels[category][i]),
+                    'factors': [
+                        self._factor(self._rules[j], values[i])
+                        for j in range(start, end) if fired[i, j]
+                    ]
+                }
+            results.append(self._build_assessment(doc, rows[i], breakdown, float(overall[i]), str(overall_levels[i])))
+        
+        return results
+    
+    def _fire_rules(self, features, values: List[Optional[float]]):
+        """Documents x rules matrix of fired rules"""
+        
+        n = features.shape[0]
+        has_value = np.array([bool(v) for v in values], dtype=bool)
+        amounts = np.array([float(v) if v else 0.0 for v in values], dtype=np.float64)
+        
+        fired = np.zeros((n, len(self._rules)), dtype=bool)
+        taken = {}
+        
+        for j, rule in enumerate(self._rules):
+            hit = np.ones(n, dtype=bool)
+            for group in rule['any']:
+                hit &= features[:, group].any(axis=1)
+            if rule['none']:
+                hit &= ~features[:, rule['none']].any(axis=1)
+            if rule['value_above'] is not None:
+                hit &= has_value & (amounts > rule['value_above'])
+            
+            chain = rule['chain']
+            if chain is not None:
+                previous = taken.get(chain)
+                if previous is not None:
+                    hit &= ~previous
+                    previous |= hit
+                else:
+                    taken[chain] = hit.copy()
+            
+            fired[:, j] = hit
+        
+        return fired
+    
+    def _rule_fires(self, rule: Dict, row: List[bool], contract_value: Optional[float]) -> bool:
+        if not all(any(row[c] for c in group) for group in rule['any']):
+            return False
+        if any(row[c] for c in rule['none']):
+            return False
+        if rule['value_above'] is not None:
+            return bool(contract_value) and contract_value > rule['value_above']
+        return True
     
-    def _assess_financial_risk(self, text: str, contract_value: Optional[float]) -> Dict:
-        """Assess financial risk"""
+    def _factor(self, rule: Dict, contract_value: Optional[float]) -> str:
+        if rule['value_above'] is not None:
+            return rule['factor'].format(value=contract_value)
+        return rule['factor']
+    
+    def _assess_category(self, category: str, row: List[bool], contract_value: Optional[float]) -> Dict:
+        """Score one risk category from a feature row"""
         
-        text_lower = text.lower()
         score = 0
         factors = []
-        
-        # Check for liability caps
-        if 'unlimited liability' in text_lower or 'no cap' in text_lower:
-            score += 30
-            factors.append('Unlimited liability exposure')
-        elif 'liability limited to' in text_lower or 'cap' in text_lower:
-            score += 5
-            factors.append('Liability capped')
-        else:
-            score += 15
-            factors.append('Liability terms unclear')
-        
-        # Payment terms
-        if 'non-refundable' in text_lower:
-            score += 15
-            factors.append('Non-refundable payments')
-        
-        if 'penalty' in text_lower or 'liquidated damages' in text_lower:
-            score += 20
-            factors.append('Financial penalties present')
-        
-        # Contract value risk
-        if contract_value:
-            if contract_value > self.financial_thresholds['contract_value']['high']:
-                score += 20
-                factors.append(f'High contract value: ${contract_value:,.0f}')
-            elif contract_value > self.financial_thresholds['contract_value']['medium']:
-                score += 10
-                factors.append(f'Medium contract value: ${contract_value:,.0f}')
-        
-        # Currency risk
-        if any(curr in text for curr in ['EUR', '€', 'GBP', '£', 'JPY', '¥']):
-            score += 10
-            factors.append('Foreign currency exposure')
+        taken = set()
+        
+        start, end = self._rule_slices[category]
+        for rule in self._rules[start:end]:
+            if rule['chain'] in taken:
+                continue
+            if self._rule_fires(rule, row, contract_value):
+                score += rule['points']
+                factors.append(self._factor(rule, contract_value))
+                if rule['chain'] is not None:
+                    taken.add(rule['chain'])
         
         return {
             'score': min(score, 100),
@@ -189,173 +411,114 @@ class RiskAssessor:
             'factors': factors
         }
     
-    def _assess_legal_risk(self, text: str) -> Dict:
-        """Assess legal risk"""
+    def _build_assessment(
+        self,
+        doc: ContractDocument,
+        row: List[bool],
+        breakdown: Dict,
+        overall_score: float,
+        risk_level: str,
+        indicator_hits: Optional[Dict[str, int]] = None
+    ) -> Dict:
+        # Identify specific risk clauses
+        risk_clauses = self._identify_risk_clauses(doc, row, hits=indicator_hits)
         
-        text_lower = text.lower()
-        score = 0
-        factors = []
+        # Generate mitigation strategies
+        mitigations = self._generate_mitigations(risk_clauses, risk_level)
         
-        # Jurisdiction
-        if 'governing law' not in text_lower:
-            score += 15
-            factors.append('No governing law specified')
-        elif any(foreign in text_lower for foreign in ['england', 'germany', 'china', 'singapore']):
-            score += 20
-            factors.append('Foreign jurisdiction')
-        
-        # Dispute resolution
-        if 'arbitration' in text_lower:
-            score += 5
-            factors.append('Arbitration required')
-        elif 'litigation' in text_lower or 'court' in text_lower:
-            score += 10
-            factors.append('Litigation pathway')
-        else:
-            score += 15
-            factors.append('Dispute resolution unclear')
-        
-        # Indemnification
-        if 'indemnify' in text_lower or 'hold harmless' in text_lower:
-            if 'broad' in text_lower or 'unlimited' in text_lower:
-                score += 25
-                factors.append('Broad indemnification obligations')
-            else:
-                score += 10
-                factors.append('Standard indemnification')
-        
-        # IP assignment
-        if 'assign' in text_lower and 'intellectual property' in text_lower:
-            score += 15
-            factors.append('IP assignment required')
-        
-        # Non-compete
-        if 'non-compete' in text_lower or 'non-competition' in text_lower:
-            score += 15
-            factors.append('Non-compete restrictions')
+        # Red flags
+        red_flags = self._identify_red_flags(risk_clauses)
         
         return {
-            'score': min(score, 100),
-            'level': self._score_to_level(score),
-            'factors': factors
+            'success': True,
+            'assessment_id': f"RISK-{self.assessments_performed:06d}",
+            'overall_risk_score': round(overall_score, 1),
+            'overall_risk_level': risk_level,
+            'risk_breakdown': breakdown,
+            'risk_clauses': risk_clauses,
+            'red_flags': red_flags,
+            'mitigations': mitigations,
+            'recommendation': self._get_recommendation(risk_level),
+            'timestamp': datetime.now().isoformat()
         }
     
-    def _assess_operational_risk(self, text: str) -> Dict:
-        """Assess operational risk"""
-        
-        text_lower = text.lower()
-        score = 0
-        factors = []
-        
-        # Termination terms
-        if 'without cause' in text_lower:
-            score += 20
-            factors.append('Termination without cause allowed')
+    def _identify_risk_clauses(
+        self,
+        doc: ContractDocument,
+        row: Optional[List[bool]] = None,
+        top_k: int = 10,
+        hits: Optional[Dict[str, int]] = None
+    ) -> List[Dict]:
+        """Identify specific risky clauses"""
         
-        if 'immediate termination' in text_lower:
-            score += 15
-            factors.append('Immediate termination possible')
+        if row is None:
+            row = self._features(doc)
         
-        # Performance obligations
-        if 'service level' in text_lower or 'sla' in text_lower:
-            score += 10
-            factors.append('SLA commitments required')
+        present = [
+            indicator
+            for indicators in self.risk_indicators.values()
+            for indicator in indicators
+            if row[self._indicator_columns[indicator]]
+        ]
+        if not present:
+            return []
         
-        # Exclusivity
-        if 'exclusive' in text_lower or 'solely' in text_lower:
-            score += 15
-            factors.append('Exclusivity obligations')
+        # One pass over the document, stopping once every present indicator is located
+        if hits is None:
+            hits = self._indicator_lexicon.first_hits(doc, wanted=present)
         
-        # Change control
-        if 'change of control' in text_lower:
-            score += 10
-            factors.append('Change of control provisions')
+        candidates = []
+        for severity, indicators in self.risk_indicators.items():
+            for indicator, risk_score in indicators.items():
+                offset = hits.get(indicator)
+                if offset is None:
+                    continue
+                candidates.append((severity, indicator, risk_score, offset))
         
-        # Renewal terms
-        if 'automatic renewal' in text_lower or 'auto-renew' in text_lower:
-            score += 15
-            factors.append('Automatic renewal')
+        # Top-k by risk score; ties keep severity/indicator order
+        top = heapq.nlargest(top_k, candidates, key=lambda c: c[2])
         
-        return {
-            'score': min(score, 100),
-            'level': self._score_to_level(score),
-            'factors': factors
-        }
+        clauses = []
+        for severity, indicator, risk_score, offset in top:
+            context_start, context_end = self._clause_context(doc, indicator, offset)
+            clauses.append({
+                'severity': severity,
+                'indicator': indicator,
+                'risk_score': risk_score,
+                'offset': offset,
+                'sentence_span': list(doc.sentence_span(offset)),
+                'context': doc.text[context_start:context_end].strip(),
+                'recommendation': self._get_clause_recommendation(indicator)
+            })
+        
+        return clauses
     
-    def _assess_reputational_risk(self, text: str) -> Dict:
-        """Assess reputational risk"""
+    def _clause_context(self, doc: ContractDocument, indicator: str, offset: int):
+        """
+        Up to 100 characters either side of the hit, within its line
         
-        text_lower = text.lower()
-        score = 0
-        factors = []
+        Like the leftmost `.{0,100}indicator.{0,100}` match: the window
+        starts 100 characters before the first hit and extends past the
+        last occurrence that fits in the first 100 characters.
+        """
         
-        # Confidentiality
-        if 'confidential' not in text_lower:
-            score += 15
-            factors.append('No confidentiality protections')
-        
-        # Non-disparagement
-        if 'non-disparagement' in text_lower:
-            score += 5
-            factors.append('Non-disparagement clause present')
-        
-        # Publicity rights
-        if 'publicity' in text_lower or 'marketing' in text_lower:
-            if 'without consent' in text_lower:
-                score += 20
-                factors.append('Publicity without consent')
-            else:
-                score += 5
-                factors.append('Publicity rights addressed')
-        
-        # Data handling
-        if any(term in text_lower for term in ['personal data', 'pii', 'gdpr', 'privacy']):
-            score += 10
-            factors.append('Data privacy obligations')
+        line_start, line_end = doc.line_span(offset)
+        start = max(line_start, offset - 100)
         
-        return {
-            'score': min(score, 100),
-            'level': self._score_to_level(score),
-            'factors': factors
-        }
-    
-    def _identify_risk_clauses(self, text: str) -> List[Dict]:
-        """Identify specific risky clauses"""
-        
-        clauses = []
-        text_lower = text.lower()
+        pattern = self._indicator_patterns[indicator]
+        last = offset
+        following = pattern.search(doc.text, last + 1, line_end)
+        while following is not None and following.start() <= start + 100:
+            last = following.start()
+            following = pattern.search(doc.text, last + 1, line_end)
         
-        for severity, indicators in self.risk_indicators.items():
-            for indicator, risk_score in indicators.items():
-                if indicator in text_lower:
-                    # Find context
-                    pattern = re.compile(f'.{{0,100}}{re.escape(indicator)}.{{0,100}}', re.IGNORECASE)
-                    matches = pattern.findall(text)
-                    
-                    for match in matches[:1]:  # First occurrence
-                        clauses.append({
-                            'severity': severity,
-                            'indicator': indicator,
-                            'risk_score': risk_score,
-                            'context': match.strip(),
-                            'recommendation': self._get_clause_recommendation(indicator)
-                        })
-        
-        # Sort by risk score
-        clauses.sort(key=lambda x: x['risk_score'], reverse=True)
-        
-        return clauses[:10]  # Top 10 risks
+        return start, min(line_end, last + len(indicator) + 100)
     
     def _calculate_overall_score(self, financial, legal, operational, reputational) -> float:
         """Calculate weighted overall risk score"""
         
         # Weighted average
-        weights = {
-            'financial': 0.35,
-            'legal': 0.30,
-            'operational': 0.20,
-            'reputational': 0.15
-        }
+        weights = self.category_weights
         
         score = (
             financial['score'] * weights['financial'] +
@@ -465,6 +628,16 @@ class RiskAssessor:
         }
 
 
+def _levels(scores):
+    """Vectorized _score_to_level"""
+    
+    return np.select(
+        [scores >= 70, scores >= 50, scores >= 30],
+        ['CRITICAL', 'HIGH', 'MEDIUM'],
+        default='LOW'
+    )
+
+
 # Test
 if __name__ == '__main__':
     print("\n" + "="*70)
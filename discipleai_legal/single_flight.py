@@ -0,0 +1,193 @@
+"""
+Single Flight
+Request coalescing for concurrent identical work
+
+The first caller for a key runs the work; callers arriving with the same
+key while it is in flight wait for that result instead of repeating the
+work. Threads and asyncio tasks share one in-flight table, so a thread
+and a coroutine analyzing the same contract also coalesce.
+"""
+
+from concurrent.futures import CancelledError as FutureCancelledError, Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+import inspect
+import threading
+
+
+class _Flight:
+    """One in-flight call: its shared future, waiter count and async task"""
+
+    __slots__ = ('future', 'waiters', 'task')
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.waiters = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key
+
+    - Errors: the leader's exception is raised in every waiter of that
+      flight; the next call for the key starts a fresh flight.
+    - Cancellation: if the leader is interrupted (KeyboardInterrupt,
+      task cancellation), waiters do not inherit it; one of them retries
+      as the new leader. An async flight whose waiters have all been
+      cancelled is cancelled too.
+    - Results are shared objects; callers that mutate them should copy.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.max_waiters = 0
+
+    def _join(self, key: Hashable) -> Tuple[_Flight, bool]:
+        """Flight for key and whether the caller leads it"""
+
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+                return flight, True
+            flight.waiters += 1
+            self.coalesced += 1
+            self.max_waiters = max(self.max_waiters, flight.waiters)
+            return flight, False
+
+    def _retry(self) -> None:
+        """A waiter whose leader was interrupted rejoins; it saved nothing"""
+
+        with self._lock:
+            self.calls -= 1
+            self.coalesced -= 1
+
+    def _finish(self, key: Hashable, flight: _Flight, result: Any = None,
+                error: Optional[BaseException] = None, cancelled: bool = False) -> None:
+        """Retire the flight, then release its waiters"""
+
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            if cancelled:
+                self.cancelled += 1
+            elif error is not None:
+                self.errors += 1
+
+        if flight.future.done():
+            return
+        if cancelled:
+            flight.future.cancel()
+        elif error is not None:
+            flight.future.set_exception(error)
+        else:
+            flight.future.set_result(result)
+
+    # --- Threads ---
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn(*args, **kwargs) once per concurrent key
+
+        Returns:
+            (result, shared): shared is True when the result came from
+            another caller's flight
+        """
+
+        while True:
+            flight, leader = self._join(key)
+            if not leader:
+                try:
+                    return flight.future.result(), True
+                except FutureCancelledError:
+                    self._retry()   # the leader was interrupted; take over
+                    continue
+
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._finish(key, flight, error=e)
+                raise
+            except BaseException:
+                self._finish(key, flight, cancelled=True)
+                raise
+            self._finish(key, flight, result=result)
+            return result, False
+
+    # --- asyncio ---
+
+    async def do_async(self, key: Hashable, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Awaitable form of do(); fn may return a value or an awaitable
+
+        The work runs in its own task, so cancelling one waiter (even the
+        one that started it) does not cancel the work for the others.
+        """
+
+        loop = asyncio.get_running_loop()
+        while True:
+            flight, leader = self._join(key)
+            if leader:
+                flight.waiters = 1
+                flight.task = loop.create_task(self._run(key, flight, fn, args, kwargs))
+
+            try:
+                result = await asyncio.shield(asyncio.wrap_future(flight.future))
+                return result, not leader
+            except asyncio.CancelledError:
+                if flight.future.cancelled():
+                    if not leader:
+                        self._retry()   # the shared work was interrupted; take over
+                    continue
+                # This waiter was cancelled; drop the work once nobody waits for it
+                with self._lock:
+                    flight.waiters -= 1
+                    abandon = flight.waiters <= 0 and flight.task is not None
+                if abandon:
+                    flight.task.cancel()
+                raise
+
+    async def _run(self, key: Hashable, flight: _Flight, fn: Callable, args, kwargs) -> None:
+        try:
+            result = fn(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        except asyncio.CancelledError:
+            self._finish(key, flight, cancelled=True)
+        except Exception as e:
+            self._finish(key, flight, error=e)
+        except BaseException:
+            self._finish(key, flight, cancelled=True)
+            raise
+        else:
+            self._finish(key, flight, result=result)
+
+    # --- Metrics ---
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def get_stats(self) -> Dict:
+        """Coalescing statistics; upstream_calls_saved counts coalesced callers"""
+
+        return {
+            'calls': self.calls,
+            'executions': self.executions,
+            'upstream_calls_saved': self.coalesced,
+            'coalesce_rate': round(self.coalesced / self.calls, 3) if self.calls else 0.0,
+            'errors': self.errors,
+            'cancelled': self.cancelled,
+            'in_flight': self.in_flight(),
+            'max_waiters': self.max_waiters
+        }
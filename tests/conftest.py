@@ -0,0 +1,70 @@
+"""
+Shared fixtures
+
+Tests run from a temporary working directory, so the default relative
+data/*.db paths of CGC CORE and the legal analyzers never touch the
+repository's data directory.
+"""
+
+from types import SimpleNamespace
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def isolated_workdir(tmp_path_factory):
+    # Not restored: atexit hooks (PFM model snapshots) also write relative paths
+    os.chdir(tmp_path_factory.mktemp('workdir'))
+
+
+class RecordingClient:
+    """Synchronous chat-completions client that records prompts and returns a fixed answer"""
+
+    def __init__(self, answer: str = "Risk Level: HIGH\nCompliance Score: 70%", fail: BaseException = None, fail_on: str = None):
+        self.answer = answer
+        self.fail = fail
+        self.fail_on = fail_on
+        self.prompts = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        with self._lock:
+            self.prompts.append(request['messages'][-1]['content'])
+        if self.fail is not None and (self.fail_on is None or self.fail_on in self.prompts[-1]):
+            raise self.fail
+        message = SimpleNamespace(content=self.answer)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def recording_client():
+    return RecordingClient()
+
+
+@pytest.fixture
+def analyzer_factory(tmp_path):
+    """ContractAnalyzerAI over a RecordingClient with a private fingerprint index"""
+
+    from discipleai_legal.contract_analyzer_ai import ContractAnalyzerAI
+    from discipleai_legal.contract_fingerprints import ContractFingerprintIndex
+
+    created = []
+
+    def make(client=None, **kwargs):
+        client = client or RecordingClient()
+        analyzer = ContractAnalyzerAI(client=client, cache_responses=False, **kwargs)
+        analyzer.fingerprints = ContractFingerprintIndex(str(tmp_path / f'fingerprints-{len(created)}.db'))
+        created.append(analyzer)
+        return analyzer, client
+
+    yield make
+    for analyzer in created:
+        analyzer.gateway.close()
@@ -0,0 +1,42 @@
+"""Per-action history fed to PFM (user-027)"""
+
+from cgc_core import (
+    EthicalCalibrationModule, PerceptionAnalysisNode, PredictiveFeedbackMechanism,
+    SmartDataAdvisor, TraceabilityOversight
+)
+from cgc_core.action_aggregates import ActionAggregateStore
+from cgc_core.cgc_loop import GovernanceOrchestrator
+
+
+def test_decisions_record_only_the_approval():
+    store = ActionAggregateStore(min_feedback=2)
+    store.record_decision('legal', 'review', approved=True)
+    store.record_decision('legal', 'review', approved=False)
+
+    snapshot = store.get('legal', 'review')
+    assert snapshot['success_rate'] == 0.5
+    assert snapshot['avg_duration'] == 'unknown'
+    assert snapshot['common_issues'] == []
+
+
+def test_governance_decisions_do_not_feed_predictions_back():
+    loop = GovernanceOrchestrator(
+        PerceptionAnalysisNode(), EthicalCalibrationModule(), PredictiveFeedbackMechanism(history_db_path=None, model_path=None),
+        SmartDataAdvisor(), TraceabilityOversight()
+    )
+    input_data = {'action': 'review', 'contract_text': 'short agreement', 'amount': 0}
+    for i in range(3):
+        result = loop.orchestrate_decision(f'AGG-{i}', 'aggregates-test', 'review', input_data, {})
+
+    aggregate = loop.aggregates._aggregates[('aggregates-test', 'review')]
+    assert aggregate.decisions == 3
+    assert aggregate.durations.count == 0
+    assert aggregate.issues.counts == {}
+
+    prediction_id = result['module_results']['prediction']['prediction_id']
+    loop.record_outcome(
+        'aggregates-test', 'review', prediction_id,
+        {'result': 'success', 'duration_ms': 1200, 'issues': ['late_delivery']}
+    )
+    assert aggregate.durations.count == 1
+    assert aggregate.issues.top() == ['late_delivery']
@@ -0,0 +1,33 @@
+"""Analysis ids and counters under concurrency (user-047)"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import RecordingClient
+from discipleai_legal.llm_gateway import LLMUnavailable
+
+
+def contract(i):
+    return f"SERVICES AGREEMENT {i}\n\n1. SERVICES. Supplier provides service number {i} to Client.\n\n2. FEES. Client pays {i} dollars."
+
+
+def test_concurrent_analyses_get_unique_ids(analyzer_factory):
+    analyzer, client = analyzer_factory(reuse_analyses=False)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda i: analyzer.analyze_contract(contract(i), {'tenant_id': 'a'}), range(64)))
+
+    ids = [r['analysis_id'] for r in results]
+    assert len(set(ids)) == 64
+    assert sorted(ids) == [f"AI-{n:06d}" for n in range(64)]
+    assert analyzer.analyses_count == 64
+    assert analyzer.llm_calls == 64
+
+
+def test_shared_and_fallback_ids_do_not_collide(analyzer_factory):
+    analyzer, _ = analyzer_factory(RecordingClient(fail=LLMUnavailable('circuit open')), reuse_analyses=False)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda i: analyzer.analyze_contract(contract(i % 4), {'tenant_id': 'a'}), range(32)))
+
+    ids = [r['analysis_id'] for r in results]
+    assert len(set(ids)) == 32
+    assert all(r['degraded'] for r in results)
+    assert analyzer.analyses_count == 32
@@ -0,0 +1,60 @@
+"""Chunk map-reduce with failed chunks (user-048)"""
+
+from conftest import RecordingClient
+from discipleai_legal.contract_chunker import chunk_contract, reduce_analyses, reduce_json_analyses
+from discipleai_legal.llm_gateway import LLMHTTPError
+
+
+def long_contract(sections=12, words=300):
+    body = " ".join(["The supplier shall perform the obligations in this clause."] * (words // 10))
+    return "\n\n".join(f"{i}. CLAUSE {i}. {body}" for i in range(1, sections + 1))
+
+
+def test_json_findings_that_are_dicts_are_deduplicated():
+    chunks = chunk_contract(long_contract(4), max_chars=2000)
+    finding = {'clause': 'indemnity', 'severity': 'high'}
+    parts = [
+        {'summary': f'part {c.index}', 'risk_level': 'low', 'compliance_score': 90,
+         'key_findings': [finding, 'Auto-renewal', dict(reversed(list(finding.items())))]}
+        for c in chunks
+    ]
+    reduced = reduce_json_analyses(parts, chunks)
+
+    assert reduced['key_findings'] == [finding, 'Auto-renewal']
+    assert reduced['degraded'] is False
+
+
+def test_json_reduction_is_degraded_when_a_chunk_failed():
+    chunks = chunk_contract(long_contract(4), max_chars=2000)
+    parts = [{'summary': 'ok', 'risk_level': 'low', 'compliance_score': 90, 'key_findings': []} for _ in chunks]
+    parts[1] = LLMHTTPError(400, 'rejected')
+    reduced = reduce_json_analyses(parts, chunks)
+
+    assert reduced['failed_chunks'] == [1]
+    assert reduced['degraded'] is True
+
+
+def test_free_text_reduction_reports_failed_chunks():
+    chunks = chunk_contract(long_contract(4), max_chars=2000)
+    parts = ['Risk Level: LOW\nCompliance Score: 90%'] * len(chunks)
+    parts[0] = LLMHTTPError(400, 'rejected')
+    reduced = reduce_analyses(parts, chunks)
+
+    assert reduced['failed_chunks'] == [0]
+    assert reduced['overall_risk'] == 'LOW'
+
+
+def test_partly_failed_chunked_analysis_is_degraded_and_not_indexed(analyzer_factory):
+    client = RecordingClient(fail=LLMHTTPError(400, 'rejected'), fail_on='Analyze part 2 of')
+    analyzer, _ = analyzer_factory(client)
+    analyzer.chunk_chars = analyzer.max_chunk_chars = 4000
+    text = long_contract()
+
+    result = analyzer.analyze_contract(text, {'tenant_id': 'a'})
+
+    assert result['chunked']['failed_chunks'] == [1]
+    assert result['degraded'] is True
+    assert len(analyzer.fingerprints) == 0
+
+    again = analyzer.analyze_contract(text, {'tenant_id': 'a'})
+    assert 'reused_from' not in again
@@ -0,0 +1,92 @@
+"""Near-duplicate reuse and delta decisions (user-044)"""
+
+import pytest
+
+
+SECTIONS = [
+    "MASTER SERVICES AGREEMENT between TechCorp Inc. and ClientCo LLC.",
+    "1. SERVICES. Supplier shall provide hosting and support services described in Exhibit A.",
+    "2. FEES. Client shall pay $50,000 annually, invoiced quarterly and payable net 30.",
+    "3. TERM. This agreement runs for three years and renews automatically each year.",
+    "4. CONFIDENTIALITY. Each party shall protect the other party's confidential information.",
+    "5. LIMITATION OF LIABILITY. Liability of either party is capped at the fees paid in the prior year.",
+    "6. INDEMNIFICATION. Supplier shall indemnify Client against third-party intellectual property claims.",
+    "7. TERMINATION. Either party may terminate with 30 days written notice for material breach.",
+    "8. GOVERNING LAW. This agreement is governed by the laws of the State of New York.",
+    "9. DISPUTES. Disputes are resolved by binding arbitration in New York City.",
+    "10. NOTICES. Notices must be given in writing to the addresses set out above.",
+    "11. ASSIGNMENT. Neither party may assign this agreement without prior written consent.",
+]
+
+
+def contract(sections):
+    return "\n\n".join(sections)
+
+
+@pytest.fixture
+def analyzer(analyzer_factory):
+    return analyzer_factory()
+
+
+def test_identical_contract_is_reused_with_its_own_governance(analyzer):
+    analyzer, client = analyzer
+    first = analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'a'})
+    second = analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'a'})
+
+    assert len(client.prompts) == 1
+    assert second['reused_from']['analysis_id'] == first['analysis_id']
+    assert second['cgc_governance']['decision_id'] != first['cgc_governance']['decision_id']
+
+
+def test_other_tenant_never_sees_the_analysis(analyzer):
+    analyzer, client = analyzer
+    analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'a'})
+    other = analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'b'})
+
+    assert 'reused_from' not in other
+    assert len(client.prompts) == 2
+
+
+def test_removed_section_is_not_reused(analyzer):
+    analyzer, client = analyzer
+    analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'a'})
+    without_liability = [s for s in SECTIONS if 'LIMITATION OF LIABILITY' not in s]
+    result = analyzer.analyze_contract(contract(without_liability), {'tenant_id': 'a'})
+
+    assert 'reused_from' not in result
+    assert len(client.prompts) == 2
+    assert result['delta_from']['changed_sections'] == []
+    assert result['delta_from']['removed_sections'] == [5]
+    assert 'LIMITATION OF LIABILITY' in client.prompts[-1]
+
+
+def test_edited_section_goes_to_the_delta_prompt(analyzer):
+    analyzer, client = analyzer
+    analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'a'})
+    edited = list(SECTIONS)
+    edited[2] = "2. FEES. Client shall pay $75,000 annually, invoiced monthly and payable net 45."
+    result = analyzer.analyze_contract(contract(edited), {'tenant_id': 'a'})
+
+    assert result['delta_from']['changed_sections'] == [2]
+    assert result['delta_from']['removed_sections'] == [2]
+    assert '$75,000' in client.prompts[-1]
+    assert 'LIMITATION OF LIABILITY' not in client.prompts[-1].split('Sections of the prior contract')[0].split('New or edited')[1]
+
+
+def test_reordered_sections_are_analyzed_in_full(analyzer):
+    analyzer, client = analyzer
+    analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'a'})
+    reordered = SECTIONS[:3] + [SECTIONS[4], SECTIONS[3]] + SECTIONS[5:]
+    result = analyzer.analyze_contract(contract(reordered), {'tenant_id': 'a'})
+
+    assert 'reused_from' not in result and 'delta_from' not in result
+    assert client.prompts[-1].startswith('Analyze this contract')
+
+
+def test_dissimilar_contract_gets_a_full_analysis(analyzer):
+    analyzer, client = analyzer
+    analyzer.analyze_contract(contract(SECTIONS), {'tenant_id': 'a'})
+    other = [f"{i}. CLAUSE. Entirely different wording number {i} about widgets and gadgets." for i in range(1, 13)]
+    result = analyzer.analyze_contract(contract(other), {'tenant_id': 'a'})
+
+    assert 'reused_from' not in result and 'delta_from' not in result
@@ -0,0 +1,65 @@
+"""Incremental re-analysis of contract versions (user-045)"""
+
+import threading
+
+from discipleai_legal.clause_extractor import ClauseExtractor
+from discipleai_legal.contract_document import ContractDocument
+from discipleai_legal.contract_versions import ContractVersionTracker, IncrementalContractAnalyzer
+from discipleai_legal.risk_assessor import RiskAssessor
+
+VOLATILE = {'extraction_id', 'assessment_id', 'timestamp'}
+
+
+def stable(result):
+    return {key: value for key, value in result.items() if key not in VOLATILE}
+
+
+def test_paragraph_sections_match_a_full_extraction():
+    extractor, assessor = ClauseExtractor(), RiskAssessor()
+    analyzer = IncrementalContractAnalyzer(extractor, assessor)
+    # The date spans a paragraph break, so per-paragraph scans would miss it
+    text = (
+        "This agreement between Acme Corp Inc. and Bolt LLC is effective January 1,\n\n"
+        "2025 for a fee of $5,000.\n\nThe Supplier shall indemnify the Client.\n\n"
+        "Termination requires 30 days notice."
+    )
+    assert ContractDocument(text).section_source == 'paragraphs'
+
+    result = analyzer.analyze('k', text, contract_value=5000)
+
+    assert result['incremental']['full_scan'] is True
+    assert stable(result['clauses']) == stable(extractor.extract_clauses(text))
+    assert stable(result['risk']) == stable(assessor.assess_risk(text, contract_value=5000))
+
+
+def test_numbered_revision_rescans_only_changed_sections():
+    analyzer = IncrementalContractAnalyzer()
+    base = [
+        "HOSTING AGREEMENT", "1. SERVICES. Supplier provides hosting.", "2. FEES. Client pays $10,000.",
+        "3. TERM. Two years.", "4. LAW. New York law applies."
+    ]
+    analyzer.analyze('k', "\n".join(base))
+    revised = base[:2] + ["2. FEES. Client pays $12,000."] + base[3:]
+    result = analyzer.analyze('k', "\n".join(revised))
+
+    assert result['version'] == 2
+    assert result['incremental']['full_scan'] is False
+    assert result['changed_sections'] == [2]
+    assert result['incremental']['recomputed'] == 1
+
+
+def test_concurrent_registrations_get_consecutive_versions(tmp_path):
+    tracker = ContractVersionTracker(str(tmp_path / 'versions.db'))
+    versions = []
+
+    def register(i):
+        versions.append(tracker.register('c', f"1. SERVICES {i}.\n2. FEES.\n3. TERM.\n4. LAW.")['version'])
+
+    threads = [threading.Thread(target=register, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(versions) == list(range(1, 21))
+    assert [entry['version'] for entry in tracker.history('c')] == list(range(1, 21))
@@ -0,0 +1,41 @@
+"""Response cache LRU order and expiry (user-046)"""
+
+import time
+
+from discipleai_legal.llm_cache import LLMResponseCache
+
+
+def test_memory_hits_protect_hot_keys_from_eviction(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / 'llm.db'), max_entries=3, memory_entries=3, touch_interval=3600)
+    for key in 'abc':
+        cache.put(key, f"response {key}")
+        time.sleep(0.01)
+
+    # Served from memory only; the write-back happens before the eviction
+    assert cache.get('a') == "response a"
+    assert cache.memory_hits == 1
+    cache.put('d', "response d")
+
+    reopened = LLMResponseCache(str(tmp_path / 'llm.db'))
+    assert reopened.get('a') == "response a"
+    assert reopened.get('b') is None
+    assert cache.evictions == 1 and len(cache) == 3
+
+
+def test_flush_touches_writes_hits_back(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / 'llm.db'), touch_interval=3600)
+    cache.put('a', "response a")
+    cache.get('a')
+    cache.get('a')
+
+    assert cache.flush_touches() == 1
+    assert cache.flush_touches() == 0
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / 'llm.db'), ttl_seconds=0.05)
+    cache.put('a', "response a")
+    time.sleep(0.06)
+
+    assert cache.get('a') is None
+    assert LLMResponseCache(str(tmp_path / 'llm.db'), ttl_seconds=0.05).get('a') is None
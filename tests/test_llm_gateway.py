@@ -0,0 +1,116 @@
+"""Gateway breaker, attempt deadlines and error handling (user-049)"""
+
+from types import SimpleNamespace
+import asyncio
+import time
+
+import pytest
+
+from conftest import RecordingClient
+from discipleai_legal.contract_chunker import chunk_contract, map_chunks
+from discipleai_legal.llm_gateway import CircuitBreaker, LLMGateway, LLMHTTPError, LLMUnavailable
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+class StallingClient:
+    """Async client whose first `stalls` calls hang for `stall` seconds"""
+
+    def __init__(self, stalls: int = 1, stall: float = 5.0):
+        self.stalls = stalls
+        self.stall = stall
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **request):
+        self.calls += 1
+        if self.calls <= self.stalls:
+            await asyncio.sleep(self.stall)
+        message = SimpleNamespace(content=f"answer {self.calls}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow() is None
+
+    time.sleep(0.06)
+    probe = breaker.allow()
+    assert probe is not None and probe is not CircuitBreaker.PASS
+    assert breaker.allow() is None
+
+    # A stale permit does not free the probe slot; the probe's own release does
+    breaker.release(CircuitBreaker.PASS)
+    assert breaker.allow() is None
+    breaker.release(probe)
+    second = breaker.allow()
+    assert second is not None and second is not probe
+
+    breaker.record_success()
+    assert breaker.allow() is CircuitBreaker.PASS
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is None
+    assert breaker.trips == 2
+
+
+def test_stalled_attempt_leaves_time_for_a_retry():
+    client = StallingClient(stalls=1)
+    gateway = LLMGateway(client=client, timeout=2.0, attempt_fraction=0.25, backoff_base=0.01)
+    try:
+        started = time.monotonic()
+        assert gateway.complete(MESSAGES) == "answer 2"
+        assert time.monotonic() - started < 1.5
+        assert gateway.timeouts == 1 and gateway.retries == 1
+    finally:
+        gateway.close()
+
+
+def test_deadline_exhausted_raises_llm_unavailable():
+    gateway = LLMGateway(client=StallingClient(stalls=10), timeout=0.3, backoff_base=0.01)
+    try:
+        with pytest.raises(LLMUnavailable):
+            gateway.complete(MESSAGES)
+    finally:
+        gateway.close()
+
+
+def test_map_chunks_keeps_llm_failures_and_raises_bugs():
+    chunks = chunk_contract("\n\n".join(f"{i}. CLAUSE. " + "word " * 400 for i in range(1, 5)), max_chars=2500)
+    assert len(chunks) > 1
+
+    def flaky(chunk):
+        if chunk.index == 1:
+            raise LLMUnavailable("circuit open")
+        return chunk.index
+
+    parts = map_chunks(chunks, flaky)
+    assert isinstance(parts[1], LLMUnavailable)
+    assert parts[0] == 0
+
+    def buggy(chunk):
+        return {}[chunk.index]
+
+    with pytest.raises(KeyError):
+        map_chunks(chunks, buggy)
+
+
+def test_analyzer_falls_back_only_for_llm_errors(analyzer_factory):
+    analyzer, _ = analyzer_factory(RecordingClient(fail=LLMHTTPError(400, "bad request")), reuse_analyses=False)
+    result = analyzer.analyze_contract("1. SERVICES. Supplier provides services.", {'tenant_id': 'a'})
+    assert result['degraded'] is True
+    assert result['analysis_id'].startswith('RULE-')
+
+    analyzer, _ = analyzer_factory(RecordingClient(fail=TypeError("bad client call")), reuse_analyses=False)
+    with pytest.raises(TypeError):
+        analyzer.analyze_contract("1. SERVICES. Supplier provides services.", {'tenant_id': 'a'})
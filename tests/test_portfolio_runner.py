@@ -0,0 +1,42 @@
+"""Portfolio checkpoint and resume (user-035)"""
+
+import json
+
+from discipleai_legal.portfolio_runner import PortfolioRunner
+
+
+def test_resume_skips_successes_and_retries_failures(tmp_path):
+    good = tmp_path / 'good.txt'
+    good.write_text('1. Client shall pay $5,000.\n2. Term one year.')
+    late = tmp_path / 'late.txt'
+    jobs = [{'id': 'good', 'path': str(good)}, {'id': 'late', 'path': str(late)}]
+    output = str(tmp_path / 'results.ndjson')
+    runner = PortfolioRunner(analyzers=['risk'], workers=1, on_progress=lambda snapshot: None)
+
+    first = runner.run_jobs(jobs, output)
+    assert (first['completed'], first['failed']) == (2, 1)
+    assert open(PortfolioRunner.checkpoint_path_for(output)).read().split() == ['good']
+
+    late.write_text('1. Late contract.\n2. Client pays $10.')
+    second = runner.run_jobs(jobs, output)
+    assert (second['skipped'], second['completed'], second['failed']) == (1, 1, 0)
+    assert open(PortfolioRunner.checkpoint_path_for(output)).read().split() == ['good', 'late']
+
+    records = [json.loads(line) for line in open(output)]
+    assert [(r['id'], r['success']) for r in records] == [('good', True), ('late', False), ('late', True)]
+
+    third = runner.run_jobs(jobs, output)
+    assert (third['skipped'], third['completed']) == (2, 0)
+
+
+def test_no_resume_starts_over(tmp_path):
+    contract = tmp_path / 'a.txt'
+    contract.write_text('1. Client shall pay $5,000.\n2. Term one year.')
+    output = str(tmp_path / 'results.ndjson')
+    runner = PortfolioRunner(analyzers=['risk'], workers=1, on_progress=lambda snapshot: None)
+
+    runner.run_jobs([{'id': 'a', 'path': str(contract)}], output)
+    summary = runner.run_jobs([{'id': 'a', 'path': str(contract)}], output, resume=False)
+
+    assert (summary['skipped'], summary['completed']) == (0, 1)
+    assert len(open(output).readlines()) == 1
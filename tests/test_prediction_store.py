@@ -0,0 +1,38 @@
+"""PFM prediction ring buffer and SQLite spill-over (user-026)"""
+
+from cgc_core.prediction_store import PredictionStore
+
+
+def entry(i):
+    return {'prediction': {'prediction_id': f'P{i}', 'outcome': {'expected_result': 'success'}}, 'timestamp': f't{i}'}
+
+
+def test_evicted_predictions_spill_and_take_late_feedback(tmp_path):
+    store = PredictionStore(capacity=3, db_path=str(tmp_path / 'pfm.db'), spill_batch=2)
+    for i in range(6):
+        store.add(entry(i))
+
+    assert [e['prediction']['prediction_id'] for e in store] == ['P3', 'P4', 'P5']
+    assert store.get_stats()['total_spilled'] == 3
+    assert store.get('P0')['timestamp'] == 't0'   # on disk
+    assert store.get('P2')['timestamp'] == 't2'   # still buffered
+
+    assert store.record_feedback('P0', {'result': 'success'}, True, 'f0') is not None
+    store.record_feedback('P0', {'result': 'failure'}, False, 'f1')
+    store.close()
+
+    reopened = PredictionStore(capacity=3, db_path=str(tmp_path / 'pfm.db'))
+    assert reopened.get('P0')['actual_outcome'] == {'result': 'failure'}
+    assert reopened.get('P2') is not None
+    assert (reopened.total_feedback, reopened.accurate_feedback) == (1, 0)
+    assert reopened.accuracy() == 0.0
+
+
+def test_memory_only_store_drops_evicted_predictions():
+    store = PredictionStore(capacity=2, db_path=None)
+    for i in range(3):
+        store.add(entry(i))
+
+    assert store.get('P0') is None
+    assert store.record_feedback('P1', {'result': 'success'}, True, 'f') is not None
+    assert store.accuracy() == 1.0
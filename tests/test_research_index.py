@@ -0,0 +1,71 @@
+"""Segment merges, tombstones and incremental corpus updates (user-039, user-040)"""
+
+import json
+import os
+
+from discipleai_legal.index_segments import MergePolicy
+from discipleai_legal.research_index import ResearchIndex, ResearchIndexer
+
+
+def document(i, text=None):
+    return {'id': f'D{i}', 'title': f'Case {i}', 'text': text or f'breach of contract damages number{i}'}
+
+
+def small_index(index_dir=None):
+    return ResearchIndex(
+        index_dir,
+        max_buffered_documents=2,
+        merge_policy=MergePolicy(merge_factor=2, min_segment_documents=1),
+        background_merges=False
+    )
+
+
+def ids(results):
+    return sorted(result['id'] for result in results)
+
+
+def test_merges_keep_every_live_document_and_drop_tombstones(tmp_path):
+    index = small_index(str(tmp_path / 'idx'))
+    for i in range(10):
+        index.add(document(i))
+    index.delete('D3')
+    index.add(document(4, 'landlord tenant lease'))
+    index.flush()
+
+    assert index.merges > 0
+    assert len(index) == 9
+    assert 'D3' not in ids(index.search('breach contract', limit=20))
+    assert ids(index.search('landlord lease')) == ['D4']
+    assert 'D4' not in ids(index.search('number4'))
+
+    index.close()
+    reopened = ResearchIndex(str(tmp_path / 'idx'))
+    assert len(reopened) == 9
+    assert sorted(d['id'] for d in reopened.iter_documents()) == sorted(f'D{i}' for i in range(10) if i != 3)
+    assert ids(reopened.search('landlord lease')) == ['D4']
+
+
+def test_indexer_tombstones_documents_a_file_dropped(tmp_path):
+    corpus = tmp_path / 'corpus'
+    corpus.mkdir()
+
+    def write(name, documents, mtime):
+        path = corpus / name
+        path.write_text(''.join(json.dumps(d) + '\n' for d in documents))
+        os.utime(path, (mtime, mtime))
+
+    write('a.jsonl', [document(1), document(2)], 1000)
+    write('b.jsonl', [document(3, 'landlord tenant lease')], 1000)
+    index = ResearchIndex(str(tmp_path / 'idx'))
+    assert ResearchIndexer(index).update(str(corpus))['documents_indexed'] == 3
+
+    write('a.jsonl', [document(1, 'breach of contract damages revised')], 2000)
+    os.remove(corpus / 'b.jsonl')
+    summary = ResearchIndexer(index).update(str(corpus))
+    assert (summary['documents_indexed'], summary['documents_deleted']) == (1, 2)
+    assert sorted(d['id'] for d in index.iter_documents()) == ['D1']
+    index.close()
+
+    reopened = ResearchIndex(str(tmp_path / 'idx'))
+    assert sorted(d['id'] for d in reopened.iter_documents()) == ['D1']
+    assert ResearchIndexer(reopened).update(str(corpus))['files_indexed'] == 0
@@ -0,0 +1,124 @@
+"""Coalescing, errors and cancellation in SingleFlight (user-047)"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from discipleai_legal.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('k', work)))
+    leader.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(flight.do('k', work))) for _ in range(4)]
+    for thread in waiters:
+        thread.start()
+    while flight.coalesced < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + waiters:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert flight.in_flight() == 0
+
+
+def test_leader_error_reaches_waiters_then_next_call_starts_fresh():
+    flight = SingleFlight()
+
+    with pytest.raises(ValueError):
+        flight.do('k', lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert flight.do('k', lambda: 42) == (42, False)
+    assert flight.errors == 1
+
+
+def test_interrupted_leader_hands_over_to_a_waiter():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def interrupted():
+        started.set()
+        release.wait(5)
+        raise KeyboardInterrupt
+
+    def leader():
+        try:
+            flight.do('k', interrupted)
+        except KeyboardInterrupt:
+            pass
+
+    results = []
+    first = threading.Thread(target=leader)
+    first.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(flight.do('k', lambda: "retried")))
+    waiter.start()
+    while flight.coalesced < 1:
+        time.sleep(0.001)
+    release.set()
+    first.join()
+    waiter.join()
+
+    assert results == [("retried", False)]
+    assert flight.cancelled == 1
+
+
+def test_cancelled_async_waiter_does_not_cancel_shared_work():
+    async def scenario():
+        flight = SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do_async('k', work))
+        second = asyncio.create_task(flight.do_async('k', work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return runs, result
+
+    runs, result = asyncio.run(scenario())
+    assert runs == [1]
+    assert result == ("done", True)
+
+
+def test_async_work_is_cancelled_when_every_waiter_leaves():
+    async def scenario():
+        flight = SingleFlight()
+        finished = []
+
+        async def work():
+            await asyncio.sleep(0.2)
+            finished.append(1)
+
+        task = asyncio.create_task(flight.do_async('k', work))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.sleep(0.3)
+        return flight, finished
+
+    flight, finished = asyncio.run(scenario())
+    assert finished == []
+    assert flight.cancelled == 1 and flight.in_flight() == 0